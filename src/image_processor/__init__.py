@@ -5,23 +5,33 @@ This package provides two main tools:
 - image-processor-meta: Embeds AI-generated descriptions as XMP metadata
 - image-processor-name: Renames images using AI-generated descriptive filenames
 
-Both tools use Ollama's LLaVA model for computer vision analysis.
+Both tools use Ollama's LLaVA model for computer vision analysis. Code shared
+by both tools, such as the directory walker, lives in this package.
 """
 
-import contextlib
+import importlib
 from typing import Any
 
 __version__ = "2.1.0"
 __author__ = "Shane Holloman"
 __email__ = "contact@shaneholloman.com"
 
-# Re-export main functionality from subtools
-meta_main: Any = None
-with contextlib.suppress(ImportError):
-    from image_processor_meta import main as meta_main
+# Main functionality re-exported from subtools. Imported lazily, so the
+# subtools can use shared modules from this package without an import cycle.
+_SUBTOOL_MAINS = {
+    "meta_main": "image_processor_meta.main",
+    "name_main": "image_processor_name.main",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import subtool entry points on first access; None if unavailable."""
+    if name in _SUBTOOL_MAINS:
+        try:
+            return importlib.import_module(_SUBTOOL_MAINS[name])
+        except ImportError:
+            return None
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-name_main: Any = None
-with contextlib.suppress(ImportError):
-    from image_processor_name import main as name_main
 
 __all__ = ["meta_main", "name_main", "__version__"]
@@ -0,0 +1,248 @@
+"""
+Spread Ollama requests over several servers.
+
+Each request goes to the healthy backend with the fewest requests in
+flight, so a slow or busy server naturally receives less work. A backend
+that fails several requests in a row is ejected; a background thread
+probes ejected backends and re-admits them once they answer again.
+"""
+
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+# Weight of the newest sample in a backend's moving average latency
+LATENCY_SMOOTHING = 0.2
+
+
+class Backend:
+    """One Ollama server and its request statistics."""
+
+    def __init__(self, endpoint: str) -> None:
+        """
+        Initialize backend.
+
+        Args:
+            endpoint: Ollama API endpoint URL
+        """
+        self.endpoint = endpoint
+        self.healthy = True
+        self.outstanding = 0
+        self.requests = 0
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ejections = 0
+        self.ejected_at: float | None = None
+        self.latency: float | None = None
+        self.total_latency = 0.0
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get the backend's health and request statistics.
+
+        Returns:
+            Dictionary with endpoint, health, request counts and latencies
+            in seconds; latencies are None before the first success
+        """
+        return {
+            "endpoint": self.endpoint,
+            "healthy": self.healthy,
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "failures": self.failures,
+            "ejections": self.ejections,
+            "latency": self.latency,
+            "average_latency": (
+                self.total_latency / self.successes if self.successes else None
+            ),
+        }
+
+
+class LoadBalancer:
+    """
+    Least-outstanding-requests balancer with health checks.
+
+    Thread-safe; selection never blocks, so the same balancer serves
+    threaded and asyncio clients.
+    """
+
+    def __init__(
+        self,
+        endpoints: list[str],
+        probe: Callable[[str], bool],
+        max_failures: int = 3,
+        probe_interval: float = 10.0,
+        is_failure: Callable[[Exception], bool] | None = None,
+    ) -> None:
+        """
+        Initialize load balancer.
+
+        Args:
+            endpoints: Ollama API endpoint URLs
+            probe: Health check returning True if an endpoint answers
+            max_failures: Consecutive failures after which a backend is ejected
+            probe_interval: Seconds between probes of ejected backends
+            is_failure: Whether an error raised during a request is the
+                backend's fault, as opposed to a bad image or response
+                (default: every error is)
+
+        Raises:
+            ValueError: If no endpoints are given
+        """
+        if not endpoints:
+            raise ValueError("At least one Ollama endpoint is required")
+
+        self.backends = [Backend(endpoint) for endpoint in dict.fromkeys(endpoints)]
+        self.probe = probe
+        self.max_failures = max_failures
+        self.probe_interval = probe_interval
+        self.is_failure = is_failure
+
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._prober: threading.Thread | None = None
+
+    def acquire(self) -> Backend:
+        """
+        Pick a backend for a request and count it as outstanding.
+
+        Ties between equally loaded backends go to the one with fewer
+        recent failures, then to the lower latency. If
+        every backend is ejected, the one ejected longest ago is used, so
+        requests fail with the server's own error.
+
+        Returns:
+            Backend to send the request to; pass it to release afterwards
+        """
+        with self._lock:
+            healthy = [backend for backend in self.backends if backend.healthy]
+            if healthy:
+                backend = min(
+                    healthy,
+                    key=lambda backend: (
+                        backend.outstanding,
+                        backend.consecutive_failures,
+                        backend.latency or 0.0,
+                    ),
+                )
+            else:
+                backend = min(self.backends, key=lambda backend: backend.ejected_at)
+            backend.outstanding += 1
+            backend.requests += 1
+            return backend
+
+    def release(self, backend: Backend, latency: float | None) -> None:
+        """
+        Record the end of a request.
+
+        Args:
+            backend: Backend returned by acquire
+            latency: Seconds the request took, or None if the backend failed
+        """
+        with self._lock:
+            backend.outstanding -= 1
+            if latency is not None:
+                backend.consecutive_failures = 0
+                backend.successes += 1
+                backend.total_latency += latency
+                backend.latency = (
+                    latency
+                    if backend.latency is None
+                    else LATENCY_SMOOTHING * latency
+                    + (1 - LATENCY_SMOOTHING) * backend.latency
+                )
+                return
+
+            backend.failures += 1
+            backend.consecutive_failures += 1
+            if backend.healthy and backend.consecutive_failures >= self.max_failures:
+                self._eject(backend)
+
+    @contextmanager
+    def request(self) -> Iterator[Backend]:
+        """
+        Acquire a backend for the duration of one request.
+
+        Errors the is_failure callback blames on the backend count towards
+        its ejection; other errors release it without a latency sample.
+
+        Yields:
+            Backend to send the request to
+        """
+        backend = self.acquire()
+        start_time = time.monotonic()
+        try:
+            yield backend
+        except BaseException as e:
+            if isinstance(e, Exception) and (
+                self.is_failure is None or self.is_failure(e)
+            ):
+                self.release(backend, None)
+            else:
+                with self._lock:
+                    backend.outstanding -= 1
+            raise
+        self.release(backend, time.monotonic() - start_time)
+
+    def _eject(self, backend: Backend) -> None:
+        """Take a backend out of rotation and make sure it is probed; hold the lock."""
+        backend.healthy = False
+        backend.ejected_at = time.monotonic()
+        backend.ejections += 1
+        if self._prober is None or not self._prober.is_alive():
+            self._prober = threading.Thread(
+                target=self._probe_ejected, name="ollama-health-probe", daemon=True
+            )
+            self._prober.start()
+
+    def _admit(self, backend: Backend) -> None:
+        """Put a backend back into rotation."""
+        with self._lock:
+            backend.healthy = True
+            backend.consecutive_failures = 0
+            backend.ejected_at = None
+
+    def _probe_ejected(self) -> None:
+        """Probe ejected backends until all are back or the balancer closes."""
+        while not self._closed.wait(self.probe_interval):
+            with self._lock:
+                ejected = [backend for backend in self.backends if not backend.healthy]
+                if not ejected:
+                    self._prober = None
+                    return
+            for backend in ejected:
+                if self.probe(backend.endpoint):
+                    self._admit(backend)
+
+    def check_health(self) -> int:
+        """
+        Probe every backend now, ejecting or re-admitting each.
+
+        Returns:
+            Number of healthy backends
+        """
+        for backend in self.backends:
+            if self.probe(backend.endpoint):
+                self._admit(backend)
+            else:
+                with self._lock:
+                    if backend.healthy:
+                        self._eject(backend)
+        return sum(backend.healthy for backend in self.backends)
+
+    def stats(self) -> list[dict[str, Any]]:
+        """
+        Get health and request statistics for every backend.
+
+        Returns:
+            One Backend.stats dictionary per backend, in configured order
+        """
+        with self._lock:
+            return [backend.stats() for backend in self.backends]
+
+    def close(self) -> None:
+        """Stop probing ejected backends."""
+        self._closed.set()
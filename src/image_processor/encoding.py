@@ -0,0 +1,154 @@
+"""
+Streaming JSON request bodies with base64 encoded images.
+
+Building a request the obvious way holds the file bytes, their base64
+encoding as bytes and as str, and the serialized JSON payload in memory at
+once. Here the source file is memory-mapped (or downscaled first), encoded
+in chunks and written to the socket as it is produced, so each in-flight
+request holds little more than one chunk.
+"""
+
+import base64
+import json
+import mmap
+import os
+from collections.abc import AsyncIterator, Iterator
+from pathlib import Path
+from typing import Any
+
+from .imaging import downscale_image
+
+# Multiple of 3 so each chunk encodes to base64 without padding
+CHUNK_SIZE = 3 * 64 * 1024
+
+# Stands in for the image in the payload until the body is streamed
+IMAGE_PLACEHOLDER = "__image_processor_image_data__"
+
+
+class ImageSource:
+    """
+    Image bytes to upload, memory-mapped when the file is sent unchanged.
+
+    Preprocessing, when enabled, happens up front so decode errors surface
+    before any request is sent.
+    """
+
+    def __init__(
+        self,
+        image_path: str | os.PathLike[str],
+        preprocess: bool = True,
+        max_edge: int = 1024,
+        quality: int = 85,
+    ) -> None:
+        """
+        Open image for upload.
+
+        Args:
+            image_path: Path to image file
+            preprocess: Whether to downscale and re-encode images that need it
+            max_edge: Maximum width or height in pixels when preprocessing
+            quality: JPEG quality for re-encoded images
+
+        Raises:
+            OSError: If the image cannot be read or decoded
+            ValueError: If the image file is empty
+        """
+        self.image_path = Path(image_path)
+        self._mmap: mmap.mmap | None = None
+
+        data = downscale_image(image_path, max_edge, quality) if preprocess else None
+        if data is None:
+            with self.image_path.open("rb") as image_file:
+                self._mmap = mmap.mmap(image_file.fileno(), 0, access=mmap.ACCESS_READ)
+            data = self._mmap
+
+        self._data: bytes | mmap.mmap = data
+
+    def __len__(self) -> int:
+        """Return the number of image bytes."""
+        return len(self._data)
+
+    @property
+    def encoded_length(self) -> int:
+        """Length of the base64 encoding of the image."""
+        return 4 * ((len(self._data) + 2) // 3)
+
+    def iter_base64(self, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Yield the base64 encoding of the image in chunks.
+
+        Args:
+            chunk_size: Source bytes per chunk; must be a multiple of 3
+
+        Yields:
+            Base64 encoded chunks that concatenate to the full encoding
+        """
+        for offset in range(0, len(self._data), chunk_size):
+            yield base64.b64encode(self._data[offset : offset + chunk_size])
+
+    def close(self) -> None:
+        """Release the memory map, if any."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> "ImageSource":
+        """Return source for use as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Release the memory map on context exit."""
+        self.close()
+
+
+class JsonBody:
+    """
+    Re-iterable JSON request body with an image streamed into it.
+
+    The payload is serialized once with IMAGE_PLACEHOLDER in place of the
+    image. Iterating yields the JSON before the placeholder, the image
+    encoded chunk by chunk, and the JSON after it. len() gives the exact
+    byte length so clients send a Content-Length instead of chunked
+    encoding. Works as the data of a requests call and, via async
+    iteration, as httpx content.
+    """
+
+    def __init__(self, payload: Any, source: ImageSource) -> None:
+        """
+        Initialize request body.
+
+        Args:
+            payload: JSON-serializable payload containing IMAGE_PLACEHOLDER
+                exactly once where the base64 image belongs
+            source: Image to stream into the placeholder
+
+        Raises:
+            ValueError: If the placeholder is missing or repeated
+        """
+        prefix, *rest = json.dumps(payload).split(IMAGE_PLACEHOLDER)
+        if len(rest) != 1:
+            raise ValueError("Payload must contain the image placeholder exactly once")
+
+        self.prefix = prefix.encode("utf-8")
+        self.suffix = rest[0].encode("utf-8")
+        self.source = source
+
+    def __len__(self) -> int:
+        """Return the exact body length in bytes."""
+        return len(self.prefix) + self.source.encoded_length + len(self.suffix)
+
+    def __iter__(self) -> Iterator[bytes]:
+        """Yield the body in chunks."""
+        yield self.prefix
+        yield from self.source.iter_base64()
+        yield self.suffix
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        """Yield the body in chunks for async clients."""
+        for chunk in self:
+            yield chunk
+
+    @property
+    def headers(self) -> dict[str, str]:
+        """Headers describing this body."""
+        return {"Content-Type": "application/json", "Content-Length": str(len(self))}
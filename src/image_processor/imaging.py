@@ -0,0 +1,115 @@
+"""
+Image preprocessing shared by both tools before upload to the vision model.
+"""
+
+import io
+import os
+from pathlib import Path
+
+from PIL import Image, ImageOps
+
+# Formats the model accepts as-is when no resize or rotation is needed
+_PASSTHROUGH_FORMATS = ("JPEG", "PNG")
+
+# EXIF orientation tag
+_ORIENTATION = 0x0112
+
+
+def prepare_image(
+    image_path: str | os.PathLike[str], max_edge: int = 1024, quality: int = 85
+) -> bytes:
+    """
+    Downscale and re-encode an image for upload.
+
+    JPEGs are decoded in draft mode, which lets the decoder skip most of the
+    work for large reductions. The image is rotated according to its EXIF
+    orientation, resized so its longest edge is at most max_edge, and
+    re-encoded as JPEG. Small, upright JPEG and PNG files are returned
+    unchanged.
+
+    Args:
+        image_path: Path to image file
+        max_edge: Maximum width or height in pixels
+        quality: JPEG quality for re-encoded images (1-95)
+
+    Returns:
+        Image bytes ready to be base64 encoded
+
+    Raises:
+        OSError: If the image cannot be read or decoded
+    """
+    data = downscale_image(image_path, max_edge, quality)
+    return Path(image_path).read_bytes() if data is None else data
+
+
+def downscale_image(
+    image_path: str | os.PathLike[str], max_edge: int = 1024, quality: int = 85
+) -> bytes | None:
+    """
+    Re-encode an image for upload only if it needs it.
+
+    Args:
+        image_path: Path to image file
+        max_edge: Maximum width or height in pixels
+        quality: JPEG quality for re-encoded images (1-95)
+
+    Returns:
+        Re-encoded JPEG bytes, or None if the file can be sent unchanged
+
+    Raises:
+        OSError: If the image cannot be read or decoded
+    """
+    with Image.open(image_path) as image:
+        orientation = image.getexif().get(_ORIENTATION, 1)
+
+        if (
+            image.format in _PASSTHROUGH_FORMATS
+            and max(image.size) <= max_edge
+            and orientation == 1
+        ):
+            return None
+
+        if image.format == "JPEG":
+            # Decode at the smallest DCT scale that still covers max_edge
+            image.draft("RGB", (max_edge, max_edge))
+
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail(
+            (max_edge, max_edge), Image.Resampling.LANCZOS, reducing_gap=2.0
+        )
+        image = _to_rgb(image)
+
+        buffer = io.BytesIO()
+        image.save(buffer, "JPEG", quality=quality, optimize=True)
+        return buffer.getvalue()
+
+
+def read_image_size(image_path: str | os.PathLike[str]) -> tuple[int, int]:
+    """
+    Read image dimensions from the file header without decoding pixels.
+
+    Args:
+        image_path: Path to image file
+
+    Returns:
+        Tuple of (width, height) in pixels as stored, before EXIF rotation
+
+    Raises:
+        OSError: If the image cannot be read
+    """
+    with Image.open(image_path) as image:
+        return image.size
+
+
+def _to_rgb(image: Image.Image) -> Image.Image:
+    """Convert to RGB, flattening any transparency onto white."""
+    if image.mode == "RGB":
+        return image
+
+    if image.mode in ("RGBA", "LA") or "transparency" in image.info:
+        rgba = image.convert("RGBA")
+        background = Image.new("RGB", rgba.size, "white")
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        return background
+
+    return image.convert("RGB")
@@ -0,0 +1,392 @@
+"""
+Persistent job records for resumable directory runs.
+
+A job remembers the directory and options of one run and every image it
+discovered, each in one of ITEM_STATES. An interrupted run is resumed by
+opening its job again: images that are not done go back to pending, and
+once discovery has completed the walk is not repeated.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+# States of a job item; an image being processed is still pending
+ITEM_STATES = ("pending", "done", "failed")
+
+# States of a job
+JOB_STATES = ("running", "interrupted", "completed")
+
+# Accepted values for the journal_mode pragma
+JOURNAL_MODES = ("delete", "truncate", "persist", "memory", "wal", "off")
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS jobs (
+        id TEXT PRIMARY KEY,
+        kind TEXT NOT NULL,
+        directory TEXT NOT NULL,
+        options TEXT NOT NULL DEFAULT '{}',
+        status TEXT NOT NULL DEFAULT 'running',
+        discovered INTEGER NOT NULL DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS job_items (
+        job_id TEXT NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+        path TEXT NOT NULL,
+        state TEXT NOT NULL DEFAULT 'pending',
+        result TEXT,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (job_id, path)
+    )
+    """,
+    # Resumed runs page through one state of one job in discovery order
+    "CREATE INDEX IF NOT EXISTS idx_job_items_state ON job_items(job_id, state)",
+)
+
+# Record an item state whether or not discovery has stored the item yet
+_SET_STATE = """
+    INSERT INTO job_items (job_id, path, state, result) VALUES (?, ?, ?, ?)
+    ON CONFLICT(job_id, path) DO UPDATE SET
+        state = excluded.state,
+        result = coalesce(excluded.result, job_items.result),
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+
+class JobNotFoundError(LookupError):
+    """Raised when a job id is not in the job store."""
+
+
+class JobStore:
+    """
+    SQLite store of jobs and their work items.
+
+    Keeps one connection, shared by all threads, so the store can sit in
+    the same database file as other tables.
+    """
+
+    def __init__(
+        self,
+        db_path: str | os.PathLike[str],
+        journal_mode: str = "wal",
+        busy_timeout: float = 5.0,
+    ) -> None:
+        """
+        Open job store, creating its tables if needed.
+
+        Args:
+            db_path: Path to SQLite database file
+            journal_mode: SQLite journal mode, one of JOURNAL_MODES
+            busy_timeout: Seconds to wait for a lock held by another connection
+
+        Raises:
+            ValueError: If journal_mode is not one of JOURNAL_MODES
+        """
+        journal_mode = journal_mode.lower()
+        if journal_mode not in JOURNAL_MODES:
+            raise ValueError(
+                f"Invalid journal mode: {journal_mode}. "
+                f"Expected one of: {', '.join(JOURNAL_MODES)}"
+            )
+
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            self.db_path,
+            timeout=busy_timeout,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute(f"PRAGMA journal_mode = {journal_mode}")
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+
+    def _write(self, sql: str, rows: Iterable[tuple]) -> int:
+        """Run a statement for each row in one transaction."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                changed = self._conn.executemany(sql, rows).rowcount
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return changed
+
+    def create_job(
+        self, kind: str, directory: str, options: dict[str, Any] | None = None
+    ) -> str:
+        """
+        Create a job.
+
+        Args:
+            kind: Tool that runs the job, such as "meta" or "rename"
+            directory: Directory the job processes
+            options: JSON-serializable options needed to repeat discovery
+
+        Returns:
+            New job id
+        """
+        job_id = uuid.uuid4().hex[:12]
+        self._write(
+            "INSERT INTO jobs (id, kind, directory, options) VALUES (?, ?, ?, ?)",
+            [(job_id, kind, directory, json.dumps(options or {}))],
+        )
+        return job_id
+
+    def get_job(self, job_id: str) -> dict[str, Any]:
+        """
+        Get a job with the number of items in each state.
+
+        Args:
+            job_id: Job id
+
+        Returns:
+            Dictionary of job fields, with options decoded and "items"
+            mapping every ITEM_STATES entry to a count
+
+        Raises:
+            JobNotFoundError: If the job does not exist
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                raise JobNotFoundError(f"Job not found: {job_id}")
+
+            counts = dict.fromkeys(ITEM_STATES, 0)
+            counts.update(
+                self._conn.execute(
+                    """
+                    SELECT state, COUNT(*) FROM job_items
+                    WHERE job_id = ? GROUP BY state
+                """,
+                    (job_id,),
+                ).fetchall()
+            )
+
+        job = dict(row)
+        job["options"] = json.loads(job["options"])
+        job["discovered"] = bool(job["discovered"])
+        job["items"] = counts
+        return job
+
+    def resume_job(self, job_id: str) -> dict[str, Any]:
+        """
+        Prepare a job to run again.
+
+        Failed items are returned to pending.
+
+        Args:
+            job_id: Job id
+
+        Returns:
+            The job, as returned by get_job
+
+        Raises:
+            JobNotFoundError: If the job does not exist
+        """
+        self.get_job(job_id)
+        self._write(
+            """
+            UPDATE job_items SET state = 'pending', updated_at = CURRENT_TIMESTAMP
+            WHERE job_id = ? AND state = 'failed'
+        """,
+            [(job_id,)],
+        )
+        self.set_status(job_id, "running")
+        return self.get_job(job_id)
+
+    def prune(self, keep: int) -> int:
+        """
+        Delete completed jobs other than the most recent ones.
+
+        Their items are deleted with them. Running and interrupted jobs are
+        kept, so they can still be resumed.
+
+        Args:
+            keep: Number of completed jobs to keep
+
+        Returns:
+            Number of jobs deleted
+        """
+        return self._write(
+            """
+            DELETE FROM jobs WHERE status = 'completed' AND id NOT IN (
+                SELECT id FROM jobs WHERE status = 'completed'
+                ORDER BY updated_at DESC, rowid DESC LIMIT ?
+            )
+        """,
+            [(max(keep, 0),)],
+        )
+
+    def set_status(self, job_id: str, status: str) -> None:
+        """
+        Set the status of a job.
+
+        Raises:
+            ValueError: If status is not one of JOB_STATES
+        """
+        if status not in JOB_STATES:
+            raise ValueError(f"Unknown job status: {status}")
+        self._write(
+            "UPDATE jobs SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+            [(status, job_id)],
+        )
+
+    def discover(
+        self,
+        job_id: str,
+        paths: Iterable[Path],
+        skip: Iterable[str] = (),
+        batch_size: int = 500,
+    ) -> Iterator[Path]:
+        """
+        Record discovered paths as pending items while passing them on.
+
+        Paths are stored in batches; once the source is exhausted the job is
+        marked as discovered, so resumed runs read its items instead of
+        walking the directory again. Paths already recorded keep their state.
+
+        Args:
+            job_id: Job id
+            paths: Discovered paths
+            skip: Paths not to record or yield, such as finished items
+            batch_size: Paths per insert transaction
+
+        Yields:
+            Discovered paths not in skip
+        """
+        skip = set(skip)
+        batch: list[tuple[str, str]] = []
+        for path in paths:
+            if str(path) in skip:
+                continue
+            batch.append((job_id, str(path)))
+            if len(batch) >= batch_size:
+                self._add_items(batch)
+                batch = []
+            yield path
+
+        self._add_items(batch)
+        self._write(
+            "UPDATE jobs SET discovered = 1, updated_at = CURRENT_TIMESTAMP "
+            "WHERE id = ?",
+            [(job_id,)],
+        )
+
+    def _add_items(self, rows: list[tuple[str, str]]) -> None:
+        """Insert pending items, leaving existing ones untouched."""
+        if rows:
+            self._write(
+                "INSERT OR IGNORE INTO job_items (job_id, path) VALUES (?, ?)", rows
+            )
+
+    def iter_items(
+        self, job_id: str, state: str = "pending", batch_size: int = 1000
+    ) -> Iterator[str]:
+        """
+        Yield the paths of items in one state, in discovery order.
+
+        Items are read a page at a time, so their states may change while
+        iterating.
+
+        Args:
+            job_id: Job id
+            state: One of ITEM_STATES
+            batch_size: Items per query
+
+        Yields:
+            Item paths
+        """
+        last_rowid = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    """
+                    SELECT rowid, path FROM job_items
+                    WHERE job_id = ? AND state = ? AND rowid > ?
+                    ORDER BY rowid
+                    LIMIT ?
+                """,
+                    (job_id, state, last_rowid, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            last_rowid = rows[-1]["rowid"]
+            for row in rows:
+                yield row["path"]
+
+    def get_results(self, job_id: str, state: str = "done") -> dict[str, str | None]:
+        """
+        Get the paths of items in one state with their recorded results.
+
+        Args:
+            job_id: Job id
+            state: One of ITEM_STATES
+
+        Returns:
+            Dictionary mapping item path to result
+        """
+        with self._lock:
+            return dict(
+                self._conn.execute(
+                    "SELECT path, result FROM job_items WHERE job_id = ? AND state = ?",
+                    (job_id, state),
+                ).fetchall()
+            )
+
+    def mark(
+        self,
+        job_id: str,
+        paths: Iterable[str | os.PathLike[str]],
+        state: str,
+        result: str | None = None,
+    ) -> int:
+        """
+        Set the state of items in one transaction.
+
+        Args:
+            job_id: Job id
+            paths: Item paths
+            state: One of ITEM_STATES
+            result: Outcome to record with every item, such as a new path
+
+        Returns:
+            Number of items updated
+
+        Raises:
+            ValueError: If state is not one of ITEM_STATES
+        """
+        if state not in ITEM_STATES:
+            raise ValueError(f"Unknown job item state: {state}")
+        return self._write(
+            _SET_STATE, [(job_id, str(path), state, result) for path in paths]
+        )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "JobStore":
+        """Return store for use as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the store on context exit."""
+        self.close()
@@ -0,0 +1,217 @@
+"""
+Adapt the number of concurrent Ollama requests to what the server sustains.
+
+The right level of parallelism depends on the model, GPU memory and
+OLLAMA_NUM_PARALLEL. Instead of a fixed setting, the limiter follows an
+additive-increase / multiplicative-decrease (AIMD) rule: every round of
+requests answered close to the best recent latency raises the limit by one,
+while a timeout or a request much slower than that baseline cuts it by a
+constant factor. The baseline is the fastest of the last few requests, so
+one unusually fast request (a tiny or cached image) stops counting once it
+leaves the window, and the limit starts halfway and ramps up.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any
+
+
+class AdaptiveLimiter:
+    """
+    AIMD limit on concurrent requests.
+
+    Thread-safe; threads wait in slot() and coroutines in aslot(), so one
+    limiter can gate both the threaded and the asyncio clients.
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = 1,
+        initial_limit: int | None = None,
+        backoff: float = 0.75,
+        latency_tolerance: float = 2.0,
+        is_drop: Callable[[Exception], bool] | None = None,
+        baseline_window: int = 20,
+    ) -> None:
+        """
+        Initialize limiter.
+
+        Args:
+            max_limit: Highest number of concurrent requests allowed
+            min_limit: Lowest limit backoff can reach
+            initial_limit: Starting limit (default: half of max_limit, at
+                least min_limit)
+            backoff: Factor the limit is multiplied by on a drop
+            latency_tolerance: Multiple of the baseline latency above which
+                a request counts as a sign of overload
+            is_drop: Whether an error raised during a request means the
+                server is overloaded, such as a timeout (default: no error
+                does; other errors give no latency sample)
+            baseline_window: Number of recent latencies whose minimum is the
+                baseline
+
+        Raises:
+            ValueError: If the limits are not 1 <= min_limit <= max_limit,
+                or baseline_window is less than 1
+        """
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError(
+                f"Invalid concurrency limits: min {min_limit}, max {max_limit}"
+            )
+        if baseline_window < 1:
+            raise ValueError(f"Invalid baseline window: {baseline_window}")
+
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.is_drop = is_drop
+
+        if initial_limit is None:
+            initial_limit = max(min_limit, max_limit // 2)
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._successes = 0
+        self._drops = 0
+        self._latencies: deque[float] = deque(maxlen=baseline_window)
+        # Requests finished since the last decrease; requests that were
+        # already in flight when the limit was cut must not cut it again
+        self._since_decrease = max_limit
+
+        self._cond = threading.Condition()
+        self._async_waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    @property
+    def limit(self) -> int:
+        """Current number of concurrent requests allowed."""
+        return int(self._limit)
+
+    def _try_acquire(self) -> bool:
+        """Take a slot if one is free; hold the condition."""
+        if self._in_flight < int(self._limit):
+            self._in_flight += 1
+            return True
+        return False
+
+    def acquire(self) -> None:
+        """Wait for a free slot in the calling thread."""
+        with self._cond:
+            self._cond.wait_for(self._try_acquire)
+
+    async def aacquire(self) -> None:
+        """Wait for a free slot without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self._try_acquire():
+                    return
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            await waiter
+
+    def release(self, latency: float | None = None, dropped: bool = False) -> None:
+        """
+        Free a slot and adjust the limit from the request's outcome.
+
+        Args:
+            latency: Seconds the request took, if it succeeded
+            dropped: Whether the request timed out or otherwise showed the
+                server is overloaded
+        """
+        with self._cond:
+            self._in_flight -= 1
+            self._since_decrease += 1
+            if dropped:
+                self._decrease()
+            elif latency is not None:
+                self._record_latency(latency)
+
+            self._cond.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+        for loop, waiter in waiters:
+            loop.call_soon_threadsafe(_wake, waiter)
+
+    @property
+    def _baseline(self) -> float | None:
+        """Fastest recent latency; hold the condition."""
+        return min(self._latencies) if self._latencies else None
+
+    def _record_latency(self, latency: float) -> None:
+        """Grow the limit after a round of good latencies; hold the condition."""
+        self._latencies.append(latency)
+
+        if latency > self._baseline * self.latency_tolerance:
+            self._decrease()
+            return
+
+        self._successes += 1
+        # One round of requests at the current limit raises it by about one
+        self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+    def _decrease(self) -> None:
+        """Cut the limit multiplicatively, once per round; hold the condition."""
+        self._drops += 1
+        if self._since_decrease > self.limit:
+            self._since_decrease = 0
+            self._limit = max(self.min_limit, self._limit * self.backoff)
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold a slot in the calling thread for one request."""
+        self.acquire()
+        start_time = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            self.release(dropped=self.is_drop is not None and self.is_drop(e))
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self.release(time.monotonic() - start_time)
+
+    @asynccontextmanager
+    async def aslot(self) -> AsyncIterator[None]:
+        """Hold a slot in a coroutine for one request."""
+        await self.aacquire()
+        start_time = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            self.release(dropped=self.is_drop is not None and self.is_drop(e))
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self.release(time.monotonic() - start_time)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get the current limit and what it was derived from.
+
+        Returns:
+            Dictionary with limit, bounds, requests in flight, successful
+            and dropped requests, and the baseline (fastest recent) latency
+            in seconds
+        """
+        with self._cond:
+            return {
+                "limit": self.limit,
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+                "in_flight": self._in_flight,
+                "successes": self._successes,
+                "drops": self._drops,
+                "best_latency": self._baseline,
+            }
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    """Wake a coroutine waiting for a slot unless it was cancelled."""
+    if not waiter.done():
+        waiter.set_result(None)
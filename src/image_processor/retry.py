@@ -0,0 +1,307 @@
+"""
+Retry transient Ollama failures without hammering a recovering server.
+
+Retries back off exponentially with full jitter: each wait is drawn
+uniformly between zero and the exponential bound, so workers that failed
+together during a server restart come back spread out instead of in
+lockstep. A circuit breaker watches the failure rate over recent requests;
+once it crosses a threshold, every request through the breaker pauses, and
+after a cool-down a single trial request decides whether to resume.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+# States of a circuit breaker
+BREAKER_STATES = ("closed", "open", "half_open")
+
+# Longest a request waits before checking again whether a trial finished
+TRIAL_POLL_SECONDS = 1.0
+
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker.
+
+    Thread-safe and never blocks itself; callers wait the time returned by
+    before_request, so one breaker serves threaded and asyncio clients.
+    """
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        window: int = 20,
+        min_requests: int = 10,
+        open_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        on_state_change: Callable[[str, str], None] | None = None,
+    ) -> None:
+        """
+        Initialize circuit breaker.
+
+        Args:
+            failure_rate: Fraction of failed requests in the window that
+                opens the circuit
+            window: Number of recent requests the rate is computed over
+            min_requests: Requests needed in the window before it can open
+            open_seconds: Pause before a trial request is let through
+            clock: Source of monotonic time
+            on_state_change: Called with the old and new state on every
+                transition, e.g. to log it
+
+        Raises:
+            ValueError: If failure_rate is not in (0, 1] or window is too
+                small for min_requests
+        """
+        if not 0 < failure_rate <= 1:
+            raise ValueError(f"Invalid failure rate: {failure_rate}")
+        if not 1 <= min_requests <= window:
+            raise ValueError(
+                f"Invalid breaker window: {min_requests} of {window} requests"
+            )
+
+        self.failure_rate = failure_rate
+        self.min_requests = min_requests
+        self.open_seconds = open_seconds
+        self.clock = clock
+        self.on_state_change = on_state_change
+
+        self._state = "closed"
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._openings = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current state, one of BREAKER_STATES."""
+        return self._state
+
+    def _transition(self, state: str) -> None:
+        """Change state and report it; hold the lock."""
+        old_state, self._state = self._state, state
+        if state == "open":
+            self._opened_at = self.clock()
+            self._openings += 1
+            self._trial_in_flight = False
+        elif state == "closed":
+            self._outcomes.clear()
+        if self.on_state_change is not None:
+            self.on_state_change(old_state, state)
+
+    def before_request(self) -> float:
+        """
+        Ask whether a request may be sent now.
+
+        While the circuit is half open, the first caller is let through as
+        the trial request; it must report its outcome with record or cancel.
+
+        Returns:
+            0 if the request may be sent, otherwise seconds to wait before
+            asking again
+        """
+        with self._lock:
+            if self._state == "open":
+                remaining = self._opened_at + self.open_seconds - self.clock()
+                if remaining > 0:
+                    return remaining
+                self._transition("half_open")
+
+            if self._state == "half_open":
+                if self._trial_in_flight:
+                    return min(TRIAL_POLL_SECONDS, self.open_seconds)
+                self._trial_in_flight = True
+            return 0.0
+
+    def record(self, failed: bool) -> None:
+        """
+        Report the outcome of a request that before_request let through.
+
+        Args:
+            failed: Whether the request failed in a way that blames the server
+        """
+        with self._lock:
+            if self._state == "half_open":
+                self._transition("open" if failed else "closed")
+            elif self._state == "closed":
+                self._outcomes.append(failed)
+                if (
+                    len(self._outcomes) >= self.min_requests
+                    and sum(self._outcomes) / len(self._outcomes) >= self.failure_rate
+                ):
+                    self._transition("open")
+
+    def cancel(self) -> None:
+        """Report that a request ended without an outcome, e.g. on interrupt."""
+        with self._lock:
+            if self._state == "half_open":
+                self._trial_in_flight = False
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get the breaker's state and recent failure rate.
+
+        Returns:
+            Dictionary with state, number of times the circuit opened, and
+            the failure rate over the requests in the window
+        """
+        with self._lock:
+            return {
+                "state": self._state,
+                "openings": self._openings,
+                "failure_rate": (
+                    sum(self._outcomes) / len(self._outcomes) if self._outcomes else 0.0
+                ),
+            }
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, optionally behind a breaker."""
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        multiplier: float = 2.0,
+        rng: random.Random | None = None,
+    ) -> None:
+        """
+        Initialize retry policy.
+
+        Args:
+            attempts: Total attempts per call, including the first
+            base_delay: Upper bound of the wait after the first failure
+            max_delay: Cap on the upper bound of any wait
+            multiplier: Growth of the bound after each failure
+            rng: Random source for the jitter (default: a private instance)
+
+        Raises:
+            ValueError: If attempts is less than 1
+        """
+        if attempts < 1:
+            raise ValueError(f"Invalid retry attempts: {attempts}")
+
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.rng = rng or random.Random()
+
+    def delay(self, attempt: int) -> float:
+        """
+        Draw the wait after a failed attempt.
+
+        Args:
+            attempt: Zero-based index of the attempt that failed
+
+        Returns:
+            Seconds to wait, uniform between 0 and the exponential bound
+        """
+        bound = min(self.max_delay, self.base_delay * self.multiplier**attempt)
+        return self.rng.uniform(0, bound)
+
+    def call(
+        self,
+        attempt_fn: Callable[[int], T],
+        is_retryable: Callable[[Exception], bool],
+        breaker: CircuitBreaker | None = None,
+        on_retry: Callable[[int, Exception, float], None] | None = None,
+    ) -> T:
+        """
+        Call a function, retrying it in the calling thread.
+
+        Args:
+            attempt_fn: Makes one attempt; receives the zero-based attempt index
+            is_retryable: Whether an error is transient and blames the server;
+                other errors are raised at once and count as a server answer
+            breaker: Circuit breaker to wait on and report outcomes to
+            on_retry: Called with the attempt index, error and wait before
+                each retry, e.g. to log it
+
+        Returns:
+            Result of the first successful attempt
+
+        Raises:
+            Exception: The last error if all attempts fail, or the first one
+                that is not retryable
+        """
+        for attempt in range(self.attempts):
+            if breaker is not None:
+                while (wait := breaker.before_request()) > 0:
+                    time.sleep(wait)
+            try:
+                result = attempt_fn(attempt)
+            except Exception as e:
+                delay = self._failed(attempt, e, is_retryable, breaker, on_retry)
+                time.sleep(delay)
+                continue
+            except BaseException:
+                if breaker is not None:
+                    breaker.cancel()
+                raise
+            if breaker is not None:
+                breaker.record(False)
+            return result
+
+        raise AssertionError("unreachable: the last failed attempt raises")
+
+    async def acall(
+        self,
+        attempt_fn: Callable[[int], Awaitable[T]],
+        is_retryable: Callable[[Exception], bool],
+        breaker: CircuitBreaker | None = None,
+        on_retry: Callable[[int, Exception, float], None] | None = None,
+    ) -> T:
+        """
+        Await a coroutine function, retrying it without blocking the loop.
+
+        Takes the same arguments and raises the same errors as call.
+        """
+        for attempt in range(self.attempts):
+            if breaker is not None:
+                while (wait := breaker.before_request()) > 0:
+                    await asyncio.sleep(wait)
+            try:
+                result = await attempt_fn(attempt)
+            except Exception as e:
+                delay = self._failed(attempt, e, is_retryable, breaker, on_retry)
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                if breaker is not None:
+                    breaker.cancel()
+                raise
+            if breaker is not None:
+                breaker.record(False)
+            return result
+
+        raise AssertionError("unreachable: the last failed attempt raises")
+
+    def _failed(
+        self,
+        attempt: int,
+        error: Exception,
+        is_retryable: Callable[[Exception], bool],
+        breaker: CircuitBreaker | None,
+        on_retry: Callable[[int, Exception, float], None] | None,
+    ) -> float:
+        """Record a failed attempt and return the wait, or re-raise its error."""
+        retryable = is_retryable(error)
+        if breaker is not None:
+            breaker.record(retryable)
+        if not retryable or attempt == self.attempts - 1:
+            raise error
+
+        delay = self.delay(attempt)
+        if on_retry is not None:
+            on_retry(attempt, error, delay)
+        return delay
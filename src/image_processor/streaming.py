@@ -0,0 +1,76 @@
+"""
+Feed items from a blocking iterator to concurrent asyncio workers.
+"""
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any
+
+# Sentinel marking the end of the source
+_DONE = object()
+
+
+async def consume_concurrently(
+    source: Iterable[Any],
+    handler: Callable[[Any], Awaitable[None]],
+    workers: int,
+    queue_size: int | None = None,
+) -> None:
+    """
+    Run handler over items from source with a fixed number of workers.
+
+    The source is iterated in a worker thread, so blocking discovery such as
+    a directory walk never stalls the event loop, and items reach the
+    handlers as soon as they are found. A bounded queue applies backpressure
+    so discovery never runs far ahead of processing.
+
+    Args:
+        source: Iterable producing items; may block
+        handler: Coroutine function called once per item
+        workers: Number of concurrent handler invocations
+        queue_size: Maximum number of discovered items waiting for a worker
+            (default: twice the number of workers)
+
+    Raises:
+        Exception: Any error raised by the source or a handler; remaining
+            handlers are cancelled
+    """
+    workers = max(1, int(workers))
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size or workers * 2)
+    stop = threading.Event()
+
+    def produce() -> None:
+        try:
+            for item in source:
+                if stop.is_set():
+                    return
+                asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+        finally:
+            if not stop.is_set():
+                asyncio.run_coroutine_threadsafe(queue.put(_DONE), loop).result()
+
+    async def work() -> None:
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                # Pass the sentinel on so every worker sees it
+                queue.put_nowait(_DONE)
+                return
+            await handler(item)
+
+    producer = asyncio.ensure_future(asyncio.to_thread(produce))
+    tasks = [asyncio.ensure_future(work()) for _ in range(workers)]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Unblock the producer if workers stopped before the source ended
+        stop.set()
+        while not queue.empty():
+            queue.get_nowait()
+        await producer
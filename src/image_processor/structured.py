@@ -0,0 +1,121 @@
+"""
+JSON schemas for structured model output and a validator for them.
+
+Ollama's `format` parameter constrains decoding to a JSON schema, which
+keeps chatty preambles out of descriptions and filenames. Constrained
+decoding still allows empty strings, truncated output when the token
+limit is reached, or a grammar the server does not fully enforce, so
+responses are validated again here and re-asked only when they fail.
+
+The validator covers the subset of JSON Schema the schemas below use:
+object, array, string and number types, required properties, items and
+string length bounds.
+"""
+
+import json
+from typing import Any
+
+# Structured description of an image
+DESCRIPTION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string", "minLength": 1, "maxLength": 80},
+        "description": {"type": "string", "minLength": 1},
+        "tags": {
+            "type": "array",
+            "items": {"type": "string", "minLength": 1, "maxLength": 40},
+        },
+        "text": {"type": "string"},
+    },
+    "required": ["title", "description", "tags", "text"],
+}
+
+_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "number": (int, float),
+    "integer": int,
+    "boolean": bool,
+}
+
+
+class SchemaError(ValueError):
+    """Raised when model output does not match the requested schema."""
+
+
+def validate(value: Any, schema: dict[str, Any], path: str = "$") -> None:
+    """
+    Check a decoded value against a schema.
+
+    Args:
+        value: Decoded JSON value
+        schema: JSON schema using the supported subset
+        path: Location of value, for error messages
+
+    Raises:
+        SchemaError: At the first mismatch found
+    """
+    expected = schema.get("type")
+    if expected is not None:
+        python_type = _TYPES[expected]
+        # bool is an int subclass but never a valid number
+        if not isinstance(value, python_type) or (
+            isinstance(value, bool) and expected != "boolean"
+        ):
+            raise SchemaError(
+                f"{path}: expected {expected}, got {type(value).__name__}"
+            )
+
+    if isinstance(value, dict):
+        for key in schema.get("required", []):
+            if key not in value:
+                raise SchemaError(f"{path}: missing required property '{key}'")
+        for key, subschema in schema.get("properties", {}).items():
+            if key in value:
+                validate(value[key], subschema, f"{path}.{key}")
+
+    elif isinstance(value, list) and "items" in schema:
+        for index, item in enumerate(value):
+            validate(item, schema["items"], f"{path}[{index}]")
+
+    elif isinstance(value, str):
+        length = len(value.strip())
+        if length < schema.get("minLength", 0):
+            raise SchemaError(f"{path}: empty or too short")
+        if length > schema.get("maxLength", length):
+            raise SchemaError(f"{path}: longer than {schema['maxLength']} characters")
+
+
+def parse(content: str, schema: dict[str, Any]) -> dict[str, Any]:
+    """
+    Decode model output and validate it against a schema.
+
+    Args:
+        content: Text returned by the model
+        schema: JSON schema the output was constrained to
+
+    Returns:
+        Decoded object with surrounding whitespace stripped from strings
+
+    Raises:
+        SchemaError: If the content is not JSON or does not match the schema
+    """
+    try:
+        value = json.loads(content)
+    except json.JSONDecodeError as e:
+        raise SchemaError(f"Invalid JSON: {e}") from e
+
+    validate(value, schema)
+    return _strip(value)
+
+
+def _strip(value: Any) -> Any:
+    """Strip whitespace from every string in a decoded value."""
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, list):
+        return [_strip(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _strip(item) for key, item in value.items()}
+    return value
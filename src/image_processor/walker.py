@@ -0,0 +1,130 @@
+"""
+Single-pass directory walker shared by the meta and name tools.
+"""
+
+import fnmatch
+import os
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+
+# Symlink policies
+SYMLINKS_SKIP = "skip"  # Ignore symlinked files and directories
+SYMLINKS_FILES = "files"  # Yield symlinked files, never descend into symlinked dirs
+SYMLINKS_FOLLOW = "follow"  # Yield symlinked files and descend into symlinked dirs
+
+SYMLINK_POLICIES = (SYMLINKS_SKIP, SYMLINKS_FILES, SYMLINKS_FOLLOW)
+
+
+def _matches(name: str, relative_path: str, patterns: tuple[str, ...]) -> bool:
+    """Check a name or root-relative path against glob patterns."""
+    return any(
+        fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(relative_path, pattern)
+        for pattern in patterns
+    )
+
+
+def walk_files(
+    directory: str | os.PathLike[str],
+    extensions: Iterable[str] | None = None,
+    include: Iterable[str] | None = None,
+    exclude: Iterable[str] | None = None,
+    recursive: bool = True,
+    symlinks: str = SYMLINKS_FILES,
+    onerror: Callable[[OSError], None] | None = None,
+) -> Iterator[os.DirEntry[str]]:
+    """
+    Lazily yield files below a directory using os.scandir.
+
+    Extensions and patterns are checked on the entry name before any stat
+    call, and file type checks use the type information returned by the
+    directory listing, so most entries cost no extra syscalls. Each
+    directory is listed completely before its files are yielded, so callers
+    may rename files while iterating without seeing them twice.
+
+    Args:
+        directory: Directory to walk
+        extensions: Lowercase extensions (e.g. ".jpg") to yield; all files if None
+        include: Glob patterns a file name or relative path must match
+        exclude: Glob patterns for file and directory names or relative
+            paths to skip; excluded directories are not descended into
+        recursive: Whether to descend into subdirectories
+        symlinks: Symlink policy, one of "skip", "files" or "follow"
+        onerror: Called with the OSError when a directory cannot be listed
+
+    Yields:
+        os.DirEntry for each matching file
+
+    Raises:
+        ValueError: If symlinks is not a known policy
+    """
+    if symlinks not in SYMLINK_POLICIES:
+        raise ValueError(
+            f"Unknown symlink policy: {symlinks}. "
+            f"Expected one of: {', '.join(SYMLINK_POLICIES)}"
+        )
+
+    extensions = tuple(extension.lower() for extension in extensions or ())
+    include = tuple(include or ())
+    exclude = tuple(exclude or ())
+    follow_dirs = symlinks == SYMLINKS_FOLLOW
+
+    # Stack of (directory path, its path relative to the root with a trailing /)
+    pending = [(os.fspath(directory), "")]
+    visited: set[tuple[int, int]] = set()
+
+    while pending:
+        current, relative_dir = pending.pop()
+
+        if follow_dirs:
+            # Guard against symlink cycles by tracking visited directories
+            try:
+                current_stat = Path(current).stat()
+            except OSError as e:
+                if onerror:
+                    onerror(e)
+                continue
+            key = (current_stat.st_dev, current_stat.st_ino)
+            if key in visited:
+                continue
+            visited.add(key)
+
+        try:
+            with os.scandir(current) as iterator:
+                entries = list(iterator)
+        except OSError as e:
+            if onerror:
+                onerror(e)
+            continue
+
+        subdirectories = []
+        for entry in entries:
+            name = entry.name
+            relative_path = relative_dir + name
+
+            if exclude and _matches(name, relative_path, exclude):
+                continue
+
+            try:
+                if symlinks == SYMLINKS_SKIP and entry.is_symlink():
+                    continue
+
+                if entry.is_dir(follow_symlinks=follow_dirs):
+                    if recursive:
+                        subdirectories.append((entry.path, relative_path + "/"))
+                    continue
+
+                if extensions and not name.lower().endswith(extensions):
+                    continue
+
+                if include and not _matches(name, relative_path, include):
+                    continue
+
+                if entry.is_file():
+                    yield entry
+            except OSError as e:
+                # Entry vanished or a dangling symlink; skip it
+                if onerror:
+                    onerror(e)
+
+        # Reverse so subdirectories are walked in listing order
+        pending.extend(reversed(subdirectories))
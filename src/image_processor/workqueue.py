@@ -0,0 +1,355 @@
+"""
+Lease-based work queue shared by worker processes on several hosts.
+
+Images are enqueued once and claimed by workers in small batches. A claim
+is a lease that the worker extends with heartbeats while it works; if a
+worker crashes, its leases expire and the items are handed to the next
+worker that claims. Items that keep failing, or keep outliving their
+lease, are parked as failed after max_attempts claims.
+
+The queue is a table in an SQLite file that every worker opens. When the
+file sits on a network share, use the "delete" journal mode: WAL needs
+shared memory that only works on a single host.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+# States of a queue item, in the order an item moves through them
+ITEM_STATES = ("pending", "leased", "done", "failed")
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS work_queue (
+        path TEXT PRIMARY KEY,
+        state TEXT NOT NULL DEFAULT 'pending',
+        worker TEXT,
+        lease_expires REAL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        error TEXT,
+        enqueued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    # Claims look for pending items and for leases that have expired
+    "CREATE INDEX IF NOT EXISTS idx_work_queue_state ON work_queue(state, lease_expires)",
+)
+
+
+class WorkQueue:
+    """
+    SQLite work queue with leased claims.
+
+    Keeps one connection, shared by all threads of a worker, so the queue
+    can sit in the same database file as the descriptions.
+    """
+
+    def __init__(
+        self,
+        db_path: str | os.PathLike[str],
+        lease_seconds: float = 300.0,
+        max_attempts: int = 3,
+        journal_mode: str = "wal",
+        busy_timeout: float = 5.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Open work queue, creating its table if needed.
+
+        Args:
+            db_path: Path to SQLite database file
+            lease_seconds: How long a claim lasts without a heartbeat
+            max_attempts: Claims of an item before it is parked as failed
+            journal_mode: SQLite journal mode
+            busy_timeout: Seconds to wait for a lock held by another worker
+            clock: Source of the wall-clock time leases are compared against
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.clock = clock
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            self.db_path,
+            timeout=busy_timeout,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute(f"PRAGMA journal_mode = {journal_mode}")
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Hold the write lock for one transaction."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def enqueue(
+        self, paths: Iterable[str | os.PathLike[str]], batch_size: int = 500
+    ) -> int:
+        """
+        Add paths as pending items.
+
+        Paths already in the queue keep their state, so enqueueing a
+        directory again only adds the images that are new.
+
+        Args:
+            paths: Image paths
+            batch_size: Paths per insert transaction
+
+        Returns:
+            Number of items added
+        """
+        added = 0
+        batch: list[tuple[str]] = []
+        for path in paths:
+            batch.append((str(path),))
+            if len(batch) >= batch_size:
+                added += self._insert(batch)
+                batch = []
+        return added + self._insert(batch)
+
+    def _insert(self, rows: list[tuple[str]]) -> int:
+        """Insert pending items, leaving existing ones untouched."""
+        if not rows:
+            return 0
+        with self._transaction() as conn:
+            return conn.executemany(
+                "INSERT OR IGNORE INTO work_queue (path) VALUES (?)", rows
+            ).rowcount
+
+    def claim(self, worker: str, limit: int = 1) -> list[str]:
+        """
+        Lease pending items, and items whose lease expired, to a worker.
+
+        Expired items that already used up max_attempts are marked failed
+        instead of being claimed again.
+
+        Args:
+            worker: Id of the claiming worker
+            limit: Maximum number of items to claim
+
+        Returns:
+            Claimed paths in enqueue order; empty if there is nothing to do
+        """
+        now = self.clock()
+        with self._transaction() as conn:
+            conn.execute(
+                """
+                UPDATE work_queue
+                SET state = 'failed', worker = NULL, lease_expires = NULL,
+                    error = coalesce(error, 'Lease expired'),
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?
+            """,
+                (now, self.max_attempts),
+            )
+            rows = conn.execute(
+                """
+                UPDATE work_queue
+                SET state = 'leased', worker = ?, lease_expires = ?,
+                    attempts = attempts + 1, updated_at = CURRENT_TIMESTAMP
+                WHERE rowid IN (
+                    SELECT rowid FROM work_queue
+                    WHERE state = 'pending'
+                        OR (state = 'leased' AND lease_expires < ?)
+                    ORDER BY rowid
+                    LIMIT ?
+                )
+                RETURNING rowid, path
+            """,
+                (worker, now + self.lease_seconds, now, limit),
+            ).fetchall()
+        return [row["path"] for row in sorted(rows, key=lambda row: row["rowid"])]
+
+    def heartbeat(self, worker: str) -> int:
+        """
+        Extend every lease held by a worker.
+
+        Args:
+            worker: Worker id
+
+        Returns:
+            Number of leases extended
+        """
+        with self._transaction() as conn:
+            return conn.execute(
+                """
+                UPDATE work_queue SET lease_expires = ?
+                WHERE state = 'leased' AND worker = ?
+            """,
+                (self.clock() + self.lease_seconds, worker),
+            ).rowcount
+
+    @contextmanager
+    def keep_alive(self, worker: str, interval: float | None = None) -> Iterator[None]:
+        """
+        Send heartbeats for a worker from a background thread.
+
+        Args:
+            worker: Worker id
+            interval: Seconds between heartbeats (default: a third of the lease)
+        """
+        interval = self.lease_seconds / 3 if interval is None else interval
+        stopped = threading.Event()
+
+        def beat() -> None:
+            while not stopped.wait(interval):
+                try:
+                    self.heartbeat(worker)
+                except sqlite3.Error:
+                    # A busy database only delays the beat; the lease has slack
+                    continue
+
+        thread = threading.Thread(target=beat, name=f"heartbeat-{worker}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stopped.set()
+            thread.join()
+
+    def complete(self, worker: str, paths: Iterable[str | os.PathLike[str]]) -> int:
+        """
+        Mark items leased by a worker as done.
+
+        Items whose lease expired and went to another worker are left alone.
+
+        Args:
+            worker: Worker id
+            paths: Finished item paths
+
+        Returns:
+            Number of items marked done
+        """
+        with self._transaction() as conn:
+            return conn.executemany(
+                """
+                UPDATE work_queue
+                SET state = 'done', worker = NULL, lease_expires = NULL,
+                    error = NULL, updated_at = CURRENT_TIMESTAMP
+                WHERE path = ? AND state = 'leased' AND worker = ?
+            """,
+                [(str(path), worker) for path in paths],
+            ).rowcount
+
+    def fail(self, worker: str, path: str | os.PathLike[str], error: str) -> bool:
+        """
+        Record a failed attempt at an item leased by a worker.
+
+        The item goes back to pending until it has been claimed max_attempts
+        times, and is then parked as failed.
+
+        Args:
+            worker: Worker id
+            path: Item path
+            error: Failure message
+
+        Returns:
+            True if the item will be retried
+        """
+        with self._transaction() as conn:
+            rows = conn.execute(
+                """
+                UPDATE work_queue
+                SET state = CASE WHEN attempts < ? THEN 'pending' ELSE 'failed' END,
+                    worker = NULL, lease_expires = NULL, error = ?,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE path = ? AND state = 'leased' AND worker = ?
+                RETURNING state
+            """,
+                (self.max_attempts, error, str(path), worker),
+            ).fetchall()
+        return any(row["state"] == "pending" for row in rows)
+
+    def release(self, worker: str) -> int:
+        """
+        Return the items leased by a stopping worker to pending.
+
+        The claims are not counted as attempts.
+
+        Args:
+            worker: Worker id
+
+        Returns:
+            Number of items released
+        """
+        with self._transaction() as conn:
+            return conn.execute(
+                """
+                UPDATE work_queue
+                SET state = 'pending', worker = NULL, lease_expires = NULL,
+                    attempts = max(attempts - 1, 0), updated_at = CURRENT_TIMESTAMP
+                WHERE state = 'leased' AND worker = ?
+            """,
+                (worker,),
+            ).rowcount
+
+    def retry_failed(self) -> int:
+        """
+        Return failed items to pending with a fresh attempt count.
+
+        Returns:
+            Number of items requeued
+        """
+        with self._transaction() as conn:
+            return conn.execute(
+                """
+                UPDATE work_queue
+                SET state = 'pending', attempts = 0, updated_at = CURRENT_TIMESTAMP
+                WHERE state = 'failed'
+            """
+            ).rowcount
+
+    def counts(self, exclude_worker: str | None = None) -> dict[str, int]:
+        """
+        Count items in each state.
+
+        Args:
+            exclude_worker: Worker whose own leases are not counted
+
+        Returns:
+            Dictionary mapping every ITEM_STATES entry to a count; expired
+            leases are still counted as leased until they are claimed again
+        """
+        counts = dict.fromkeys(ITEM_STATES, 0)
+        with self._lock:
+            counts.update(
+                self._conn.execute(
+                    """
+                    SELECT state, COUNT(*) FROM work_queue
+                    WHERE ? IS NULL OR worker IS NOT ?
+                    GROUP BY state
+                """,
+                    (exclude_worker, exclude_worker),
+                ).fetchall()
+            )
+        return counts
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "WorkQueue":
+        """Return queue for use as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the queue on context exit."""
+        self.close()
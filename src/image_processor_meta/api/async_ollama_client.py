@@ -0,0 +1,273 @@
+"""
+Asyncio Ollama API client for concurrent image description generation.
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+from image_processor.encoding import JsonBody
+from image_processor.structured import DESCRIPTION_SCHEMA, SchemaError
+
+from ..exceptions import OllamaConnectionError, OllamaResponseError, OllamaTimeoutError
+from ..tools.config_manager import config
+from ..tools.log_manager import get_logger
+from .ollama_client import COMBINED_SCHEMA, OllamaClient
+
+logger = get_logger(__name__)
+
+
+class AsyncOllamaClient(OllamaClient):
+    """
+    Asyncio counterpart of OllamaClient.
+
+    Requests go through a shared httpx.AsyncClient and a semaphore bounds the
+    number of requests in flight, so a single event loop can keep an Ollama
+    server with OLLAMA_NUM_PARALLEL > 1 saturated without overloading it.
+    Retries back off with asyncio.sleep outside the semaphore. Synchronous
+    helpers such as test_connection remain available.
+    """
+
+    def __init__(
+        self,
+        endpoint: str | None = None,
+        model: str | None = None,
+        timeout: int | None = None,
+        max_in_flight: int | None = None,
+        endpoints: list[str] | None = None,
+    ) -> None:
+        """
+        Initialize async Ollama client.
+
+        Args:
+            endpoint: Ollama API endpoint URL
+            model: Model name to use
+            timeout: Request timeout in seconds
+            max_in_flight: Maximum number of concurrent requests to Ollama
+            endpoints: Endpoint URLs to balance requests over (default from
+                ollama.endpoints; ignored if endpoint is given)
+
+        Raises:
+            ImportError: If httpx is not installed
+        """
+        if httpx is None:
+            raise ImportError(
+                "Async mode requires httpx. Install it with: uv sync --extra async"
+            )
+
+        self.max_in_flight = max_in_flight or config.get("ollama.max_in_flight", 4)
+        super().__init__(
+            endpoint, model, timeout, pool_size=self.max_in_flight, endpoints=endpoints
+        )
+
+        self._client: Any = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+    @property
+    def client(self) -> Any:
+        """Lazily created httpx.AsyncClient sized to max_in_flight."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_in_flight,
+                    max_keepalive_connections=self.max_in_flight,
+                ),
+                headers={"Content-Type": "application/json"},
+            )
+        return self._client
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        """Semaphore bounding the number of requests in flight."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self._semaphore
+
+    def is_overloaded(self, error: Exception) -> bool:
+        """Whether a request error means Ollama is overloaded."""
+        return isinstance(error, httpx.TimeoutException) or super().is_overloaded(error)
+
+    @asynccontextmanager
+    async def arequest_slot(self) -> AsyncIterator[None]:
+        """Wait without blocking the loop until the limit admits a request."""
+        if self.limiter is None:
+            yield
+            return
+
+        async with self.limiter.aslot():
+            yield
+
+    async def agenerate_structured(
+        self,
+        image_path: Path,
+        schema: dict | None = None,
+        prompt: str | None = None,
+        usage: dict[str, int | None] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Generate a structured response for an image without blocking the loop.
+
+        Takes the same arguments, and re-asks on the same schema failures,
+        as generate_structured.
+
+        Returns:
+            Decoded response object
+        """
+        schema = schema or DESCRIPTION_SCHEMA
+        for attempt in range(self.schema_attempts):
+            content = await self.agenerate_description(
+                image_path, prompt or self.structured_prompt, usage, schema
+            )
+            try:
+                return self.parse_structured(content, schema)
+            except SchemaError as e:
+                self._log_schema_failure(image_path, attempt, e)
+                error = e
+
+        raise OllamaResponseError(
+            f"No valid structured response after {self.schema_attempts} "
+            f"attempts: {error}"
+        ) from error
+
+    async def agenerate_description_and_filename(
+        self,
+        image_path: Path,
+        usage: dict[str, int | None] | None = None,
+    ) -> tuple[str, str]:
+        """
+        Generate a description and a filename in one request without blocking.
+
+        Args:
+            image_path: Path to image file
+            usage: Dictionary to fill with token counts (optional)
+
+        Returns:
+            Tuple of description and suggested filename
+
+        Raises:
+            OllamaConnectionError: If connection to Ollama fails
+            OllamaTimeoutError: If request times out
+            OllamaResponseError: If response is invalid
+            ImageCorrupted: If image cannot be processed
+        """
+        fields = await self.agenerate_structured(
+            image_path, COMBINED_SCHEMA, self.combined_prompt, usage
+        )
+        return fields["description"], fields["filename"]
+
+    async def agenerate_description(
+        self,
+        image_path: Path,
+        prompt: str | None = None,
+        usage: dict[str, int | None] | None = None,
+        response_format: dict | None = None,
+    ) -> str:
+        """
+        Generate description for image using Ollama without blocking the loop.
+
+        Args:
+            image_path: Path to image file
+            prompt: Custom prompt for description (optional)
+            usage: Dictionary to fill with token counts (optional)
+            response_format: JSON schema the response must follow (optional)
+
+        Returns:
+            Generated description text
+
+        Raises:
+            OllamaConnectionError: If connection to Ollama fails
+            OllamaTimeoutError: If request times out
+            OllamaResponseError: If response is invalid
+            ImageCorrupted: If image cannot be processed
+        """
+        start_time = time.time()
+
+        # Callers bound how many images are open; the semaphore only bounds
+        # requests, so a source waiting out a retry does not hold a permit
+        source = await asyncio.to_thread(self.open_image, image_path)
+        try:
+            # Serialize the payload once; every attempt streams the same body
+            body = self.build_body(source, prompt, response_format)
+
+            async def attempt(index: int) -> tuple[str, Any]:
+                # Back off outside the semaphore so other requests can proceed
+                async with self.semaphore:
+                    logger.info(
+                        f"Generating description for: {image_path.name} "
+                        f"(attempt {index + 1})"
+                    )
+                    return await self._apost_body(body)
+
+            description, response = await self.retry_policy.acall(
+                attempt, self.is_transient, self.breaker, self._log_retry
+            )
+        finally:
+            source.close()
+        if usage is not None:
+            usage.update(self.parse_usage(response))
+
+        elapsed_time = time.time() - start_time
+        logger.info(
+            f"Generated description for {image_path.name} "
+            f"({len(description)} chars, {elapsed_time:.1f}s)"
+        )
+
+        return description
+
+    async def _apost_body(self, body: JsonBody) -> tuple[str, Any]:
+        """
+        Send one chat request without blocking the loop.
+
+        Args:
+            body: Request body built with build_body
+
+        Returns:
+            Description text and the HTTP response it came from
+
+        Raises:
+            OllamaConnectionError: If connection to Ollama fails
+            OllamaTimeoutError: If request times out
+            OllamaResponseError: If response is invalid
+        """
+        try:
+            async with self.arequest_slot():
+                with self.select_endpoint() as url:
+                    response = await self.client.post(
+                        url, content=aiter(body), headers=body.headers
+                    )
+                    return self.parse_response(response), response
+
+        except httpx.TimeoutException as e:
+            raise OllamaTimeoutError(
+                f"Request to Ollama timed out after {self.timeout}s"
+            ) from e
+        except httpx.ConnectError as e:
+            raise OllamaConnectionError(
+                f"Failed to connect to Ollama at {self.endpoint}: {e}"
+            ) from e
+        except httpx.HTTPError as e:
+            raise OllamaConnectionError(f"Request to Ollama failed: {e}") from e
+
+    async def aclose(self) -> None:
+        """Close async and pooled synchronous connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self.close()
+
+    async def __aenter__(self) -> "AsyncOllamaClient":
+        """Return client for use as an async context manager."""
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Close connections on context exit."""
+        await self.aclose()
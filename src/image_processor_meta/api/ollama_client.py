@@ -2,18 +2,28 @@
 Ollama API client for image description generation.
 """
 
-import base64
+import hashlib
 import json
 import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import ConnectionError, RequestException, Timeout
 
+from image_processor.balancer import LoadBalancer
+from image_processor.encoding import IMAGE_PLACEHOLDER, ImageSource, JsonBody
+from image_processor.limiter import AdaptiveLimiter
+from image_processor.retry import CircuitBreaker, RetryPolicy
+from image_processor.structured import DESCRIPTION_SCHEMA, SchemaError, parse
+
 from ..exceptions import (
     ImageCorrupted,
     OllamaConnectionError,
+    OllamaNotFoundError,
     OllamaResponseError,
     OllamaTimeoutError,
 )
@@ -22,6 +32,16 @@ from ..tools.log_manager import get_logger
 
 logger = get_logger(__name__)
 
+# JSON schema Ollama constrains a combined description and filename response to
+COMBINED_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "description": {"type": "string", "minLength": 1},
+        "filename": {"type": "string", "minLength": 1, "maxLength": 80},
+    },
+    "required": ["description", "filename"],
+}
+
 
 class OllamaClient:
     """Client for interacting with Ollama API."""
@@ -31,6 +51,9 @@ class OllamaClient:
         endpoint: str | None = None,
         model: str | None = None,
         timeout: int | None = None,
+        pool_size: int | None = None,
+        session: requests.Session | None = None,
+        endpoints: list[str] | None = None,
     ) -> None:
         """
         Initialize Ollama client.
@@ -39,46 +62,533 @@ class OllamaClient:
             endpoint: Ollama API endpoint URL
             model: Model name to use
             timeout: Request timeout in seconds
+            pool_size: Maximum number of keep-alive connections to Ollama
+            session: Existing HTTP session to share (owned by the caller)
+            endpoints: Endpoint URLs to balance requests over (default from
+                ollama.endpoints; ignored if endpoint is given)
         """
-        self.endpoint = endpoint or config.get(
-            "ollama.endpoint", "http://localhost:11434/api/chat"
+        if endpoint:
+            endpoints = [endpoint]
+        self.endpoints = (
+            endpoints
+            or config.get("ollama.endpoints", [])
+            or [config.get("ollama.endpoint", "http://localhost:11434/api/chat")]
         )
+        self.endpoint = self.endpoints[0]
         self.model = model or config.get("ollama.model", "llava")
         self.timeout = timeout or config.get("ollama.timeout", 30)
+        self.pool_size = pool_size or config.get("ollama.pool_size", 10)
+        self.retry_attempts = config.get("ollama.retry_attempts", 3)
+        self.retry_delay = config.get("ollama.retry_delay", 1.0)
+        self.retry_max_delay = config.get("ollama.retry_max_delay", 30.0)
+        self.prompt = config.get("ollama.prompt", "Describe this image in detail.")
+        self.combined_prompt = config.get(
+            "rename.prompt",
+            "Describe this image in detail, and suggest a filename of 4-5 words "
+            "for it. Respond in JSON with the keys description and filename.",
+        )
+        self.structured_prompt = config.get(
+            "structured.prompt",
+            "Describe this image. Respond in JSON with a short title, a detailed "
+            "description, a list of keyword tags, and any text visible in the "
+            "image (empty if none).",
+        )
+        self.schema_attempts = config.get("structured.max_attempts", 3)
+
+        # Keep the model loaded between requests and load it before a batch
+        self.keep_alive = config.get("ollama.keep_alive", "30m")
+        self.warm_up_enabled = config.get("ollama.warm_up.enabled", True)
+        self.warm_up_timeout = config.get("ollama.warm_up.timeout", 300)
+        self.warmup_latency: dict[str, float | None] = {}
+
+        # Downscale images before upload; the model resizes them anyway
+        self.preprocess = config.get("images.preprocess.enabled", True)
+        self.max_edge = config.get("images.preprocess.max_edge", 1024)
+        self.jpeg_quality = config.get("images.preprocess.jpeg_quality", 85)
+
+        self._owns_session = session is None
+        self.session = session or self.create_session(self.pool_size)
+
+        # Several endpoints are balanced by requests in flight
+        self.balancer = None
+        if len(self.endpoints) > 1:
+            self.balancer = LoadBalancer(
+                self.endpoints,
+                probe=self.probe_endpoint,
+                max_failures=config.get("ollama.eject_after_failures", 3),
+                probe_interval=config.get("ollama.probe_interval", 10.0),
+                is_failure=lambda e: (
+                    not isinstance(e, (OllamaResponseError, ImageCorrupted))
+                ),
+            )
+
+        # Requests in flight adapt to the latency and timeouts observed
+        self.limiter = None
+        if config.get("ollama.adaptive_concurrency.enabled", True):
+            self.limiter = AdaptiveLimiter(
+                max_limit=config.get("ollama.adaptive_concurrency.max_limit", None)
+                or self.pool_size,
+                min_limit=config.get("ollama.adaptive_concurrency.min_limit", 1),
+                initial_limit=config.get(
+                    "ollama.adaptive_concurrency.initial_limit", None
+                ),
+                backoff=config.get("ollama.adaptive_concurrency.backoff", 0.75),
+                latency_tolerance=config.get(
+                    "ollama.adaptive_concurrency.latency_tolerance", 3.0
+                ),
+                is_drop=self.is_overloaded,
+                baseline_window=config.get(
+                    "ollama.adaptive_concurrency.baseline_window", 20
+                ),
+            )
+
+        # A high failure rate pauses every request until a trial one succeeds
+        self.breaker = None
+        if config.get("ollama.circuit_breaker.enabled", True):
+            self.breaker = CircuitBreaker(
+                failure_rate=config.get("ollama.circuit_breaker.failure_rate", 0.5),
+                window=config.get("ollama.circuit_breaker.window", 20),
+                min_requests=config.get("ollama.circuit_breaker.min_requests", 10),
+                open_seconds=config.get("ollama.circuit_breaker.open_seconds", 30.0),
+                on_state_change=self._log_breaker_state,
+            )
+
+        logger.info(
+            f"Initialized Ollama client: {', '.join(self.endpoints)} "
+            f"(model: {self.model})"
+        )
+
+    @staticmethod
+    def create_session(pool_size: int) -> requests.Session:
+        """
+        Create an HTTP session with a keep-alive connection pool.
+
+        The session is safe to share between threads, so one pool can serve
+        every inference worker.
+
+        Args:
+            pool_size: Maximum number of pooled connections per host
+
+        Returns:
+            Configured requests session
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({"Content-Type": "application/json"})
+        return session
+
+    def close(self) -> None:
+        """Close pooled connections if the session is owned by this client."""
+        if self.balancer is not None:
+            self.balancer.close()
+            for backend in self.balancer.stats():
+                logger.info(f"Ollama backend stats: {backend}")
+        if self.limiter is not None:
+            logger.info(f"Ollama concurrency stats: {self.limiter.stats()}")
+        if self.breaker is not None:
+            logger.info(f"Ollama circuit breaker stats: {self.breaker.stats()}")
+        if self._owns_session:
+            self.session.close()
+            logger.debug("Closed Ollama HTTP session")
+
+    def __enter__(self) -> "OllamaClient":
+        """Return client for use as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close pooled connections on context exit."""
+        self.close()
+
+    def is_overloaded(self, error: Exception) -> bool:
+        """Whether a request error means Ollama is overloaded."""
+        return isinstance(error, (Timeout, OllamaTimeoutError))
+
+    def is_transient(self, error: Exception) -> bool:
+        """Whether a request error is worth retrying and blames the server."""
+        # A wrong endpoint or model is a configuration error; fail fast
+        if isinstance(error, OllamaNotFoundError):
+            return False
+        return isinstance(error, (OllamaConnectionError, OllamaTimeoutError))
+
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        """Backoff for transient failures, built from the current settings."""
+        return RetryPolicy(
+            attempts=self.retry_attempts,
+            base_delay=self.retry_delay,
+            max_delay=self.retry_max_delay,
+        )
+
+    def _log_retry(self, attempt: int, error: Exception, delay: float) -> None:
+        """Log a failed attempt before it is retried."""
+        logger.warning(
+            f"Attempt {attempt + 1} failed: {error}. Retrying in {delay:.1f}s..."
+        )
+
+    def _log_breaker_state(self, old_state: str, new_state: str) -> None:
+        """Log circuit breaker transitions."""
+        if new_state == "open":
+            logger.warning(
+                f"Ollama is failing; pausing requests for "
+                f"{self.breaker.open_seconds}s (circuit {old_state} -> open)"
+            )
+        else:
+            logger.info(f"Ollama circuit {old_state} -> {new_state}")
 
-        logger.info(f"Initialized Ollama client: {self.endpoint} (model: {self.model})")
+    @contextmanager
+    def request_slot(self) -> Iterator[None]:
+        """
+        Wait until the adaptive concurrency limit admits another request.
+
+        The request's latency, or its timeout, adjusts the limit.
+        """
+        if self.limiter is None:
+            yield
+            return
+
+        with self.limiter.slot():
+            yield
+
+    @contextmanager
+    def select_endpoint(self) -> Iterator[str]:
+        """
+        Choose the endpoint for one request.
+
+        With several endpoints, the least busy healthy one is used and the
+        request's latency or failure is recorded against it.
+
+        Yields:
+            Endpoint URL to send the request to
+        """
+        if self.balancer is None:
+            yield self.endpoint
+            return
+
+        with self.balancer.request() as backend:
+            yield backend.endpoint
 
     def encode_image(self, image_path: Path) -> str:
         """
         Encode image file to base64 string.
 
+        When preprocessing is enabled the image is downscaled to the
+        configured max edge and re-encoded as JPEG first.
+
         Args:
             image_path: Path to image file
 
         Returns:
             Base64 encoded image string
 
+        Raises:
+            ImageCorrupted: If image file cannot be read
+        """
+        with self.open_image(image_path) as source:
+            encoded_string = b"".join(source.iter_base64()).decode("utf-8")
+            logger.debug(f"Encoded image: {image_path} ({len(encoded_string)} chars)")
+            return encoded_string
+
+    def open_image(self, image_path: Path) -> ImageSource:
+        """
+        Open image for streaming upload.
+
+        Images that need preprocessing are downscaled now; others are
+        memory-mapped and encoded chunk by chunk as the request is sent.
+
+        Args:
+            image_path: Path to image file
+
+        Returns:
+            Image source to stream into a request body; close it when done
+
         Raises:
             ImageCorrupted: If image file cannot be read
         """
         try:
-            with Path(image_path).open("rb") as image_file:
-                image_data = image_file.read()
-                encoded_string = base64.b64encode(image_data).decode("utf-8")
-                logger.debug(
-                    f"Encoded image: {image_path} ({len(encoded_string)} chars)"
-                )
-                return encoded_string
+            return ImageSource(
+                image_path, self.preprocess, self.max_edge, self.jpeg_quality
+            )
         except Exception as e:
             raise ImageCorrupted(f"Failed to encode image {image_path}: {e}") from e
 
-    def generate_description(self, image_path: Path, prompt: str | None = None) -> str:
+    def build_body(
+        self,
+        source: ImageSource,
+        prompt: str | None = None,
+        response_format: dict | None = None,
+    ) -> JsonBody:
+        """
+        Build a streaming request body for an opened image.
+
+        Args:
+            source: Image opened with open_image
+            prompt: Custom prompt for description (optional)
+            response_format: JSON schema the response must follow (optional)
+
+        Returns:
+            Request body streaming the base64 image into the payload
+        """
+        return JsonBody(
+            self.build_payload(IMAGE_PLACEHOLDER, prompt, response_format), source
+        )
+
+    def build_payload(
+        self,
+        encoded_image: str,
+        prompt: str | None = None,
+        response_format: dict | None = None,
+    ) -> dict:
+        """
+        Build chat API request payload for an encoded image.
+
+        Args:
+            encoded_image: Base64 encoded image
+            prompt: Custom prompt for description (optional)
+            response_format: JSON schema the response must follow (optional)
+
+        Returns:
+            Request payload dictionary
+        """
+        payload = {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt or self.prompt,
+                    "images": [encoded_image],
+                }
+            ],
+            "stream": False,
+        }
+        if response_format is not None:
+            payload["format"] = response_format
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        return payload
+
+    def prompt_hash(self, prompt: str | None = None) -> str:
+        """
+        Identify the prompt a description was generated with.
+
+        Args:
+            prompt: Custom prompt (optional; default is the configured prompt)
+
+        Returns:
+            Short hex digest of the prompt text
+        """
+        return hashlib.sha256((prompt or self.prompt).encode("utf-8")).hexdigest()[:16]
+
+    def parse_usage(self, response: Any) -> dict[str, int | None]:
+        """
+        Extract token counts from a successful chat API response.
+
+        Args:
+            response: HTTP response already accepted by parse_response
+
+        Returns:
+            Dictionary with prompt_tokens and response_tokens, None if the
+            server did not report them
+        """
+        response_data = response.json()
+        return {
+            "prompt_tokens": response_data.get("prompt_eval_count"),
+            "response_tokens": response_data.get("eval_count"),
+        }
+
+    def parse_response(self, response: Any) -> str:
+        """
+        Validate an HTTP response and extract the description.
+
+        Works with both requests and httpx response objects.
+
+        Args:
+            response: HTTP response from the chat API
+
+        Returns:
+            Description text
+
+        Raises:
+            OllamaNotFoundError: If the API or model is not found
+            OllamaConnectionError: If Ollama is unreachable or failing
+            OllamaResponseError: If response is invalid
+        """
+        # Handle HTTP errors
+        if response.status_code == 404:
+            raise OllamaNotFoundError(
+                f"Ollama API or model not found at {self.endpoint}: {response.text}. "
+                "Ensure Ollama is running and the model is pulled."
+            )
+        if response.status_code >= 500:
+            raise OllamaConnectionError(
+                f"Ollama server error (HTTP {response.status_code}): {response.text}"
+            )
+        if response.status_code != 200:
+            raise OllamaResponseError(
+                f"Unexpected HTTP status {response.status_code}: {response.text}"
+            )
+
+        # Parse response
+        try:
+            response_data = response.json()
+        except json.JSONDecodeError as e:
+            raise OllamaResponseError(f"Invalid JSON response: {e}") from e
+
+        # Extract description from chat API response
+        if "message" not in response_data:
+            raise OllamaResponseError(
+                f"Missing 'message' field in Ollama response: {response_data}"
+            )
+
+        if "content" not in response_data["message"]:
+            raise OllamaResponseError(
+                f"Missing 'content' field in message: {response_data}"
+            )
+
+        description = response_data["message"]["content"].strip()
+        if not description:
+            raise OllamaResponseError("Empty description received from Ollama")
+
+        return description
+
+    def structured_request(self, filename: bool = False) -> tuple[dict, str]:
+        """
+        Get the schema and prompt of a structured description request.
+
+        Args:
+            filename: Whether to also ask for a filename, as in combined mode
+
+        Returns:
+            Tuple of JSON schema and prompt
+        """
+        if not filename:
+            return DESCRIPTION_SCHEMA, self.structured_prompt
+
+        schema = {
+            **DESCRIPTION_SCHEMA,
+            "properties": {
+                **DESCRIPTION_SCHEMA["properties"],
+                "filename": COMBINED_SCHEMA["properties"]["filename"],
+            },
+            "required": [*DESCRIPTION_SCHEMA["required"], "filename"],
+        }
+        prompt = f"{self.structured_prompt} Also suggest a filename of 4-5 words."
+        return schema, prompt
+
+    def parse_structured(self, content: str, schema: dict) -> dict[str, Any]:
+        """
+        Decode and validate a response generated with a JSON schema format.
+
+        Args:
+            content: Message content returned by the model
+            schema: JSON schema the request was constrained to
+
+        Returns:
+            Decoded response object
+
+        Raises:
+            SchemaError: If the content does not match the schema
+        """
+        return parse(content, schema)
+
+    def _log_schema_failure(
+        self, image_path: Path, attempt: int, error: Exception
+    ) -> None:
+        """Log a response that failed validation."""
+        if attempt < self.schema_attempts - 1:
+            logger.warning(
+                f"Invalid structured response for {image_path.name}: {error}. "
+                "Asking again..."
+            )
+
+    def generate_structured(
+        self,
+        image_path: Path,
+        schema: dict | None = None,
+        prompt: str | None = None,
+        usage: dict[str, int | None] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Generate a structured response for an image.
+
+        Decoding is constrained to the schema; a response that still fails
+        validation is asked for again, up to structured.max_attempts times.
+        Transient failures are retried by each request as usual.
+
+        Args:
+            image_path: Path to image file
+            schema: JSON schema of the response (default: DESCRIPTION_SCHEMA)
+            prompt: Prompt asking for the schema's fields (default from
+                structured.prompt)
+            usage: Dictionary to fill with token counts (optional)
+
+        Returns:
+            Decoded response object
+
+        Raises:
+            OllamaConnectionError: If connection to Ollama fails
+            OllamaTimeoutError: If request times out
+            OllamaResponseError: If no response matched the schema
+            ImageCorrupted: If image cannot be processed
+        """
+        schema = schema or DESCRIPTION_SCHEMA
+        for attempt in range(self.schema_attempts):
+            content = self.generate_description(
+                image_path, prompt or self.structured_prompt, usage, schema
+            )
+            try:
+                return self.parse_structured(content, schema)
+            except SchemaError as e:
+                self._log_schema_failure(image_path, attempt, e)
+                error = e
+
+        raise OllamaResponseError(
+            f"No valid structured response after {self.schema_attempts} "
+            f"attempts: {error}"
+        ) from error
+
+    def generate_description_and_filename(
+        self,
+        image_path: Path,
+        usage: dict[str, int | None] | None = None,
+    ) -> tuple[str, str]:
+        """
+        Generate a description and a filename for an image in one request.
+
+        Args:
+            image_path: Path to image file
+            usage: Dictionary to fill with token counts (optional)
+
+        Returns:
+            Tuple of description and suggested filename
+
+        Raises:
+            OllamaConnectionError: If connection to Ollama fails
+            OllamaTimeoutError: If request times out
+            OllamaResponseError: If response is invalid
+            ImageCorrupted: If image cannot be processed
+        """
+        fields = self.generate_structured(
+            image_path, COMBINED_SCHEMA, self.combined_prompt, usage
+        )
+        return fields["description"], fields["filename"]
+
+    def generate_description(
+        self,
+        image_path: Path,
+        prompt: str | None = None,
+        usage: dict[str, int | None] | None = None,
+        response_format: dict | None = None,
+    ) -> str:
         """
         Generate description for image using Ollama.
 
         Args:
             image_path: Path to image file
             prompt: Custom prompt for description (optional)
+            usage: Dictionary to fill with token counts (optional)
+            response_format: JSON schema the response must follow (optional)
 
         Returns:
             Generated description text
@@ -91,76 +601,55 @@ class OllamaClient:
         """
         start_time = time.time()
 
-        try:
-            # Encode image
-            encoded_image = self.encode_image(image_path)
-
-            # Prepare request payload for chat API
-            payload = {
-                "model": self.model,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": prompt or "Describe this image in detail.",
-                        "images": [encoded_image],
-                    }
-                ],
-                "stream": False,
-            }
-
-            logger.info(f"Generating description for: {image_path.name}")
-
-            # Make request to Ollama
-            response = requests.post(
-                self.endpoint,
-                json=payload,
-                timeout=self.timeout,
-                headers={"Content-Type": "application/json"},
-            )
-
-            # Handle HTTP errors
-            if response.status_code == 404:
-                raise OllamaConnectionError(
-                    f"Ollama API not found at {self.endpoint}. "
-                    "Ensure Ollama is running and accessible."
-                )
-            if response.status_code >= 500:
-                raise OllamaConnectionError(
-                    f"Ollama server error (HTTP {response.status_code}): {response.text}"
-                )
-            if response.status_code != 200:
-                raise OllamaResponseError(
-                    f"Unexpected HTTP status {response.status_code}: {response.text}"
-                )
+        with self.open_image(image_path) as source:
+            # Serialize the payload once; every attempt streams the same body
+            body = self.build_body(source, prompt, response_format)
 
-            # Parse response
-            try:
-                response_data = response.json()
-            except json.JSONDecodeError as e:
-                raise OllamaResponseError(f"Invalid JSON response: {e}") from e
-
-            # Extract description from chat API response
-            if "message" not in response_data:
-                raise OllamaResponseError(
-                    f"Missing 'message' field in Ollama response: {response_data}"
+            def attempt(index: int) -> tuple[str, Any]:
+                logger.info(
+                    f"Generating description for: {image_path.name} "
+                    f"(attempt {index + 1})"
                 )
+                return self._post_body(body)
 
-            if "content" not in response_data["message"]:
-                raise OllamaResponseError(
-                    f"Missing 'content' field in message: {response_data}"
-                )
+            description, response = self.retry_policy.call(
+                attempt, self.is_transient, self.breaker, self._log_retry
+            )
+        if usage is not None:
+            usage.update(self.parse_usage(response))
 
-            description = response_data["message"]["content"].strip()
-            if not description:
-                raise OllamaResponseError("Empty description received from Ollama")
+        elapsed_time = time.time() - start_time
+        logger.info(
+            f"Generated description for {image_path.name} "
+            f"({len(description)} chars, {elapsed_time:.1f}s)"
+        )
 
-            elapsed_time = time.time() - start_time
-            logger.info(
-                f"Generated description for {image_path.name} "
-                f"({len(description)} chars, {elapsed_time:.1f}s)"
-            )
+        return description
+
+    def _post_body(self, body: JsonBody) -> tuple[str, Any]:
+        """
+        Send one chat request.
 
-            return description
+        Args:
+            body: Request body built with build_body
+
+        Returns:
+            Description text and the HTTP response it came from
+
+        Raises:
+            OllamaConnectionError: If connection to Ollama fails
+            OllamaTimeoutError: If request times out
+            OllamaResponseError: If response is invalid
+        """
+        try:
+            with self.request_slot(), self.select_endpoint() as url:
+                response = self.session.post(
+                    url,
+                    data=body,
+                    headers=body.headers,
+                    timeout=self.timeout,
+                )
+                return self.parse_response(response), response
 
         except Timeout as e:
             raise OllamaTimeoutError(
@@ -173,31 +662,95 @@ class OllamaClient:
         except RequestException as e:
             raise OllamaConnectionError(f"Request to Ollama failed: {e}") from e
 
+    def warm_up(self) -> dict[str, float | None]:
+        """
+        Load the model on every endpoint before a batch.
+
+        A chat request without messages makes Ollama load the model and
+        keep it for keep_alive, so the first images of a batch do not pay
+        the cold start. The load times are recorded in warmup_latency
+        rather than in the request statistics. Endpoints already warmed up
+        by this client are skipped; nothing is sent if warm-up is disabled.
+
+        Returns:
+            Seconds each endpoint took to load the model, None if it failed
+        """
+        if not self.warm_up_enabled:
+            return {}
+
+        payload: dict[str, Any] = {"model": self.model, "messages": []}
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+
+        for endpoint in self.endpoints:
+            if self.warmup_latency.get(endpoint) is not None:
+                continue
+
+            logger.info(f"Loading model {self.model} at {endpoint}")
+            start_time = time.monotonic()
+            try:
+                response = self.session.post(
+                    endpoint, json=payload, timeout=self.warm_up_timeout
+                )
+                response.raise_for_status()
+            except RequestException as e:
+                # The batch still runs; the first request pays the load instead
+                logger.warning(f"Model warm-up failed at {endpoint}: {e}")
+                self.warmup_latency[endpoint] = None
+                continue
+
+            self.warmup_latency[endpoint] = time.monotonic() - start_time
+            logger.info(
+                f"Model {self.model} ready at {endpoint} "
+                f"({self.warmup_latency[endpoint]:.1f}s)"
+            )
+
+        return dict(self.warmup_latency)
+
     def test_connection(self) -> bool:
         """
         Test connection to Ollama API.
 
+        With several endpoints, each is probed and unreachable ones are
+        taken out of rotation.
+
+        Returns:
+            True if connection successful (to at least one endpoint),
+            False otherwise
+        """
+        if self.balancer is not None:
+            return self.balancer.check_health() > 0
+        return self.probe_endpoint(self.endpoint)
+
+    def probe_endpoint(self, endpoint: str) -> bool:
+        """
+        Check that an Ollama endpoint answers its tags API.
+
+        Args:
+            endpoint: Ollama API endpoint URL
+
         Returns:
-            True if connection successful, False otherwise
+            True if the endpoint is reachable, False otherwise
         """
         try:
             # Try to get model info using the tags endpoint
-            base_url = self.endpoint.replace("/api/chat", "")
-            response = requests.get(
+            base_url = endpoint.replace("/api/chat", "")
+            response = self.session.get(
                 f"{base_url}/api/tags",
                 timeout=5,
             )
 
             if response.status_code == 200:
-                logger.info("Ollama connection test successful")
+                logger.info(f"Ollama connection test successful: {endpoint}")
                 return True
             logger.warning(
-                f"Ollama connection test failed: HTTP {response.status_code}"
+                f"Ollama connection test failed for {endpoint}: "
+                f"HTTP {response.status_code}"
             )
             return False
 
         except Exception as e:
-            logger.warning(f"Ollama connection test failed: {e}")
+            logger.warning(f"Ollama connection test failed for {endpoint}: {e}")
             return False
 
     def list_models(self) -> dict[str, Any]:
@@ -212,7 +765,7 @@ class OllamaClient:
         """
         try:
             base_url = self.endpoint.replace("/api/chat", "")
-            response = requests.get(f"{base_url}/api/tags", timeout=10)
+            response = self.session.get(f"{base_url}/api/tags", timeout=10)
             response.raise_for_status()
             return response.json()
 
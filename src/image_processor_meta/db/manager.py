@@ -2,45 +2,225 @@
 Database management for image descriptions.
 """
 
+import os
 import sqlite3
-from collections.abc import Generator
+import threading
+from collections.abc import Callable, Generator, Iterable, Iterator
 from contextlib import contextmanager
 from pathlib import Path
+from typing import Any
 
-from ..exceptions import DatabaseConnectionError, DatabaseOperationError
+from ..exceptions import (
+    ConfigurationError,
+    DatabaseConnectionError,
+    DatabaseOperationError,
+)
 from ..tools.config_manager import config
 from ..tools.log_manager import get_logger
 
 logger = get_logger(__name__)
 
+# Accepted values for the journal_mode and synchronous pragmas
+JOURNAL_MODES = ("delete", "truncate", "persist", "memory", "wal", "off")
+SYNCHRONOUS_LEVELS = ("off", "normal", "full", "extra")
+
+# Optional details recorded with each description
+DETAIL_COLUMNS = (
+    "model",
+    "prompt_hash",
+    "inference_ms",
+    "prompt_tokens",
+    "response_tokens",
+    "image_width",
+    "image_height",
+    "tagged_hash",
+)
+
+# Upsert used by single and bulk saves. Rows are updated in place, since
+# REPLACE would delete them without firing the triggers that maintain the
+# search index and statistics. Details are kept when a save does not supply
+# them, such as the hash of the file recorded after its XMP write.
+_UPSERT_DESCRIPTION = """
+    INSERT INTO images (file_path, description, content_hash, {columns})
+    VALUES (?, ?, ?, {placeholders})
+    ON CONFLICT(file_path) DO UPDATE SET
+        description = excluded.description,
+        content_hash = excluded.content_hash,
+        {updates},
+        updated_at = CURRENT_TIMESTAMP
+""".format(
+    columns=", ".join(DETAIL_COLUMNS),
+    placeholders=", ".join("?" for _ in DETAIL_COLUMNS),
+    updates=", ".join(
+        f"{column} = coalesce(excluded.{column}, images.{column})"
+        for column in DETAIL_COLUMNS
+    ),
+)
+
+
+def _description_row(
+    file_path: str,
+    description: str,
+    content_hash: str | None = None,
+    details: dict[str, Any] | None = None,
+) -> tuple:
+    """
+    Build the parameters of _UPSERT_DESCRIPTION.
+
+    Raises:
+        ValueError: If details has keys other than DETAIL_COLUMNS
+    """
+    details = details or {}
+    unknown = details.keys() - set(DETAIL_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown description details: {', '.join(sorted(unknown))}")
+    return (
+        file_path,
+        description,
+        content_hash,
+        *(details.get(column) for column in DETAIL_COLUMNS),
+    )
+
+
+# Grouping keys of the image_stats table as SQL over an images row, named
+# {row}. The extension is the text after the last "." of the file name.
+_STATS_DIMENSIONS = {
+    "total": "''",
+    "extension": """(
+        SELECT CASE WHEN instr(ext, '/') OR ext = '' THEN '' ELSE '.' || ext END
+        FROM (SELECT lower(replace(
+            {row}.file_path,
+            rtrim({row}.file_path, replace({row}.file_path, '.', '')),
+            ''
+        )) AS ext)
+    )""",
+    "model": "coalesce({row}.model, '')",
+    "day": "coalesce(date({row}.created_at), '')",
+}
+
 
 class DatabaseManager:
     """Manages SQLite database operations for image descriptions."""
 
-    def __init__(self, db_path: str | None = None) -> None:
+    def __init__(
+        self, db_path: str | None = None, persistent: bool | None = None
+    ) -> None:
         """
         Initialize database manager.
 
         Args:
             db_path: Path to SQLite database file
+            persistent: Whether to keep one connection open for the lifetime
+                of the manager instead of connecting per call (default from
+                config)
+
+        Raises:
+            ConfigurationError: If journal mode or synchronous level is invalid
         """
         self.db_path = Path(
             db_path or config.get("database.path", "image_descriptions.db")
         )
+        self.persistent = (
+            config.get("database.persistent", True)
+            if persistent is None
+            else persistent
+        )
+        self.journal_mode = str(config.get("database.journal_mode", "wal")).lower()
+        self.synchronous = str(config.get("database.synchronous", "normal")).lower()
+        self.busy_timeout = config.get("database.busy_timeout", 5.0)
+
+        if self.journal_mode not in JOURNAL_MODES:
+            raise ConfigurationError(
+                f"Invalid database.journal_mode: {self.journal_mode}. "
+                f"Expected one of: {', '.join(JOURNAL_MODES)}"
+            )
+        if self.synchronous not in SYNCHRONOUS_LEVELS:
+            raise ConfigurationError(
+                f"Invalid database.synchronous: {self.synchronous}. "
+                f"Expected one of: {', '.join(SYNCHRONOUS_LEVELS)}"
+            )
+
+        # Shared connection in persistent mode; the lock serializes its use
+        # across pipeline and asyncio worker threads
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.RLock()
+
+        # Set once tables are created; False if SQLite lacks FTS5
+        self.search_enabled = False
+
         self._ensure_database_exists()
 
     def _ensure_database_exists(self) -> None:
-        """Ensure database file and tables exist."""
+        """Ensure database file exists and its schema is up to date."""
         try:
             with self.connection() as conn:
-                self._create_tables(conn)
+                self._migrate(conn)
+                self.search_enabled = self._create_search_index(conn)
                 logger.info(f"Database initialized at: {self.db_path}")
         except Exception as e:
             raise DatabaseConnectionError(f"Failed to initialize database: {e}") from e
 
-    def _create_tables(self, conn: sqlite3.Connection) -> None:
+    def _migrations(self) -> list[Callable[[sqlite3.Connection], None]]:
+        """
+        Schema migrations in order.
+
+        Applying the first N migrations brings the schema to version N, which
+        is stored in PRAGMA user_version. Append new migrations; never edit
+        or reorder released ones.
+
+        Returns:
+            Migration functions taking a connection
+        """
+        return [
+            self._migrate_initial_schema,
+            self._migrate_inference_details,
+            self._migrate_tagged_hash,
+        ]
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        """
+        Apply pending schema migrations in a single transaction.
+
+        Args:
+            conn: Database connection
+
+        Raises:
+            DatabaseConnectionError: If the database was created by a newer
+                release with a schema this one does not know
+        """
+        migrations = self._migrations()
+
+        def read_version() -> int:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version > len(migrations):
+                raise DatabaseConnectionError(
+                    f"Database schema version {version} is newer than the "
+                    f"latest supported version {len(migrations)}"
+                )
+            return version
+
+        if read_version() == len(migrations):
+            return
+
+        # Take the write lock first, so concurrent processes migrate once
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            version = read_version()
+            for number, migration in enumerate(migrations[version:], start=version + 1):
+                migration(conn)
+                conn.execute(f"PRAGMA user_version = {number}")
+                logger.info(f"Migrated database schema to version {number}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+    def _migrate_initial_schema(self, conn: sqlite3.Connection) -> None:
         """
-        Create necessary database tables.
+        Version 1: images, scan manifest and statistics tables.
+
+        Databases created before schema versioning may already have some of
+        these, so every step is idempotent.
 
         Args:
             conn: Database connection
@@ -53,49 +233,333 @@ class DatabaseManager:
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 file_path TEXT UNIQUE NOT NULL,
                 description TEXT NOT NULL,
+                content_hash TEXT,
+                model TEXT,
+                inference_ms REAL,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
 
+        # Unversioned databases may predate content hashing or statistics
+        self._ensure_column(conn, "images", "content_hash", "TEXT")
+        self._ensure_column(conn, "images", "model", "TEXT")
+        self._ensure_column(conn, "images", "inference_ms", "REAL")
+
         # Create index on file_path for faster lookups
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_file_path ON images(file_path)
         """)
 
+        # Create index on content_hash for lookups of moved or copied images
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_content_hash ON images(content_hash)
+        """)
+
+        # Create index on updated_at so recent entries need no full sort
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_updated_at ON images(updated_at)
+        """)
+
+        self._create_stats_table(conn)
+
+        # Create scan manifest used by incremental rescans
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS scan_manifest (
+                file_path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                scanned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+    def _migrate_inference_details(self, conn: sqlite3.Connection) -> None:
+        """
+        Version 2: prompt, token and image size details per description.
+
+        Args:
+            conn: Database connection
+        """
+        for column, definition in (
+            ("prompt_hash", "TEXT"),
+            ("prompt_tokens", "INTEGER"),
+            ("response_tokens", "INTEGER"),
+            ("image_width", "INTEGER"),
+            ("image_height", "INTEGER"),
+        ):
+            conn.execute(f"ALTER TABLE images ADD COLUMN {column} {definition}")
+
+        # Find rows produced by an older model or prompt, and the slowest images
+        conn.execute("CREATE INDEX idx_model_prompt ON images(model, prompt_hash)")
+        conn.execute("CREATE INDEX idx_inference_ms ON images(inference_ms)")
+
+    def _migrate_tagged_hash(self, conn: sqlite3.Connection) -> None:
+        """
+        Version 3: hash of each image after its XMP write.
+
+        content_hash keeps the hash of the file as it was described, so
+        untouched copies of the original still match; tagged_hash matches
+        copies of the tagged output.
+
+        Args:
+            conn: Database connection
+        """
+        conn.execute("ALTER TABLE images ADD COLUMN tagged_hash TEXT")
+        conn.execute("CREATE INDEX idx_tagged_hash ON images(tagged_hash)")
+
+    def _create_search_index(self, conn: sqlite3.Connection) -> bool:
+        """
+        Create the full-text index over descriptions and its sync triggers.
+
+        The FTS5 table stores only the index and reads descriptions from the
+        images table. Triggers keep it in sync, and it is rebuilt from
+        existing rows when first created. Not part of the versioned schema,
+        since it depends on how SQLite was built; it is created on first
+        open with an FTS5-enabled SQLite.
+
+        Args:
+            conn: Database connection
+
+        Returns:
+            True if the index is available, False if SQLite lacks FTS5
+        """
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'images_fts'"
+        ).fetchone()
+
+        try:
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS images_fts USING fts5(
+                    description, content='images', content_rowid='id'
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Full-text search unavailable: {e}")
+            return False
+
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS images_fts_insert AFTER INSERT ON images
+            BEGIN
+                INSERT INTO images_fts (rowid, description)
+                VALUES (new.id, new.description);
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS images_fts_delete AFTER DELETE ON images
+            BEGIN
+                INSERT INTO images_fts (images_fts, rowid, description)
+                VALUES ('delete', old.id, old.description);
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS images_fts_update
+            AFTER UPDATE OF description ON images
+            BEGIN
+                INSERT INTO images_fts (images_fts, rowid, description)
+                VALUES ('delete', old.id, old.description);
+                INSERT INTO images_fts (rowid, description)
+                VALUES (new.id, new.description);
+            END
+        """)
+
+        if not exists:
+            conn.execute("INSERT INTO images_fts (images_fts) VALUES ('rebuild')")
+            logger.info("Built full-text search index")
+
         conn.commit()
+        return True
+
+    def _create_stats_table(self, conn: sqlite3.Connection) -> None:
+        """
+        Create the aggregate statistics table and the triggers maintaining it.
+
+        image_stats holds one row per (dimension, key): the overall total,
+        each file extension, model and creation day. Triggers on images add
+        and subtract rows as descriptions change, so statistics never need
+        a table scan. Built from existing rows when first created.
+
+        Args:
+            conn: Database connection
+        """
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'image_stats'"
+        ).fetchone()
+
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS image_stats (
+                dimension TEXT NOT NULL,
+                key TEXT NOT NULL,
+                images INTEGER NOT NULL DEFAULT 0,
+                description_bytes INTEGER NOT NULL DEFAULT 0,
+                inferences INTEGER NOT NULL DEFAULT 0,
+                inference_ms REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (dimension, key)
+            )
+        """)
+
+        def apply(row: str, sign: str) -> str:
+            # Add (sign "+") or subtract (sign "-") one images row everywhere
+            return "".join(
+                f"""
+                INSERT INTO image_stats
+                    (dimension, key, images, description_bytes, inferences,
+                    inference_ms)
+                VALUES (
+                    '{dimension}', {key.format(row=row)}, {sign}1,
+                    {sign}length(CAST({row}.description AS BLOB)),
+                    {sign}({row}.inference_ms IS NOT NULL),
+                    {sign}coalesce({row}.inference_ms, 0)
+                )
+                ON CONFLICT (dimension, key) DO UPDATE SET
+                    images = images + excluded.images,
+                    description_bytes = description_bytes + excluded.description_bytes,
+                    inferences = inferences + excluded.inferences,
+                    inference_ms = inference_ms + excluded.inference_ms;
+                """
+                for dimension, key in _STATS_DIMENSIONS.items()
+            )
+
+        prune = "DELETE FROM image_stats WHERE images <= 0;"
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS image_stats_insert AFTER INSERT ON images
+            BEGIN {apply("new", "+")} END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS image_stats_delete AFTER DELETE ON images
+            BEGIN {apply("old", "-")} {prune} END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS image_stats_update
+            AFTER UPDATE OF file_path, description, model, inference_ms ON images
+            BEGIN {apply("old", "-")} {apply("new", "+")} {prune} END
+        """)
+
+        if not exists:
+            self._rebuild_stats(conn)
+
+    def _rebuild_stats(self, conn: sqlite3.Connection) -> None:
+        """
+        Recompute the statistics table from the images table.
+
+        Args:
+            conn: Database connection
+        """
+        conn.execute("DELETE FROM image_stats")
+        for dimension, key in _STATS_DIMENSIONS.items():
+            conn.execute(f"""
+                INSERT INTO image_stats
+                    (dimension, key, images, description_bytes, inferences,
+                    inference_ms)
+                SELECT '{dimension}', {key.format(row="images")}, count(*),
+                    sum(length(CAST(description AS BLOB))),
+                    count(inference_ms), coalesce(sum(inference_ms), 0)
+                FROM images
+                GROUP BY 2
+            """)
+        logger.info("Built statistics table")
+
+    def _ensure_column(
+        self, conn: sqlite3.Connection, table: str, column: str, definition: str
+    ) -> None:
+        """
+        Add a column to an existing table if it is missing.
+
+        Args:
+            conn: Database connection
+            table: Table name
+            column: Column name
+            definition: Column type and constraints
+        """
+        columns = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if column not in columns:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+            logger.info(f"Added column {table}.{column}")
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open a connection with the configured pragmas.
+
+        Returns:
+            Database connection
+        """
+        conn = sqlite3.connect(
+            self.db_path, timeout=self.busy_timeout, check_same_thread=False
+        )
+        conn.row_factory = sqlite3.Row  # Enable dict-like access to rows
+        conn.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+        conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+        return conn
 
     @contextmanager
     def connection(self) -> Generator[sqlite3.Connection]:
         """
         Context manager for database connections.
 
+        In persistent mode the shared connection is yielded while holding the
+        manager's lock; otherwise a new connection is opened and closed.
+
         Yields:
             Database connection
 
         Raises:
             DatabaseConnectionError: If connection fails
         """
-        conn = None
-        try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row  # Enable dict-like access to rows
-            yield conn
-        except sqlite3.Error as e:
-            if conn:
-                conn.rollback()
-            raise DatabaseConnectionError(f"Database connection failed: {e}") from e
-        finally:
-            if conn:
-                conn.close()
+        with self._lock:
+            conn = None
+            try:
+                if not self.persistent:
+                    conn = self._connect()
+                elif self._conn is None:
+                    conn = self._conn = self._connect()
+                else:
+                    conn = self._conn
+                yield conn
+            except sqlite3.Error as e:
+                if conn:
+                    conn.rollback()
+                raise DatabaseConnectionError(f"Database connection failed: {e}") from e
+            except BaseException:
+                # Never leave a half-finished transaction on a shared connection
+                if conn and conn.in_transaction:
+                    conn.rollback()
+                raise
+            finally:
+                if conn and not self.persistent:
+                    conn.close()
+
+    def close(self) -> None:
+        """Close the persistent connection, if open."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+                logger.debug("Closed database connection")
+
+    def __enter__(self) -> "DatabaseManager":
+        """Return manager for use as a context manager."""
+        return self
 
-    def save_description(self, file_path: str, description: str) -> bool:
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the persistent connection on context exit."""
+        self.close()
+
+    def save_description(
+        self,
+        file_path: str,
+        description: str,
+        content_hash: str | None = None,
+        details: dict[str, Any] | None = None,
+    ) -> bool:
         """
         Save or update image description in database.
 
         Args:
             file_path: Path to image file
             description: Generated description
+            content_hash: Hash of the image file contents (optional)
+            details: Values for any of DETAIL_COLUMNS, such as the model,
+                prompt hash, latency, token counts and image size (optional)
 
         Returns:
             True if operation successful
@@ -107,13 +571,9 @@ class DatabaseManager:
             with self.connection() as conn:
                 cursor = conn.cursor()
 
-                # Use INSERT OR REPLACE to handle both new and existing records
                 cursor.execute(
-                    """
-                    INSERT OR REPLACE INTO images (file_path, description, updated_at)
-                    VALUES (?, ?, CURRENT_TIMESTAMP)
-                """,
-                    (file_path, description),
+                    _UPSERT_DESCRIPTION,
+                    _description_row(file_path, description, content_hash, details),
                 )
 
                 conn.commit()
@@ -123,6 +583,35 @@ class DatabaseManager:
         except sqlite3.Error as e:
             raise DatabaseOperationError(f"Failed to save description: {e}") from e
 
+    def save_descriptions_bulk(self, records: Iterable[tuple]) -> int:
+        """
+        Save or update many image descriptions in a single transaction.
+
+        Args:
+            records: Tuples of (file_path, description, content_hash) with
+                an optional details dictionary appended
+
+        Returns:
+            Number of records written
+
+        Raises:
+            DatabaseOperationError: If save operation fails
+        """
+        records = [_description_row(*record) for record in records]
+        if not records:
+            return 0
+
+        try:
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                cursor.executemany(_UPSERT_DESCRIPTION, records)
+                conn.commit()
+                logger.debug(f"Saved {len(records)} descriptions")
+                return len(records)
+
+        except sqlite3.Error as e:
+            raise DatabaseOperationError(f"Failed to save descriptions: {e}") from e
+
     def get_description(self, file_path: str) -> str | None:
         """
         Get description for image file.
@@ -149,10 +638,265 @@ class DatabaseManager:
         except sqlite3.Error as e:
             raise DatabaseOperationError(f"Failed to get description: {e}") from e
 
+    def get_record(self, file_path: str) -> dict[str, str | None] | None:
+        """
+        Get the stored description of an image and the hashes it was stored with.
+
+        Args:
+            file_path: Path to image file
+
+        Returns:
+            Dictionary with description, content_hash and tagged_hash if
+            found, None otherwise
+
+        Raises:
+            DatabaseOperationError: If query fails
+        """
+        try:
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT description, content_hash, tagged_hash FROM images
+                    WHERE file_path = ?
+                """,
+                    (file_path,),
+                )
+
+                result = cursor.fetchone()
+                return dict(result) if result else None
+
+        except sqlite3.Error as e:
+            raise DatabaseOperationError(f"Failed to get record: {e}") from e
+
+    def get_description_by_hash(self, content_hash: str) -> dict[str, str] | None:
+        """
+        Get a stored description for any image with identical contents.
+
+        Matches the hash of an image as it was described, or after its XMP
+        write.
+
+        Args:
+            content_hash: Hash of the image file contents
+
+        Returns:
+            Dictionary with file_path and description if found, None otherwise
+
+        Raises:
+            DatabaseOperationError: If query fails
+        """
+        try:
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT file_path, description FROM images
+                    WHERE content_hash = ? OR tagged_hash = ?
+                    LIMIT 1
+                """,
+                    (content_hash, content_hash),
+                )
+
+                result = cursor.fetchone()
+                return dict(result) if result else None
+
+        except sqlite3.Error as e:
+            raise DatabaseOperationError(
+                f"Failed to get description by hash: {e}"
+            ) from e
+
+    def update_content_hash(self, file_path: str, content_hash: str) -> bool:
+        """
+        Record the current content hash for an image.
+
+        Args:
+            file_path: Path to image file
+            content_hash: Hash of the image file contents
+
+        Returns:
+            True if a record was updated, False if not found
+
+        Raises:
+            DatabaseOperationError: If update fails
+        """
+        try:
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "UPDATE images SET content_hash = ? WHERE file_path = ?",
+                    (content_hash, file_path),
+                )
+                conn.commit()
+                return cursor.rowcount > 0
+
+        except sqlite3.Error as e:
+            raise DatabaseOperationError(f"Failed to update content hash: {e}") from e
+
+    def update_tagged_hash(self, file_path: str, tagged_hash: str) -> bool:
+        """
+        Record the hash of an image after its XMP write.
+
+        Args:
+            file_path: Path to image file
+            tagged_hash: Hash of the image file contents with XMP embedded
+
+        Returns:
+            True if a record was updated, False if not found
+
+        Raises:
+            DatabaseOperationError: If update fails
+        """
+        try:
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "UPDATE images SET tagged_hash = ? WHERE file_path = ?",
+                    (tagged_hash, file_path),
+                )
+                conn.commit()
+                return cursor.rowcount > 0
+
+        except sqlite3.Error as e:
+            raise DatabaseOperationError(f"Failed to update tagged hash: {e}") from e
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> list[dict]:
+        """
+        Find images whose descriptions match a full-text query.
+
+        The query uses FTS5 syntax (words, "phrases", prefix*, AND, OR,
+        NOT). Input that is not valid syntax is searched as plain words.
+
+        Args:
+            query: Search query
+            limit: Maximum number of results
+            offset: Number of results to skip, for paging
+
+        Returns:
+            List of dictionaries with file_path, description, updated_at and
+            rank, best matches first
+
+        Raises:
+            DatabaseOperationError: If search is unavailable or the query fails
+        """
+        if not self.search_enabled:
+            raise DatabaseOperationError(
+                "Full-text search requires SQLite with FTS5 support"
+            )
+        if not query.strip():
+            return []
+
+        sql = """
+            SELECT images.file_path, images.description, images.updated_at,
+                bm25(images_fts) AS rank
+            FROM images_fts
+            JOIN images ON images.id = images_fts.rowid
+            WHERE images_fts MATCH ?
+            ORDER BY rank
+            LIMIT ? OFFSET ?
+        """
+
+        try:
+            with self.connection() as conn:
+                try:
+                    rows = conn.execute(sql, (query, limit, offset)).fetchall()
+                except sqlite3.OperationalError:
+                    # Quote each word so operators and punctuation such as
+                    # "-" or ":" are matched literally
+                    words = " ".join(
+                        '"' + word.replace('"', '""') + '"' for word in query.split()
+                    )
+                    rows = conn.execute(sql, (words, limit, offset)).fetchall()
+
+                return [dict(row) for row in rows]
+
+        except sqlite3.Error as e:
+            raise DatabaseOperationError(f"Search failed: {e}") from e
+
+    def iter_descriptions(self, batch_size: int = 1000) -> Iterator[dict[str, str]]:
+        """
+        Iterate over all image descriptions in insertion order.
+
+        Rows are fetched in keyset-paginated batches, so memory use stays
+        constant however large the table is, and the connection is released
+        between batches.
+
+        Args:
+            batch_size: Number of rows fetched per query
+
+        Yields:
+            Dictionaries with file_path, description, content_hash,
+            created_at and updated_at
+
+        Raises:
+            DatabaseOperationError: If a query fails
+        """
+        last_id = 0
+        while True:
+            try:
+                with self.connection() as conn:
+                    rows = conn.execute(
+                        """
+                        SELECT id, file_path, description, content_hash,
+                            created_at, updated_at
+                        FROM images
+                        WHERE id > ?
+                        ORDER BY id
+                        LIMIT ?
+                    """,
+                        (last_id, batch_size),
+                    ).fetchall()
+
+            except sqlite3.Error as e:
+                raise DatabaseOperationError(
+                    f"Failed to iterate descriptions: {e}"
+                ) from e
+
+            for row in rows:
+                record = dict(row)
+                last_id = record.pop("id")
+                yield record
+
+            if len(rows) < batch_size:
+                return
+
+    def get_recent_descriptions(self, limit: int = 5) -> list[dict[str, str]]:
+        """
+        Get the most recently updated image descriptions.
+
+        Args:
+            limit: Maximum number of records
+
+        Returns:
+            List of dictionaries containing file paths and descriptions,
+            newest first
+
+        Raises:
+            DatabaseOperationError: If query fails
+        """
+        try:
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT file_path, description, created_at, updated_at
+                    FROM images
+                    ORDER BY updated_at DESC
+                    LIMIT ?
+                """,
+                    (limit,),
+                )
+
+                return [dict(row) for row in cursor.fetchall()]
+
+        except sqlite3.Error as e:
+            raise DatabaseOperationError(f"Failed to get descriptions: {e}") from e
+
     def get_all_descriptions(self) -> list[dict[str, str]]:
         """
         Get all image descriptions from database.
 
+        Loads every row at once; use iter_descriptions for large databases.
+
         Returns:
             List of dictionaries containing file paths and descriptions
 
@@ -201,6 +945,318 @@ class DatabaseManager:
         except sqlite3.Error as e:
             raise DatabaseOperationError(f"Failed to delete description: {e}") from e
 
+    def get_described_paths(self, directory: str) -> set[str]:
+        """
+        Get all paths below a directory that already have a description.
+
+        Records saved before content hashing are left out, so those images
+        are still revisited and their hashes backfilled.
+
+        Args:
+            directory: Directory whose files should be returned
+
+        Returns:
+            Set of described file paths
+
+        Raises:
+            DatabaseOperationError: If query fails
+        """
+        try:
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT file_path FROM images
+                    WHERE file_path >= ? AND file_path < ?
+                        AND content_hash IS NOT NULL
+                """,
+                    self._path_range(directory),
+                )
+
+                return {row["file_path"] for row in cursor}
+
+        except sqlite3.Error as e:
+            raise DatabaseOperationError(f"Failed to get described paths: {e}") from e
+
+    def get_outdated_paths(
+        self,
+        directory: str,
+        model: str | None = None,
+        prompt_hash: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[str]:
+        """
+        Get paths below a directory described by another model or prompt.
+
+        A row is outdated when its stored model differs from model, or its
+        prompt hash differs from prompt_hash. Rows recorded before these
+        details were stored count as outdated. Pass None to ignore either
+        criterion.
+
+        Args:
+            directory: Directory whose files should be returned
+            model: Current model name
+            prompt_hash: Hash of the current prompt
+            limit: Maximum number of paths to return (default all)
+            offset: Number of paths to skip
+
+        Returns:
+            File paths, least recently described first
+
+        Raises:
+            ValueError: If neither model nor prompt_hash is given
+            DatabaseOperationError: If query fails
+        """
+        condition, params = self._outdated_filter(directory, model, prompt_hash)
+        try:
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    f"""
+                    SELECT file_path FROM images
+                    WHERE {condition}
+                    ORDER BY updated_at, id
+                    LIMIT ? OFFSET ?
+                """,
+                    (*params, -1 if limit is None else limit, offset),
+                )
+
+                return [row["file_path"] for row in cursor]
+
+        except sqlite3.Error as e:
+            raise DatabaseOperationError(f"Failed to get outdated paths: {e}") from e
+
+    def count_outdated(
+        self,
+        directory: str,
+        model: str | None = None,
+        prompt_hash: str | None = None,
+    ) -> int:
+        """
+        Count paths get_outdated_paths would return without a limit.
+
+        Raises:
+            ValueError: If neither model nor prompt_hash is given
+            DatabaseOperationError: If query fails
+        """
+        condition, params = self._outdated_filter(directory, model, prompt_hash)
+        try:
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f"SELECT COUNT(*) FROM images WHERE {condition}", params)
+                return cursor.fetchone()[0]
+
+        except sqlite3.Error as e:
+            raise DatabaseOperationError(f"Failed to count outdated paths: {e}") from e
+
+    def _outdated_filter(
+        self, directory: str, model: str | None, prompt_hash: str | None
+    ) -> tuple[str, tuple]:
+        """
+        Build the WHERE clause shared by the outdated path queries.
+
+        Returns:
+            Tuple of (SQL condition, parameters)
+
+        Raises:
+            ValueError: If neither model nor prompt_hash is given
+        """
+        # IS NOT treats a NULL (unrecorded) value as different
+        checks = [
+            (f"{column} IS NOT ?", value)
+            for column, value in (("model", model), ("prompt_hash", prompt_hash))
+            if value is not None
+        ]
+        if not checks:
+            raise ValueError("Either model or prompt_hash is required")
+
+        condition = "file_path >= ? AND file_path < ? AND ({})".format(
+            " OR ".join(check for check, _ in checks)
+        )
+        return condition, (*self._path_range(directory), *(v for _, v in checks))
+
+    def _path_range(self, directory: str) -> tuple[str, str]:
+        """
+        Get bounds matching every file path below a directory.
+
+        Range scans can use the file_path index, unlike LIKE.
+
+        Args:
+            directory: Directory path
+
+        Returns:
+            Tuple of (inclusive lower bound, exclusive upper bound)
+        """
+        prefix = directory.rstrip(os.sep) + os.sep
+        return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+    def get_manifest(self, directory: str) -> dict[str, tuple[int, int, int]]:
+        """
+        Get the scan manifest for all files below a directory.
+
+        Args:
+            directory: Directory whose files should be returned
+
+        Returns:
+            Mapping of file path to (size, mtime_ns, inode)
+
+        Raises:
+            DatabaseOperationError: If query fails
+        """
+        try:
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT file_path, size, mtime_ns, inode FROM scan_manifest
+                    WHERE file_path >= ? AND file_path < ?
+                """,
+                    self._path_range(directory),
+                )
+
+                return {
+                    row["file_path"]: (row["size"], row["mtime_ns"], row["inode"])
+                    for row in cursor.fetchall()
+                }
+
+        except sqlite3.Error as e:
+            raise DatabaseOperationError(f"Failed to get scan manifest: {e}") from e
+
+    def update_manifest(self, entries: Iterable[tuple[str, int, int, int]]) -> int:
+        """
+        Insert or update scan manifest entries in a single transaction.
+
+        Args:
+            entries: Tuples of (file_path, size, mtime_ns, inode)
+
+        Returns:
+            Number of entries written
+
+        Raises:
+            DatabaseOperationError: If update fails
+        """
+        entries = list(entries)
+        if not entries:
+            return 0
+
+        try:
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                cursor.executemany(
+                    """
+                    INSERT INTO scan_manifest (file_path, size, mtime_ns, inode)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(file_path) DO UPDATE SET
+                        size = excluded.size,
+                        mtime_ns = excluded.mtime_ns,
+                        inode = excluded.inode,
+                        scanned_at = CURRENT_TIMESTAMP
+                """,
+                    entries,
+                )
+                conn.commit()
+                logger.debug(f"Updated {len(entries)} scan manifest entries")
+                return len(entries)
+
+        except sqlite3.Error as e:
+            raise DatabaseOperationError(f"Failed to update scan manifest: {e}") from e
+
+    def delete_manifest_entries(self, file_paths: Iterable[str]) -> int:
+        """
+        Remove files from the scan manifest.
+
+        Args:
+            file_paths: Paths of files that no longer exist
+
+        Returns:
+            Number of entries removed
+
+        Raises:
+            DatabaseOperationError: If delete operation fails
+        """
+        file_paths = [(file_path,) for file_path in file_paths]
+        if not file_paths:
+            return 0
+
+        try:
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                cursor.executemany(
+                    "DELETE FROM scan_manifest WHERE file_path = ?", file_paths
+                )
+                conn.commit()
+                return cursor.rowcount
+
+        except sqlite3.Error as e:
+            raise DatabaseOperationError(
+                f"Failed to delete scan manifest entries: {e}"
+            ) from e
+
+    def get_stats(self) -> dict:
+        """
+        Get aggregate statistics from the maintained statistics table.
+
+        Returns:
+            Dictionary with images, description_bytes, inferences and
+            average_inference_ms totals, plus by_extension, by_model and
+            by_day mappings of key to image count
+
+        Raises:
+            DatabaseOperationError: If query fails
+        """
+        try:
+            with self.connection() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT dimension, key, images, description_bytes,
+                        inferences, inference_ms
+                    FROM image_stats
+                    ORDER BY dimension, images DESC, key
+                """
+                ).fetchall()
+
+        except sqlite3.Error as e:
+            raise DatabaseOperationError(f"Failed to get statistics: {e}") from e
+
+        stats = {
+            "images": 0,
+            "description_bytes": 0,
+            "inferences": 0,
+            "average_inference_ms": None,
+            "by_extension": {},
+            "by_model": {},
+            "by_day": {},
+        }
+        for row in rows:
+            if row["dimension"] == "total":
+                stats["images"] = row["images"]
+                stats["description_bytes"] = row["description_bytes"]
+                stats["inferences"] = row["inferences"]
+                if row["inferences"]:
+                    stats["average_inference_ms"] = (
+                        row["inference_ms"] / row["inferences"]
+                    )
+            else:
+                stats[f"by_{row['dimension']}"][row["key"]] = row["images"]
+
+        return stats
+
+    def rebuild_stats(self) -> None:
+        """
+        Recompute aggregate statistics from scratch.
+
+        Raises:
+            DatabaseOperationError: If rebuild fails
+        """
+        try:
+            with self.connection() as conn:
+                self._rebuild_stats(conn)
+                conn.commit()
+
+        except sqlite3.Error as e:
+            raise DatabaseOperationError(f"Failed to rebuild statistics: {e}") from e
+
     def count_records(self) -> int:
         """
         Get total number of records in database.
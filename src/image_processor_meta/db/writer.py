@@ -0,0 +1,147 @@
+"""
+Batched description writes.
+"""
+
+import threading
+import time
+from typing import Any
+
+from ..tools.config_manager import config
+from ..tools.log_manager import get_logger
+from .manager import DatabaseManager
+
+logger = get_logger(__name__)
+
+
+class DescriptionWriter:
+    """
+    Buffer description upserts and write them in batched transactions.
+
+    Pending records are written once batch_size of them have accumulated or
+    the oldest has waited interval_ms, whichever comes first. Records are
+    keyed by file path, so a later write for the same image replaces the
+    pending one. Safe to use from several threads.
+    """
+
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        batch_size: int | None = None,
+        interval_ms: float | None = None,
+    ) -> None:
+        """
+        Initialize description writer.
+
+        Args:
+            db_manager: Database manager to write through
+            batch_size: Records per transaction (default from config)
+            interval_ms: Maximum time a record waits before it is written
+                (default from config)
+        """
+        self.db_manager = db_manager
+        self.batch_size = max(
+            1,
+            int(batch_size or config.get("database.write_batch_size", 100)),
+        )
+        self.interval = (
+            interval_ms
+            if interval_ms is not None
+            else config.get("database.write_interval_ms", 500)
+        ) / 1000
+
+        self._pending: dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+        self._closed = False
+
+    def add(
+        self,
+        file_path: str,
+        description: str,
+        content_hash: str | None = None,
+        details: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Queue a description for saving.
+
+        Args:
+            file_path: Path to image file
+            description: Generated description
+            content_hash: Hash of the image file contents (optional)
+            details: Values for any of DETAIL_COLUMNS (optional)
+
+        Raises:
+            DatabaseOperationError: If a batch triggered by this call fails
+        """
+        with self._lock:
+            self._pending[file_path] = (file_path, description, content_hash, details)
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+            elif self._timer is None and not self._closed:
+                self._timer = threading.Timer(self.interval, self._flush_on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> int:
+        """
+        Write all pending records now.
+
+        Returns:
+            Number of records written
+
+        Raises:
+            DatabaseOperationError: If the write fails
+        """
+        with self._lock:
+            return self._flush_locked()
+
+    def close(self) -> int:
+        """
+        Write pending records and stop the flush timer.
+
+        Returns:
+            Number of records written
+        """
+        with self._lock:
+            self._closed = True
+            return self._flush_locked()
+
+    def _flush_locked(self) -> int:
+        """Write pending records; the caller holds the lock."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._pending:
+            return 0
+
+        records = list(self._pending.values())
+        start = time.perf_counter()
+        # Keep records pending if the write fails so a later flush retries them
+        written = self.db_manager.save_descriptions_bulk(records)
+        self._pending.clear()
+
+        logger.debug(
+            f"Wrote {written} descriptions in "
+            f"{(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+        return written
+
+    def _flush_on_timer(self) -> None:
+        """Flush records whose wait has reached the interval."""
+        with self._lock:
+            if self._timer is not threading.current_thread():
+                return  # Superseded by a flush since this timer started
+            self._timer = None
+            try:
+                self._flush_locked()
+            except Exception as e:
+                logger.error(f"Failed to write description batch: {e}")
+
+    def __enter__(self) -> "DescriptionWriter":
+        """Return writer for use as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Write pending records on context exit."""
+        self.close()
@@ -81,6 +81,12 @@ class OllamaConnectionError(OllamaError):
     pass
 
 
+class OllamaNotFoundError(OllamaConnectionError):
+    """Raised when the Ollama API or model is not found at the endpoint."""
+
+    pass
+
+
 class OllamaTimeoutError(OllamaError):
     """Raised when Ollama request times out."""
 
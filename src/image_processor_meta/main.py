@@ -3,13 +3,23 @@ Main entry point for image meta processor CLI.
 """
 
 import argparse
+import asyncio
+import csv
+import json
+import os
+import socket
 import sys
+from collections.abc import Iterable
 from pathlib import Path
+from typing import TextIO
+
+from image_processor.jobs import JobNotFoundError, JobStore
+from image_processor.workqueue import WorkQueue
 
 from .api.ollama_client import OllamaClient
 from .db.manager import DatabaseManager
 from .exceptions import ImageProcessorError, OllamaConnectionError
-from .processor import ImageProcessor
+from .processor import REDESCRIBE_CRITERIA, ImageProcessor
 from .tools.config_manager import config
 from .tools.log_manager import get_logger, setup_logger
 
@@ -39,7 +49,20 @@ Examples:
   %(prog)s /path/to/images          # Process images in specific directory
   %(prog)s -d /path/to/images       # Process with explicit directory flag
   %(prog)s --no-sanitize           # Skip filename sanitization
+  %(prog)s --incremental           # Only process new or changed images
+  %(prog)s --stream                # Start processing while still scanning
+  %(prog)s --rename                # Describe and rename in one model pass
+  %(prog)s --structured            # Also store a title and tags from JSON output
+  %(prog)s --job                   # Record the run so --resume can continue it
+  %(prog)s --resume 3f2a9c1b7d4e   # Continue an interrupted run
+  %(prog)s --concurrency 4         # Run 4 inference requests in parallel
+  %(prog)s --async                 # Use asyncio inference
+  %(prog)s --redescribe-where model # Redo descriptions from an older model
+  %(prog)s --enqueue /shared/images # Add images to the shared work queue
+  %(prog)s --worker                # Process queued images with local Ollama
   %(prog)s --check-connection      # Check Ollama connection only
+  %(prog)s --search "red car"      # Search stored descriptions
+  %(prog)s --export out.jsonl      # Export descriptions (.jsonl or .csv)
         """,
     )
 
@@ -64,6 +87,96 @@ Examples:
         "--no-progress", action="store_true", help="Disable progress bar"
     )
 
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only process images that are new or changed since the last run",
+    )
+
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Start processing as soon as images are found instead of listing them first",
+    )
+
+    parser.add_argument(
+        "--job",
+        action="store_true",
+        help="Record the run as a job that --resume can continue (default from jobs.enabled)",
+    )
+
+    parser.add_argument(
+        "--resume",
+        metavar="JOB_ID",
+        help="Resume an interrupted run, retrying its unfinished and failed images",
+    )
+
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Process images through the staged concurrent pipeline",
+    )
+
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Use asyncio inference with ollama.max_in_flight concurrent requests",
+    )
+
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        metavar="N",
+        help="Number of parallel inference requests (implies --pipeline)",
+    )
+
+    parser.add_argument(
+        "--rename",
+        action="store_true",
+        help="Also rename images after a model-suggested filename, in the same request as the description",
+    )
+
+    parser.add_argument(
+        "--structured",
+        action="store_true",
+        help="Request JSON with title, description, tags and visible text, and embed the title and tags",
+    )
+
+    parser.add_argument(
+        "--redescribe-where",
+        choices=REDESCRIBE_CRITERIA,
+        help="Regenerate stored descriptions, oldest first, whose model, prompt or either differs from the current config",
+    )
+
+    parser.add_argument(
+        "--enqueue",
+        action="store_true",
+        help="Add the directory's undescribed images to the shared work queue and exit",
+    )
+
+    parser.add_argument(
+        "--worker",
+        action="store_true",
+        help="Process images from the shared work queue until it is drained",
+    )
+
+    parser.add_argument(
+        "--worker-id",
+        metavar="ID",
+        help="Unique id of this worker (default: hostname-pid)",
+    )
+
+    parser.add_argument(
+        "--endpoint",
+        metavar="URL",
+        help="Ollama API endpoint to use instead of ollama.endpoint(s)",
+    )
+
+    parser.add_argument(
+        "--queue-stats", action="store_true", help="Show work queue counts and exit"
+    )
+
     parser.add_argument(
         "--check-connection",
         action="store_true",
@@ -80,6 +193,33 @@ Examples:
         "--db-stats", action="store_true", help="Show database statistics and exit"
     )
 
+    parser.add_argument(
+        "--search",
+        metavar="QUERY",
+        help='Search stored descriptions and exit (FTS5 syntax: words, "phrases", prefix*, OR, NOT)',
+    )
+
+    parser.add_argument(
+        "--limit",
+        type=int,
+        metavar="N",
+        help="Maximum number of search results (default: 20) or images to redescribe (default: processing.redescribe_limit)",
+    )
+
+    parser.add_argument(
+        "--offset",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Number of search results to skip (default: 0)",
+    )
+
+    parser.add_argument(
+        "--export",
+        metavar="FILE",
+        help="Export all descriptions to FILE and exit (CSV for .csv, otherwise JSON Lines; - for stdout)",
+    )
+
     parser.add_argument(
         "--verbose", "-v", action="store_true", help="Enable verbose logging"
     )
@@ -104,10 +244,17 @@ def check_ollama_connection(ollama_client: OllamaClient) -> bool:
     print("Testing Ollama connection...")
 
     if ollama_client.test_connection():
-        print(f"✓ Successfully connected to Ollama at {ollama_client.endpoint}")
+        if ollama_client.balancer is None:
+            print(f"✓ Successfully connected to Ollama at {ollama_client.endpoint}")
+        else:
+            for backend in ollama_client.balancer.stats():
+                mark = (
+                    "✓ Connected to" if backend["healthy"] else "✗ Failed to connect to"
+                )
+                print(f"{mark} Ollama at {backend['endpoint']}")
         print(f"✓ Using model: {ollama_client.model}")
         return True
-    print(f"✗ Failed to connect to Ollama at {ollama_client.endpoint}")
+    print(f"✗ Failed to connect to Ollama at {', '.join(ollama_client.endpoints)}")
     print("\nTroubleshooting:")
     print("1. Ensure Ollama is installed and running")
     print("2. Check that the LLaVA model is available: ollama pull llava")
@@ -115,14 +262,117 @@ def check_ollama_connection(ollama_client: OllamaClient) -> bool:
     return False
 
 
+def show_search_results(
+    db_manager: DatabaseManager, query: str, limit: int, offset: int
+) -> None:
+    """Print descriptions matching a full-text query, best matches first."""
+    results = db_manager.search(query, limit=limit, offset=offset)
+    if not results:
+        print(f"No descriptions match: {query}")
+        return
+
+    for index, record in enumerate(results, start=offset + 1):
+        print(f"{index:4}. {record['file_path']}")
+        print(f"      {record['description']}")
+
+
+EXPORT_FIELDS = ["file_path", "description", "content_hash", "created_at", "updated_at"]
+
+
+def write_records(records: Iterable[dict], handle: TextIO, as_csv: bool) -> int:
+    """
+    Write description records as CSV or JSON Lines, one row at a time.
+
+    Args:
+        records: Records to write
+        handle: Text stream to write to
+        as_csv: Whether to write CSV instead of JSON Lines
+
+    Returns:
+        Number of records written
+    """
+    writer = csv.DictWriter(handle, fieldnames=EXPORT_FIELDS) if as_csv else None
+    if writer:
+        writer.writeheader()
+
+    count = 0
+    for record in records:
+        if writer:
+            writer.writerow(record)
+        else:
+            handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+def export_descriptions(db_manager: DatabaseManager, output: str) -> int:
+    """
+    Stream all descriptions to a file at constant memory.
+
+    Args:
+        db_manager: Database manager instance
+        output: Output file path; CSV if it ends in .csv, JSON Lines
+            otherwise, or - for JSON Lines on stdout
+
+    Returns:
+        Number of records exported
+    """
+    if output == "-":
+        return write_records(db_manager.iter_descriptions(), sys.stdout, as_csv=False)
+
+    with Path(output).open("w", encoding="utf-8", newline="") as handle:
+        return write_records(
+            db_manager.iter_descriptions(),
+            handle,
+            as_csv=output.lower().endswith(".csv"),
+        )
+
+
+def open_work_queue(db_manager: DatabaseManager) -> WorkQueue:
+    """Open the work queue configured by queue.database, or the description database."""
+    return WorkQueue(
+        config.get("queue.database") or db_manager.db_path,
+        lease_seconds=config.get("queue.lease_seconds", 300),
+        max_attempts=config.get("queue.max_attempts", 3),
+        journal_mode=config.get("database.journal_mode", "wal"),
+        busy_timeout=config.get("database.busy_timeout", 5.0),
+    )
+
+
+def show_queue_stats(work_queue: WorkQueue) -> None:
+    """Show the number of queued images in each state."""
+    print("Work Queue:")
+    print(f"  Database path: {work_queue.db_path}")
+    for state, count in work_queue.counts().items():
+        print(f"  {state.capitalize()}: {count}")
+
+
 def show_database_stats(db_manager: DatabaseManager) -> None:
     """Show database statistics."""
+    stats = db_manager.get_stats()
+
     print("Database Statistics:")
     print(f"  Database path: {db_manager.db_path}")
-    print(f"  Total records: {db_manager.count_records()}")
+    print(f"  Total records: {stats['images']}")
+    print(f"  Description text: {stats['description_bytes'] / 1024:.1f} KiB")
+    if stats["average_inference_ms"] is not None:
+        print(
+            f"  Average inference time: {stats['average_inference_ms'] / 1000:.2f}s "
+            f"over {stats['inferences']} descriptions"
+        )
+
+    for title, counts in (
+        ("By extension", stats["by_extension"]),
+        ("By model", stats["by_model"]),
+        ("Last 7 days", dict(sorted(stats["by_day"].items())[-7:])),
+    ):
+        if counts:
+            print(f"  {title}:")
+            for key, count in counts.items():
+                print(f"    {key or '(unknown)'}: {count}")
 
     try:
-        recent_records = db_manager.get_all_descriptions()[:5]
+        recent_records = db_manager.get_recent_descriptions(5)
         if recent_records:
             print("  Most recent entries:")
             for record in recent_records:
@@ -138,6 +388,12 @@ def main() -> int:
     Returns:
         Exit code (0 for success, non-zero for error)
     """
+    ollama_client = None
+    db_manager = None
+    job_store = None
+    job_id = None
+    work_queue = None
+
     try:
         # Set up logging first
         setup_logging()
@@ -152,8 +408,12 @@ def main() -> int:
             logger.setLevel(__import__("logging").DEBUG)
             logger.debug("Verbose logging enabled")
 
-        # Initialize clients
-        ollama_client = OllamaClient()
+        # Initialize clients; size the connection pool for the inference workers
+        concurrency = args.concurrency or config.get("processing.concurrency", 1)
+        ollama_client = OllamaClient(
+            endpoint=args.endpoint,
+            pool_size=max(config.get("ollama.pool_size", 10), concurrency),
+        )
         db_manager = DatabaseManager()
 
         # Handle special commands
@@ -175,6 +435,22 @@ def main() -> int:
             show_database_stats(db_manager)
             return 0
 
+        if args.search is not None:
+            limit = 20 if args.limit is None else args.limit
+            show_search_results(db_manager, args.search, limit, args.offset)
+            return 0
+
+        if args.export:
+            count = export_descriptions(db_manager, args.export)
+            if args.export != "-":
+                print(f"Exported {count} descriptions to {args.export}")
+            return 0
+
+        if args.queue_stats:
+            with open_work_queue(db_manager) as queue:
+                show_queue_stats(queue)
+            return 0
+
         # Determine target directory
         target_dir = (
             args.directory_flag
@@ -183,8 +459,57 @@ def main() -> int:
         )
 
         target_path = Path(target_dir).resolve()
+        options = {
+            "sanitize_names": not args.no_sanitize,
+            "incremental": args.incremental
+            or config.get("processing.incremental", False),
+            "rename": args.rename or config.get("rename.enabled", False),
+            "structured": args.structured or config.get("structured.enabled", False),
+        }
+
+        if args.enqueue:
+            with open_work_queue(db_manager) as queue:
+                results = ImageProcessor(ollama_client, db_manager).enqueue_directory(
+                    target_path,
+                    queue,
+                    sanitize_names=options["sanitize_names"],
+                    incremental=options["incremental"],
+                )
+                print(f"Enqueued {results['enqueued']} images from {target_path}")
+                show_queue_stats(queue)
+            return 0
 
-        logger.info(f"Starting image processing for: {target_path}")
+        # Record directory runs as jobs on request so they can be resumed;
+        # queue workers are resumed by the queue itself
+        if args.resume or (
+            (args.job or config.get("jobs.enabled", False))
+            and not args.redescribe_where
+            and not args.worker
+        ):
+            job_store = JobStore(
+                db_manager.db_path,
+                journal_mode=config.get("database.journal_mode", "wal"),
+                busy_timeout=config.get("database.busy_timeout", 5.0),
+            )
+
+        if args.resume:
+            try:
+                job = job_store.get_job(args.resume)
+            except JobNotFoundError as e:
+                print(f"Error: {e}")
+                return 1
+            if job["kind"] != "meta":
+                print(f"Error: Job {args.resume} is not an image-processor-meta job")
+                return 1
+            job_id = job["id"]
+            target_path = Path(job["directory"])
+            options = job["options"]
+
+        if args.worker:
+            work_queue = open_work_queue(db_manager)
+            logger.info(f"Starting queue worker on: {work_queue.db_path}")
+        else:
+            logger.info(f"Starting image processing for: {target_path}")
 
         # Test Ollama connection before processing
         if not ollama_client.test_connection():
@@ -194,14 +519,62 @@ def main() -> int:
             )
             return 1
 
+        if job_store is not None and job_id is None:
+            job_store.prune(config.get("jobs.keep_completed", 20))
+            job_id = job_store.create_job("meta", str(target_path), options)
+
+        if job_id:
+            print(f"Job: {job_id}")
+
         # Initialize processor and run
         processor = ImageProcessor(ollama_client, db_manager)
+        if args.concurrency:
+            processor.concurrency = args.concurrency
+        processor.rename_files = options.get("rename", False)
+        processor.structured = options.get("structured", False)
 
-        results = processor.process_directory(
-            directory=target_path,
-            sanitize_names=not args.no_sanitize,
-            show_progress=not args.no_progress,
-        )
+        if args.worker:
+            worker = args.worker_id or f"{socket.gethostname()}-{os.getpid()}"
+            print(
+                f"Worker {worker} using Ollama at {', '.join(ollama_client.endpoints)}"
+            )
+            results = processor.process_queue(
+                work_queue,
+                worker,
+                show_progress=not args.no_progress,
+                pipeline=True if args.pipeline or args.concurrency else None,
+            )
+        elif args.redescribe_where:
+            results = processor.redescribe_directory(
+                directory=target_path,
+                where=args.redescribe_where,
+                limit=args.limit,
+                show_progress=not args.no_progress,
+                pipeline=True if args.pipeline or args.concurrency else None,
+            )
+        elif args.use_async:
+            results = asyncio.run(
+                processor.aprocess_directory(
+                    directory=target_path,
+                    sanitize_names=options["sanitize_names"],
+                    show_progress=not args.no_progress,
+                    incremental=options["incremental"],
+                    stream=True if args.stream else None,
+                    job_store=job_store,
+                    job_id=job_id,
+                )
+            )
+        else:
+            results = processor.process_directory(
+                directory=target_path,
+                sanitize_names=options["sanitize_names"],
+                show_progress=not args.no_progress,
+                pipeline=True if args.pipeline or args.concurrency else None,
+                incremental=options["incremental"],
+                stream=True if args.stream else None,
+                job_store=job_store,
+                job_id=job_id,
+            )
 
         # Print summary
         print("\nProcessing Summary:")
@@ -209,12 +582,32 @@ def main() -> int:
         print(f"  Successfully processed: {results['processed']}")
         print(f"  Failed: {results['failed']}")
         print(f"  Files renamed: {results['renamed']}")
+        if results.get("described"):
+            print(f"  Already described: {results['described']}")
+        if results.get("unchanged") or results.get("deleted"):
+            print(f"  Unchanged since last scan: {results['unchanged']}")
+            print(f"  Deleted since last scan: {results['deleted']}")
+        if "remaining" in results:
+            print(f"  Missing files: {results['missing']}")
+            print(f"  Still outdated: {results['remaining']}")
         print(f"  Processing time: {results['processing_time']:.1f} seconds")
+        if "concurrency" in results:
+            concurrency = results["concurrency"]
+            print(
+                f"  Concurrency limit: {concurrency['limit']} "
+                f"(range {concurrency['min_limit']}-{concurrency['max_limit']}, "
+                f"{concurrency['drops']} overloads)"
+            )
+        for endpoint, latency in results.get("warmup", {}).items():
+            load_time = "failed" if latency is None else f"{latency:.1f}s"
+            print(f"  Model load at {endpoint}: {load_time}")
 
         if results["failed"] > 0:
             print(
                 f"\nWarning: {results['failed']} files failed processing. Check logs for details."
             )
+            if job_id:
+                print(f"Retry them with: --resume {job_id}")
             return 1
 
         print("\n✓ All images processed successfully!")
@@ -234,6 +627,8 @@ def main() -> int:
     except KeyboardInterrupt:
         logger.info("Processing interrupted by user")
         print("\nProcessing interrupted by user.")
+        if job_id:
+            print(f"Continue with: --resume {job_id}")
         return 130
 
     except Exception as e:
@@ -241,6 +636,16 @@ def main() -> int:
         print(f"Unexpected error: {e}")
         return 1
 
+    finally:
+        if ollama_client:
+            ollama_client.close()
+        if job_store:
+            job_store.close()
+        if work_queue:
+            work_queue.close()
+        if db_manager:
+            db_manager.close()
+
 
 if __name__ == "__main__":
     sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+Staged, thread-backed processing pipeline.
+"""
+
+import queue
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+from .tools.log_manager import get_logger
+
+logger = get_logger(__name__)
+
+# Sentinel marking the end of a stage's input
+_DONE = object()
+
+
+class Stage:
+    """A named pipeline stage served by a pool of worker threads."""
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], Any],
+        workers: int = 1,
+        queue_size: int = 10,
+    ) -> None:
+        """
+        Initialize pipeline stage.
+
+        Args:
+            name: Stage name used for thread names and logging
+            handler: Callable receiving an item and returning the item for the
+                next stage, or None when the item is finished early
+            workers: Number of worker threads for this stage
+            queue_size: Maximum number of items waiting in front of this stage
+        """
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, int(workers))
+        self.queue_size = max(1, int(queue_size))
+
+
+class StagedPipeline:
+    """
+    Run items through a sequence of stages connected by bounded queues.
+
+    A discovery thread feeds items from the source into the first stage. Each
+    stage hands its result to the next one, so a slow stage only holds back the
+    items queued in front of it. Exceptions raised by a handler fail that item
+    without stopping the pipeline.
+    """
+
+    def __init__(self, stages: list[Stage]) -> None:
+        """
+        Initialize pipeline.
+
+        Args:
+            stages: Ordered list of stages each item passes through
+        """
+        if not stages:
+            raise ValueError("Pipeline requires at least one stage")
+
+        self.stages = stages
+        self._queues = [queue.Queue(maxsize=stage.queue_size) for stage in stages]
+        self._results: queue.Queue = queue.Queue()
+        self._remaining = [stage.workers for stage in stages]
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._source_error: BaseException | None = None
+
+    def run(self, source: Iterable[Any]) -> Iterator[tuple[Any, Exception | None]]:
+        """
+        Process all items from source.
+
+        Args:
+            source: Iterable producing the items to process
+
+        Yields:
+            Tuples of (item, error) as items leave the pipeline; error is None
+            for items that completed or were finished early
+
+        Raises:
+            Exception: Any error raised while iterating the source
+        """
+        threads = [
+            threading.Thread(
+                target=self._discover, args=(source,), name="discover", daemon=True
+            )
+        ]
+        for index, stage in enumerate(self.stages):
+            threads.extend(
+                threading.Thread(
+                    target=self._work,
+                    args=(index,),
+                    name=f"{stage.name}-{worker}",
+                    daemon=True,
+                )
+                for worker in range(stage.workers)
+            )
+
+        logger.debug(
+            "Starting pipeline: "
+            + ", ".join(f"{stage.name} x{stage.workers}" for stage in self.stages)
+        )
+
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                entry = self._results.get()
+                if entry is _DONE:
+                    break
+                yield entry
+        finally:
+            # Let workers drain quickly if the consumer stops early
+            self._stop.set()
+
+        if self._source_error is not None:
+            raise self._source_error
+
+    def _discover(self, source: Iterable[Any]) -> None:
+        """Feed source items into the first stage queue."""
+        try:
+            for item in source:
+                if self._stop.is_set():
+                    break
+                self._queues[0].put(item)
+        except BaseException as e:
+            self._source_error = e
+        finally:
+            for _ in range(self.stages[0].workers):
+                self._queues[0].put(_DONE)
+
+    def _work(self, index: int) -> None:
+        """Worker loop for the stage at the given index."""
+        stage = self.stages[index]
+        inbox = self._queues[index]
+        outbox = self._queues[index + 1] if index + 1 < len(self.stages) else None
+
+        while True:
+            item = inbox.get()
+            if item is _DONE:
+                break
+            if self._stop.is_set():
+                continue
+
+            try:
+                result = stage.handler(item)
+            except Exception as e:
+                self._results.put((item, e))
+                continue
+
+            if result is None:
+                self._results.put((item, None))
+            elif outbox is None:
+                self._results.put((result, None))
+            else:
+                outbox.put(result)
+
+        # The last worker of a stage signals shutdown downstream
+        with self._lock:
+            self._remaining[index] -= 1
+            last_worker = self._remaining[index] == 0
+
+        if last_worker:
+            if outbox is None:
+                self._results.put(_DONE)
+            else:
+                for _ in range(self.stages[index + 1].workers):
+                    outbox.put(_DONE)
@@ -2,26 +2,161 @@
 Main image processing module with metadata management.
 """
 
+import asyncio
+import hashlib
+import os
 import re
+import stat
+import threading
 import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
 import pyexiv2
 from tqdm import tqdm
 
-from .api.ollama_client import OllamaClient
+from image_processor.imaging import read_image_size
+from image_processor.jobs import JobStore
+from image_processor.streaming import consume_concurrently
+from image_processor.walker import walk_files
+from image_processor.workqueue import WorkQueue
+
+from .api.async_ollama_client import AsyncOllamaClient
+from .api.ollama_client import COMBINED_SCHEMA, OllamaClient
 from .db.manager import DatabaseManager
+from .db.writer import DescriptionWriter
 from .exceptions import (
     FilePermissionError,
     ImageProcessingError,
     MetadataWriteError,
     UnsupportedImageFormat,
 )
+from .pipeline import Stage, StagedPipeline
 from .tools.config_manager import config
 from .tools.log_manager import get_logger
 
 logger = get_logger(__name__)
 
+# Stored details compared with the current configuration by --redescribe-where
+REDESCRIBE_CRITERIA = ("model", "prompt", "any")
+
+# Skipped images added to the scan manifest per write
+MANIFEST_BATCH_SIZE = 1000
+
+
+class ImageTask:
+    """Work item carried through the processing stages for one image."""
+
+    __slots__ = (
+        "file_path",
+        "original_path",
+        "redescribe",
+        "description",
+        "filename",
+        "fields",
+        "content_hash",
+        "details",
+    )
+
+    def __init__(self, file_path: Path, redescribe: bool = False) -> None:
+        """
+        Initialize image task.
+
+        Args:
+            file_path: Path to image file
+            redescribe: Whether to replace an existing description
+        """
+        self.file_path = file_path
+        # Jobs and the work queue know the image by the path it was found at
+        self.original_path = file_path
+        self.redescribe = redescribe
+        self.description: str | None = None
+        self.filename: str | None = None
+        self.fields: dict | None = None
+        self.content_hash: str | None = None
+        self.details: dict | None = None
+
+
+class ProgressTracker:
+    """
+    Count results of a directory run and drive its progress bar.
+
+    Supports streaming runs, where the total grows as files are discovered,
+    and hands successfully processed and failed images to callbacks in
+    batches, so recording results costs one transaction per batch.
+    """
+
+    def __init__(
+        self,
+        progress_bar: tqdm | None,
+        on_completed: Callable[[list[Path]], None],
+        batch_size: int = 500,
+        on_failed: Callable[[list[Path]], None] | None = None,
+    ) -> None:
+        """
+        Initialize progress tracker.
+
+        Args:
+            progress_bar: Progress bar to update, if any
+            on_completed: Called with batches of successfully processed images
+            batch_size: Number of finished images per flush
+            on_failed: Called with batches of images that failed
+        """
+        self.progress_bar = progress_bar
+        self.on_completed = on_completed
+        self.batch_size = batch_size
+        self.on_failed = on_failed
+        self.discovered = 0
+        self.processed = 0
+        self.failed = 0
+        self._completed: list[Path] = []
+        self._failures: list[Path] = []
+
+    def track(self, image_files: Iterable[Path]) -> Iterator[Path]:
+        """Yield image files, growing the progress total as each is found."""
+        for file_path in image_files:
+            self.discovered += 1
+            if self.progress_bar is not None:
+                self.progress_bar.total = max(
+                    self.progress_bar.total or 0, self.discovered
+                )
+                self.progress_bar.refresh()
+            yield file_path
+
+    def record(self, file_path: Path, success: bool) -> None:
+        """Record the result of processing one image."""
+        if success:
+            self.processed += 1
+            self._completed.append(file_path)
+        else:
+            self.failed += 1
+            if self.on_failed is not None:
+                self._failures.append(file_path)
+        if len(self._completed) + len(self._failures) >= self.batch_size:
+            self.flush()
+
+        if self.progress_bar is not None:
+            self.progress_bar.update(1)
+            self.progress_bar.set_postfix(
+                {"processed": self.processed, "failed": self.failed}
+            )
+
+    def flush(self) -> None:
+        """Pass pending completed and failed images to their callbacks."""
+        if self._completed:
+            completed, self._completed = self._completed, []
+            self.on_completed(completed)
+        if self._failures:
+            failures, self._failures = self._failures, []
+            self.on_failed(failures)
+
+    def close(self) -> None:
+        """Flush pending results and close the progress bar."""
+        self.flush()
+        if self.progress_bar is not None:
+            self.progress_bar.close()
+
 
 class ImageProcessor:
     """Main processor for handling image metadata operations."""
@@ -52,6 +187,36 @@ class ImageProcessor:
         self.max_file_size = (
             config.get("images.max_file_size_mb", 50) * 1024 * 1024
         )  # Convert to bytes
+        self.include_patterns = config.get("images.include", []) or []
+        self.exclude_patterns = config.get("images.exclude", []) or []
+        self.symlink_policy = config.get("images.symlinks", "files")
+
+        # Pipeline settings
+        self.pipeline_enabled = config.get("processing.pipeline", False)
+        self.queue_size = config.get("processing.batch_size", 10)
+        self.concurrency = config.get("processing.concurrency", 1)
+        self.stage_workers = config.get("processing.stage_workers", {}) or {}
+        self.incremental = config.get("processing.incremental", False)
+        self.stream = config.get("processing.stream", False)
+
+        # Directory runs group description writes into batched transactions
+        self.write_batch_size = config.get("database.write_batch_size", 100)
+        self.db_writer: DescriptionWriter | None = None
+
+        # Queue workers claim a few images ahead of the inference workers
+        self.queue_claim_size = config.get("queue.claim_size")
+        self.queue_poll_interval = config.get("queue.poll_interval", 5.0)
+
+        # Combined mode asks for a filename with the description and renames
+        self.rename_files = config.get("rename.enabled", False)
+        self.rename_max_length = config.get("rename.max_length", 100)
+
+        # Structured mode asks for a title, tags and visible text as JSON
+        self.structured = config.get("structured.enabled", False)
+        self._rename_lock = threading.Lock()
+        # Renamed images by the path they were found at, until the manifest
+        # records them under their final path
+        self._renamed: dict[Path, Path] = {}
 
         logger.info("Image processor initialized")
 
@@ -93,27 +258,85 @@ class ImageProcessor:
 
         logger.info(f"Starting filename sanitization in: {directory}")
 
-        for file_path in directory.rglob("*"):
-            if not file_path.is_file():
-                continue
+        for entry in self._walk(directory, images_only=False):
+            file_path = Path(entry.path)
+            if self.sanitize_file(file_path) != file_path:
+                renamed_count += 1
 
-            original_name = file_path.name
-            sanitized_name = self.sanitize_filename(original_name)
+        logger.info(f"Sanitization complete: {renamed_count} files renamed")
+        return renamed_count
 
-            if original_name != sanitized_name:
-                new_path = file_path.parent / sanitized_name
+    def sanitize_file(self, file_path: Path) -> Path:
+        """
+        Sanitize a single filename in place.
 
-                try:
-                    file_path.rename(new_path)
-                    renamed_count += 1
-                    logger.info(f"Renamed: {original_name} -> {sanitized_name}")
-                except OSError as e:
-                    raise FilePermissionError(
-                        f"Failed to rename {original_name}: {e}"
-                    ) from e
+        Args:
+            file_path: Path to file
 
-        logger.info(f"Sanitization complete: {renamed_count} files renamed")
-        return renamed_count
+        Returns:
+            Path of the file after sanitization
+
+        Raises:
+            FilePermissionError: If file cannot be renamed
+        """
+        original_name = file_path.name
+        sanitized_name = self.sanitize_filename(original_name)
+
+        if original_name == sanitized_name:
+            return file_path
+
+        new_path = file_path.parent / sanitized_name
+        try:
+            file_path.rename(new_path)
+        except OSError as e:
+            raise FilePermissionError(f"Failed to rename {original_name}: {e}") from e
+
+        logger.info(f"Renamed: {original_name} -> {sanitized_name}")
+        return new_path
+
+    def rename_image(self, file_path: Path, suggestion: str) -> Path:
+        """
+        Rename an image after a filename suggested by the model.
+
+        The suggestion is reduced to lowercase words joined by dashes and cut
+        to rename.max_length characters; the extension is kept. A numeric
+        suffix is added if another file already has the name.
+
+        Args:
+            file_path: Path to image file
+            suggestion: Filename suggested by the model
+
+        Returns:
+            Path of the file after renaming; unchanged if the suggestion
+            holds no usable characters
+
+        Raises:
+            FilePermissionError: If file cannot be renamed
+        """
+        # Models sometimes append an extension of their own
+        if Path(suggestion).suffix.lower() in self.supported_extensions:
+            suggestion = Path(suggestion).stem
+        stem = re.sub(r"[^a-z0-9]+", "-", suggestion.lower()).strip("-")
+        stem = stem[: self.rename_max_length].rstrip("-")
+        if not stem or stem == file_path.stem:
+            return file_path
+
+        suffix = file_path.suffix.lower()
+        with self._rename_lock:
+            new_path = file_path.with_name(f"{stem}{suffix}")
+            counter = 2
+            while new_path.exists():
+                new_path = file_path.with_name(f"{stem}-{counter}{suffix}")
+                counter += 1
+            try:
+                file_path.rename(new_path)
+            except OSError as e:
+                raise FilePermissionError(
+                    f"Failed to rename {file_path.name}: {e}"
+                ) from e
+
+        logger.info(f"Renamed: {file_path.name} -> {new_path.name}")
+        return new_path
 
     def is_supported_image(self, file_path: Path) -> bool:
         """
@@ -138,10 +361,15 @@ class ImageProcessor:
             UnsupportedImageFormat: If format not supported
             ImageProcessingError: If file is invalid
         """
-        if not file_path.exists():
-            raise ImageProcessingError(f"Image file not found: {file_path}")
+        # A single stat covers existence, file type and size checks
+        try:
+            file_stat = file_path.stat()
+        except FileNotFoundError as e:
+            raise ImageProcessingError(f"Image file not found: {file_path}") from e
+        except OSError as e:
+            raise ImageProcessingError(f"Cannot access {file_path}: {e}") from e
 
-        if not file_path.is_file():
+        if not stat.S_ISREG(file_stat.st_mode):
             raise ImageProcessingError(f"Path is not a file: {file_path}")
 
         if not self.is_supported_image(file_path):
@@ -150,34 +378,42 @@ class ImageProcessor:
                 f"Supported formats: {', '.join(self.supported_extensions)}"
             )
 
-        if file_path.stat().st_size > self.max_file_size:
+        if file_stat.st_size > self.max_file_size:
             raise ImageProcessingError(
-                f"Image file too large: {file_path.stat().st_size / (1024 * 1024):.1f}MB. "
+                f"Image file too large: {file_stat.st_size / (1024 * 1024):.1f}MB. "
                 f"Maximum size: {self.max_file_size / (1024 * 1024):.1f}MB"
             )
 
-    def write_metadata_to_image(self, file_path: Path, description: str) -> None:
+    def write_metadata_to_image(
+        self, file_path: Path, description: str, fields: dict | None = None
+    ) -> None:
         """
         Write description as XMP metadata to image file.
 
         Args:
             file_path: Path to image file
             description: Description text to embed
+            fields: Structured response with title and tags to embed as
+                dc:title and dc:subject
 
         Raises:
             MetadataWriteError: If metadata writing fails
         """
         for attempt in range(self.retry_attempts):
             try:
+                xmp = {
+                    "Xmp.dc.description": description,
+                    "Xmp.dc.subject": "AI Generated Description",
+                    "Xmp.xmp.CreatorTool": "Image Meta Processor v2.0",
+                }
+                if fields is not None:
+                    xmp["Xmp.dc.title"] = fields["title"]
+                    if fields["tags"]:
+                        xmp["Xmp.dc.subject"] = fields["tags"]
+
                 with pyexiv2.Image(str(file_path)) as image:
                     # Set XMP metadata
-                    image.modify_xmp(
-                        {
-                            "Xmp.dc.description": description,
-                            "Xmp.dc.subject": "AI Generated Description",
-                            "Xmp.xmp.CreatorTool": "Image Meta Processor v2.0",
-                        }
-                    )
+                    image.modify_xmp(xmp)
 
                 logger.debug(f"Metadata written to: {file_path.name}")
                 return
@@ -194,36 +430,274 @@ class ImageProcessor:
                 )
                 time.sleep(self.retry_delay)
 
-    def process_single_image(self, file_path: Path) -> bool:
+    def compute_content_hash(self, file_path: Path) -> str:
         """
-        Process a single image file.
+        Compute a BLAKE2b hash of the image file contents.
 
         Args:
             file_path: Path to image file
 
         Returns:
-            True if processing successful, False otherwise
+            Hex digest identifying the file contents
+
+        Raises:
+            ImageProcessingError: If file cannot be read
         """
         try:
-            # Validate image file
-            self.validate_image_file(file_path)
+            with file_path.open("rb") as image_file:
+                digest = hashlib.file_digest(
+                    image_file, lambda: hashlib.blake2b(digest_size=32)
+                )
+            return digest.hexdigest()
+        except OSError as e:
+            raise ImageProcessingError(f"Failed to hash {file_path}: {e}") from e
 
-            # Check if description already exists
-            existing_description = self.db_manager.get_description(str(file_path))
-            if existing_description:
-                logger.debug(f"Description already exists for: {file_path.name}")
-                return True
+    def _validate_stage(self, task: ImageTask) -> ImageTask | None:
+        """
+        Validate image and skip it when a description already exists.
+
+        Descriptions are looked up by content hash first, so moved, renamed
+        or copied images reuse the stored description instead of re-running
+        the model. Tasks marked for redescription skip both lookups.
+
+        Args:
+            task: Image task
+
+        Returns:
+            The task, or None if the image needs no further work
+        """
+        self.validate_image_file(task.file_path)
+        file_path = str(task.file_path)
+
+        task.content_hash = self.compute_content_hash(task.file_path)
+        if task.redescribe:
+            return task
+
+        cached = self.db_manager.get_description_by_hash(task.content_hash)
+        if cached:
+            if cached["file_path"] != file_path:
+                self._save_description(
+                    file_path, cached["description"], task.content_hash
+                )
+                logger.info(
+                    f"Reused description for {task.file_path.name} "
+                    f"from identical image: {cached['file_path']}"
+                )
+            else:
+                logger.debug(f"Description already exists for: {task.file_path.name}")
+            return None
+
+        record = self.db_manager.get_record(file_path)
+        if record is not None:
+            if record["content_hash"] is None:
+                # Backfill the hash for records saved before content hashing
+                self.db_manager.update_content_hash(file_path, task.content_hash)
+                logger.debug(f"Description already exists for: {task.file_path.name}")
+                return None
+
+            # Neither stored hash matched, so the image changed on disk
+            logger.info(f"Image changed since it was described: {task.file_path.name}")
+            task.redescribe = True
+
+        return task
+
+    def _combined(self, task: ImageTask) -> bool:
+        """Whether a task asks the model for a filename with its description."""
+        # Renaming an image with a stored description would orphan its record
+        return self.rename_files and not task.redescribe
+
+    def _structured_request(
+        self, task: ImageTask, client: OllamaClient
+    ) -> tuple[dict, str] | None:
+        """Schema and prompt for a task's request, None for a plain description."""
+        if self.structured:
+            return client.structured_request(filename=self._combined(task))
+        if self._combined(task):
+            return COMBINED_SCHEMA, client.combined_prompt
+        return None
+
+    def _apply_fields(self, task: ImageTask, fields: dict) -> None:
+        """Take the description and other outputs from a structured response."""
+        task.description = fields["description"]
+        task.filename = fields.get("filename")
+        task.fields = fields
+
+    def _infer_stage(self, task: ImageTask) -> ImageTask:
+        """Generate the description, and in combined mode the filename."""
+        usage = {}
+        start = time.perf_counter()
+        request = self._structured_request(task, self.ollama_client)
+        if request is None:
+            task.description = self.ollama_client.generate_description(
+                task.file_path, usage=usage
+            )
+        else:
+            schema, prompt = request
+            self._apply_fields(
+                task,
+                self.ollama_client.generate_structured(
+                    task.file_path, schema, prompt, usage
+                ),
+            )
+        task.details = self._inference_details(
+            task.file_path, self.ollama_client, start, usage
+        )
+        return task
+
+    def _prompt_hash(self, client: OllamaClient) -> str:
+        """
+        Identify the description prompt of the current configuration.
+
+        The filename request of combined mode is left out: redescribed
+        images are never renamed, and their rows must match those of
+        renamed images.
+        """
+        if self.structured:
+            return client.prompt_hash(client.structured_request()[1])
+        return client.prompt_hash()
+
+    def _inference_details(
+        self,
+        file_path: Path,
+        client: OllamaClient,
+        start: float,
+        usage: dict,
+    ) -> dict:
+        """
+        Collect the details stored with a generated description.
+
+        Args:
+            file_path: Path to image file
+            client: Client that generated the description
+            start: time.perf_counter() value taken before the request
+            usage: Token counts reported by the client
 
-            # Generate description
-            description = self.ollama_client.generate_description(file_path)
+        Returns:
+            Dictionary of DETAIL_COLUMNS values
+        """
+        details = {
+            "model": client.model,
+            "prompt_hash": self._prompt_hash(client),
+            "inference_ms": (time.perf_counter() - start) * 1000,
+            **usage,
+        }
+        try:
+            details["image_width"], details["image_height"] = read_image_size(file_path)
+        except OSError as e:
+            logger.debug(f"Cannot read size of {file_path.name}: {e}")
+        return details
+
+    def _persist_stage(self, task: ImageTask) -> ImageTask:
+        """Rename the image if a filename was generated, then save the description."""
+        if task.filename:
+            task.file_path = self.rename_image(task.file_path, task.filename)
+            if task.file_path != task.original_path:
+                self._renamed[task.original_path] = task.file_path
+        self._save_description(
+            str(task.file_path), task.description, task.content_hash, task.details
+        )
+        return task
+
+    def _write_xmp_stage(self, task: ImageTask) -> ImageTask:
+        """Embed the generated description in the image file."""
+        self.write_metadata_to_image(task.file_path, task.description, task.fields)
+
+        # Writing XMP changes the file bytes; keep the hash of the original
+        # for untouched copies and add the final one for copies of the output
+        tagged_hash = self.compute_content_hash(task.file_path)
+        if self.db_writer is not None:
+            # Replaces the pending record, or upserts it if already written
+            self.db_writer.add(
+                str(task.file_path),
+                task.description,
+                task.content_hash,
+                {**(task.details or {}), "tagged_hash": tagged_hash},
+            )
+        else:
+            self.db_manager.update_tagged_hash(str(task.file_path), tagged_hash)
 
-            # Save to database
-            self.db_manager.save_description(str(file_path), description)
+        logger.info(f"Successfully processed: {task.file_path.name}")
+        return task
 
-            # Write metadata to image
-            self.write_metadata_to_image(file_path, description)
+    def _save_description(
+        self,
+        file_path: str,
+        description: str,
+        content_hash: str | None,
+        details: dict | None = None,
+    ) -> None:
+        """Save a description, through the batch writer during directory runs."""
+        if self.db_writer is not None:
+            self.db_writer.add(file_path, description, content_hash, details)
+        else:
+            self.db_manager.save_description(
+                file_path, description, content_hash, details
+            )
+
+    @contextmanager
+    def _batched_writes(self) -> Iterator[None]:
+        """
+        Route description writes through a batch writer for one run.
 
-            logger.info(f"Successfully processed: {file_path.name}")
+        Pending writes are flushed when the run ends, even if it fails.
+        """
+        if self.write_batch_size <= 1 or self.db_writer is not None:
+            yield
+            return
+
+        self.db_writer = DescriptionWriter(self.db_manager, self.write_batch_size)
+        try:
+            yield
+        finally:
+            writer, self.db_writer = self.db_writer, None
+            writer.close()
+
+    def _build_pipeline(self) -> StagedPipeline:
+        """
+        Build the staged processing pipeline from configuration.
+
+        Returns:
+            Pipeline with validate, infer, persist and write_xmp stages
+        """
+        workers = {
+            "validate": 1,
+            "infer": self.concurrency,
+            "persist": 1,
+            "write_xmp": 1,
+            **self.stage_workers,
+        }
+        handlers = {
+            "validate": self._validate_stage,
+            "infer": self._infer_stage,
+            "persist": self._persist_stage,
+            "write_xmp": self._write_xmp_stage,
+        }
+        return StagedPipeline(
+            [
+                Stage(name, handler, workers[name], self.queue_size)
+                for name, handler in handlers.items()
+            ]
+        )
+
+    def process_single_image(self, file_path: Path, redescribe: bool = False) -> bool:
+        """
+        Process a single image file.
+
+        Args:
+            file_path: Path to image file
+            redescribe: Whether to replace an existing description
+
+        Returns:
+            True if processing successful, False otherwise
+        """
+        try:
+            task = self._validate_stage(ImageTask(file_path, redescribe))
+            if task is None:
+                return True
+
+            self._infer_stage(task)
+            self._persist_stage(task)
+            self._write_xmp_stage(task)
             return True
 
         except Exception as e:
@@ -240,31 +714,103 @@ class ImageProcessor:
         Returns:
             List of image file paths
         """
-        image_files = []
-
-        for file_path in directory.rglob("*"):
-            if file_path.is_file() and self.is_supported_image(file_path):
-                image_files.append(file_path)
+        image_files = [Path(entry.path) for entry in self._walk(directory)]
 
         logger.info(f"Found {len(image_files)} image files in: {directory}")
         return image_files
 
-    def process_directory(
-        self, directory: Path, sanitize_names: bool = True, show_progress: bool = True
-    ) -> dict:
+    def _walk(self, directory: Path, images_only: bool = True) -> Iterator[os.DirEntry]:
         """
-        Process all images in a directory.
+        Walk directory with the configured include, exclude and symlink rules.
 
         Args:
-            directory: Directory containing images
-            sanitize_names: Whether to sanitize filenames first
-            show_progress: Whether to show progress bar
+            directory: Directory to walk
+            images_only: Whether to yield only supported image files
 
-        Returns:
-            Dictionary with processing statistics
+        Yields:
+            Directory entries for matching files
         """
-        start_time = time.time()
+        return walk_files(
+            directory,
+            extensions=self.supported_extensions if images_only else None,
+            include=self.include_patterns,
+            exclude=self.exclude_patterns,
+            symlinks=self.symlink_policy,
+            onerror=lambda e: logger.warning(f"Cannot scan {e.filename}: {e}"),
+        )
+
+    def _record_manifest(self, file_paths: list[Path]) -> None:
+        """
+        Store the current size, mtime and inode of finished images.
 
+        Called after XMP writes, so the manifest matches the final files and
+        the next incremental run treats them as unchanged.
+
+        Args:
+            file_paths: Images processed successfully or skipped as described,
+                by the path they were found at
+        """
+        entries = []
+        for file_path in file_paths:
+            file_path = self._renamed.pop(file_path, file_path)
+            try:
+                file_stat = file_path.stat()
+            except OSError:
+                continue
+            entries.append(
+                (
+                    str(file_path),
+                    file_stat.st_size,
+                    file_stat.st_mtime_ns,
+                    file_stat.st_ino,
+                )
+            )
+
+        try:
+            # Descriptions must be stored before the manifest marks their
+            # images as done, or an interrupted run would skip them next time
+            if self.db_writer is not None:
+                self.db_writer.flush()
+            self.db_manager.update_manifest(entries)
+        except Exception as e:
+            logger.warning(f"Failed to update scan manifest: {e}")
+
+    def _iter_results(
+        self,
+        image_files: Iterable[Path],
+        use_pipeline: bool,
+        redescribe: bool = False,
+    ) -> Iterator[tuple[Path, bool]]:
+        """
+        Process images and yield a success flag per image.
+
+        Args:
+            image_files: Images to process
+            use_pipeline: Whether to run the staged pipeline
+            redescribe: Whether to replace existing descriptions
+
+        Yields:
+            Tuples of (file path, True if processed or False on failure)
+        """
+        if not use_pipeline:
+            for file_path in image_files:
+                yield file_path, self.process_single_image(file_path, redescribe)
+            return
+
+        pipeline = self._build_pipeline()
+        tasks = (ImageTask(path, redescribe) for path in image_files)
+        for task, error in pipeline.run(tasks):
+            if error is not None:
+                logger.error(f"Failed to process {task.file_path.name}: {error}")
+            yield task.original_path, error is None
+
+    def _check_directory(self, directory: Path) -> None:
+        """
+        Validate that the directory to process exists.
+
+        Raises:
+            ImageProcessingError: If directory is invalid
+        """
         if not directory.exists():
             raise ImageProcessingError(f"Directory not found: {directory}")
 
@@ -273,66 +819,858 @@ class ImageProcessor:
 
         logger.info(f"Starting directory processing: {directory}")
 
-        # Sanitize filenames if requested
-        renamed_count = 0
-        if sanitize_names:
-            renamed_count = self.sanitize_filenames_in_directory(directory)
+    def _discover_images(
+        self,
+        directory: Path,
+        sanitize_names: bool,
+        incremental: bool,
+        scan_stats: dict[str, int],
+        changed: set[Path] | None = None,
+    ) -> Iterator[Path]:
+        """
+        Lazily yield images to process, sanitizing filenames as they are found.
+
+        Args:
+            directory: Directory containing images
+            sanitize_names: Whether to sanitize filenames
+            incremental: Whether to yield only images changed since the last
+                run, according to the scan manifest
+            scan_stats: Statistics updated in place as discovery proceeds
+            changed: Set to which incremental discovery adds images that are
+                in the manifest but changed on disk (optional)
+
+        Yields:
+            Paths of images to process
+        """
+        if incremental:
+            yield from self._discover_incremental(
+                directory, sanitize_names, scan_stats, changed
+            )
+            return
+
+        if not sanitize_names:
+            for entry in self._walk(directory):
+                yield Path(entry.path)
+            return
+
+        # Sanitize every file in the same walk that finds the images
+        for entry in self._walk(directory, images_only=False):
+            file_path = Path(entry.path)
+            sanitized_path = self.sanitize_file(file_path)
+            if sanitized_path != file_path:
+                scan_stats["renamed"] += 1
+            if self.is_supported_image(sanitized_path):
+                yield sanitized_path
+
+    def _discover_incremental(
+        self,
+        directory: Path,
+        sanitize_names: bool,
+        scan_stats: dict[str, int],
+        changed: set[Path] | None = None,
+    ) -> Iterator[Path]:
+        """
+        Yield new or changed images by diffing a walk against the manifest.
 
-        # Find image files
-        image_files = self.find_image_files(directory)
+        The manifest is loaded with one query up front. Only new or changed
+        images are sanitized, so an unchanged tree costs one directory walk.
+        Deletions are known once the walk completes.
 
-        if not image_files:
-            logger.warning("No image files found to process")
-            return {
-                "total_files": 0,
-                "processed": 0,
-                "failed": 0,
-                "renamed": renamed_count,
-                "processing_time": 0,
-            }
-
-        # Process images
-        processed_count = 0
-        failed_count = 0
-
-        # Set up progress bar
-        progress_bar = None
-        if show_progress and config.get("processing.progress_bar", True):
-            progress_bar = tqdm(
-                image_files, desc="Processing images", unit="img", colour="green"
+        Args:
+            directory: Directory containing images
+            sanitize_names: Whether to sanitize filenames of new images
+            scan_stats: Statistics updated in place as discovery proceeds
+            changed: Set to which images in the manifest that changed on disk
+                are added before they are yielded (optional)
+
+        Yields:
+            Paths of new or changed images
+        """
+        manifest = self.db_manager.get_manifest(str(directory))
+        changed_count = 0
+
+        for entry in self._walk(directory):
+            try:
+                entry_stat = entry.stat()
+            except OSError as e:
+                logger.warning(f"Cannot stat {entry.path}: {e}")
+                continue
+
+            # Pop seen paths so whatever remains has been deleted
+            previous = manifest.pop(entry.path, None)
+            if previous == (
+                entry_stat.st_size,
+                entry_stat.st_mtime_ns,
+                entry_stat.st_ino,
+            ):
+                scan_stats["unchanged"] += 1
+                continue
+
+            changed_count += 1
+            file_path = Path(entry.path)
+            if sanitize_names:
+                sanitized_path = self.sanitize_file(file_path)
+                if sanitized_path != file_path:
+                    scan_stats["renamed"] += 1
+                    file_path = sanitized_path
+            if previous is not None and changed is not None:
+                changed.add(file_path)
+            yield file_path
+
+        deleted = sorted(manifest)
+        for file_path in deleted:
+            logger.info(f"Deleted since last scan: {file_path}")
+        self.db_manager.delete_manifest_entries(deleted)
+        scan_stats["deleted"] = len(deleted)
+
+        logger.info(
+            f"Incremental scan: {changed_count} new or changed, "
+            f"{scan_stats['unchanged']} unchanged, {len(deleted)} deleted"
+        )
+
+    def _skip_described(
+        self,
+        directory: Path,
+        image_files: Iterable[Path],
+        scan_stats: dict[str, int],
+        changed: set[Path] | None = None,
+        record_skipped: bool = False,
+        check_manifest: bool = False,
+    ) -> Iterator[Path]:
+        """
+        Drop images that already have a stored description.
+
+        Described paths are loaded with one query when iteration starts, so
+        resumed runs skip finished images without a lookup per file.
+
+        Args:
+            directory: Directory being processed
+            image_files: Discovered images
+            scan_stats: Statistics dictionary; "described" is incremented for
+                each skipped image
+            changed: Images changed on disk since the last run; they are
+                kept so their descriptions can be checked (optional)
+            record_skipped: Whether to add skipped images to the scan
+                manifest, so incremental runs stop reporting them as new
+            check_manifest: Whether to compare described images with the
+                scan manifest and keep those whose size, mtime or inode
+                changed, for runs whose discovery did not already do so;
+                described images missing from the manifest are added to it
+
+        Yields:
+            Images that still need processing
+        """
+        described = self.db_manager.get_described_paths(str(directory))
+        if described:
+            logger.info(f"{len(described)} images already described in: {directory}")
+        manifest = (
+            self.db_manager.get_manifest(str(directory))
+            if check_manifest and described
+            else None
+        )
+
+        skipped = []
+        for file_path in image_files:
+            if str(file_path) not in described or file_path in (changed or ()):
+                yield file_path
+                continue
+
+            record = record_skipped
+            if manifest is not None:
+                previous = manifest.get(str(file_path))
+                if previous is None:
+                    record = True
+                elif previous != self._manifest_entry(file_path):
+                    logger.info(f"Changed since last scan: {file_path}")
+                    yield file_path
+                    continue
+
+            scan_stats["described"] += 1
+            if record:
+                skipped.append(file_path)
+                if len(skipped) >= MANIFEST_BATCH_SIZE:
+                    self._record_manifest(skipped)
+                    skipped = []
+
+        if skipped:
+            self._record_manifest(skipped)
+
+    def _manifest_entry(self, file_path: Path) -> tuple[int, int, int] | None:
+        """Size, mtime and inode of a file as stored in the scan manifest."""
+        try:
+            file_stat = file_path.stat()
+        except OSError:
+            return None
+        return file_stat.st_size, file_stat.st_mtime_ns, file_stat.st_ino
+
+    def _prepare_directory(
+        self,
+        directory: Path,
+        sanitize_names: bool,
+        incremental: bool = False,
+        stream: bool = False,
+        job_store: JobStore | None = None,
+        job_id: str | None = None,
+    ) -> tuple[Iterable[Path], dict[str, int]]:
+        """
+        Validate directory and discover the images to process.
+
+        With a job, discovered images are recorded as its pending items. A
+        job whose discovery already completed is resumed from its pending
+        items without walking the directory again.
+
+        Args:
+            directory: Directory containing images
+            sanitize_names: Whether to sanitize filenames first
+            incremental: Whether to return only images changed since the
+                last run, according to the scan manifest
+            stream: Whether to return a lazy iterator instead of a list
+            job_store: Store holding the job of this run, if any
+            job_id: Id of the job to record or resume
+
+        Returns:
+            Tuple of (image files, scan statistics); the statistics of a
+            stream are complete once it is exhausted
+
+        Raises:
+            ImageProcessingError: If directory is invalid
+        """
+        self._check_directory(directory)
+
+        scan_stats = {"renamed": 0, "unchanged": 0, "deleted": 0, "described": 0}
+        job = job_store.resume_job(job_id) if job_store is not None else None
+        if job is not None and job["discovered"]:
+            logger.info(
+                f"Resuming job {job_id} without rescanning: "
+                f"{job['items']['pending']} images pending"
             )
-            iterator = progress_bar
+            image_files = map(Path, job_store.iter_items(job_id))
         else:
-            iterator = image_files
+            changed: set[Path] = set()
+            image_files = self._skip_described(
+                directory,
+                self._discover_images(
+                    directory, sanitize_names, incremental, scan_stats, changed
+                ),
+                scan_stats,
+                changed,
+                record_skipped=incremental,
+                check_manifest=not incremental,
+            )
+            if job is not None:
+                # Finished items are not recorded again by a repeated walk
+                image_files = job_store.discover(
+                    job_id, image_files, skip=job_store.get_results(job_id)
+                )
+
+        if stream:
+            return image_files, scan_stats
+
+        image_files = list(image_files)
+        logger.info(f"Found {len(image_files)} image files in: {directory}")
+        return image_files, scan_stats
+
+    def _create_tracker(
+        self,
+        total: int | None,
+        show_progress: bool,
+        job_store: JobStore | None = None,
+        job_id: str | None = None,
+    ) -> ProgressTracker:
+        """
+        Create the progress tracker of a directory run.
+
+        Completed images update the scan manifest, and the job items if a
+        job is given; their descriptions are written first. Failed images
+        are marked in the job in the same batches.
+        """
+        if job_store is None:
+            return ProgressTracker(
+                self._create_progress_bar(total, show_progress), self._record_manifest
+            )
+
+        def on_completed(file_paths: list[Path]) -> None:
+            self._record_manifest(file_paths)
+            job_store.mark(job_id, file_paths, "done")
+
+        return ProgressTracker(
+            self._create_progress_bar(total, show_progress),
+            on_completed,
+            on_failed=lambda file_paths: job_store.mark(job_id, file_paths, "failed"),
+        )
+
+    @contextmanager
+    def _job_status(
+        self, job_store: JobStore | None, job_id: str | None
+    ) -> Iterator[None]:
+        """Mark the job completed when the run ends, or interrupted if it fails."""
+        if job_store is None:
+            yield
+            return
 
         try:
-            for file_path in iterator:
-                if self.process_single_image(file_path):
-                    processed_count += 1
-                else:
-                    failed_count += 1
+            yield
+        except BaseException:
+            job_store.set_status(job_id, "interrupted")
+            logger.info(f"Job {job_id} interrupted; resume it with --resume {job_id}")
+            raise
+        job_store.set_status(job_id, "completed")
+
+    def _create_progress_bar(
+        self, total: int | None, show_progress: bool
+    ) -> tqdm | None:
+        """Create the processing progress bar if enabled."""
+        if show_progress and config.get("processing.progress_bar", True):
+            return tqdm(
+                total=total, desc="Processing images", unit="img", colour="green"
+            )
+        return None
 
-                # Update progress bar description
-                if progress_bar:
-                    progress_bar.set_postfix(
-                        {"processed": processed_count, "failed": failed_count}
-                    )
-        finally:
-            if progress_bar:
-                progress_bar.close()
+    def _summarize(
+        self,
+        total_files: int,
+        processed_count: int,
+        failed_count: int,
+        scan_stats: dict[str, int],
+        start_time: float,
+        client: OllamaClient | None = None,
+    ) -> dict:
+        """
+        Log and return processing statistics.
 
+        If the client that ran the inference has an adaptive concurrency
+        limiter, its final state is included under "concurrency"; model load
+        times measured by its warm-up are included under "warmup".
+        """
         processing_time = time.time() - start_time
 
         # Log summary
         logger.info(
             f"Processing complete: {processed_count} processed, {failed_count} failed, "
-            f"{renamed_count} renamed in {processing_time:.1f}s"
+            f"{scan_stats['renamed']} renamed in {processing_time:.1f}s"
         )
 
-        return {
-            "total_files": len(image_files),
+        results = {
+            "total_files": total_files,
             "processed": processed_count,
             "failed": failed_count,
-            "renamed": renamed_count,
+            **scan_stats,
             "processing_time": processing_time,
         }
+        client = client or self.ollama_client
+        limiter = getattr(client, "limiter", None)
+        if limiter is not None:
+            results["concurrency"] = limiter.stats()
+        warmup_latency = getattr(client, "warmup_latency", None)
+        if warmup_latency:
+            results["warmup"] = warmup_latency
+        return results
+
+    def process_directory(
+        self,
+        directory: Path,
+        sanitize_names: bool = True,
+        show_progress: bool = True,
+        pipeline: bool | None = None,
+        incremental: bool | None = None,
+        stream: bool | None = None,
+        job_store: JobStore | None = None,
+        job_id: str | None = None,
+    ) -> dict:
+        """
+        Process all images in a directory.
+
+        Args:
+            directory: Directory containing images
+            sanitize_names: Whether to sanitize filenames first
+            show_progress: Whether to show progress bar
+            pipeline: Whether to use the staged pipeline (default from config)
+            incremental: Whether to process only images that are new or
+                changed since the last run (default from config)
+            stream: Whether to start processing while discovery is still
+                running instead of listing all images first (default from config)
+            job_store: Store in which to record the progress of this run
+            job_id: Job to record the run in; a job that ran before is
+                resumed, retrying its unfinished and failed images
+
+        Returns:
+            Dictionary with processing statistics
+        """
+        start_time = time.time()
+
+        use_pipeline = self.pipeline_enabled if pipeline is None else pipeline
+        use_incremental = self.incremental if incremental is None else incremental
+        use_stream = self.stream if stream is None else stream
+        with self._job_status(job_store, job_id):
+            image_files, scan_stats = self._prepare_directory(
+                directory,
+                sanitize_names,
+                use_incremental,
+                use_stream,
+                job_store,
+                job_id,
+            )
+
+            if not use_stream and not image_files:
+                logger.warning("No image files found to process")
+                return self._summarize(0, 0, 0, scan_stats, time.time())
+
+            if use_pipeline:
+                logger.info(
+                    f"Using staged pipeline with {self.concurrency} inference workers"
+                )
+            self.ollama_client.warm_up()
+
+            # Set up progress; a streaming run grows its total as files are found
+            tracker = self._create_tracker(
+                None if use_stream else len(image_files),
+                show_progress,
+                job_store,
+                job_id,
+            )
+
+            with self._batched_writes():
+                try:
+                    results = self._iter_results(
+                        tracker.track(image_files), use_pipeline
+                    )
+                    for file_path, success in results:
+                        tracker.record(file_path, success)
+                finally:
+                    tracker.close()
+
+        if tracker.discovered == 0:
+            logger.warning("No image files found to process")
+
+        return self._summarize(
+            tracker.discovered,
+            tracker.processed,
+            tracker.failed,
+            scan_stats,
+            start_time,
+        )
+
+    def redescribe_directory(
+        self,
+        directory: Path,
+        where: str = "any",
+        limit: int | None = None,
+        show_progress: bool = True,
+        pipeline: bool | None = None,
+    ) -> dict:
+        """
+        Regenerate descriptions made with a different model or prompt.
+
+        Only stored rows below the directory are considered, oldest first,
+        so repeated capped runs roll a new model across an archive
+        gradually. Rows whose files no longer exist are counted as missing
+        and left alone.
+
+        Args:
+            directory: Directory containing images
+            where: Which stored detail must differ from the current
+                configuration: "model", "prompt" or "any" of them
+            limit: Maximum number of images to redescribe (default from
+                config; None there means no limit)
+            show_progress: Whether to show progress bar
+            pipeline: Whether to use the staged pipeline (default from config)
+
+        Returns:
+            Dictionary with processing statistics; "remaining" counts the
+            outdated rows left for later runs
+
+        Raises:
+            ImageProcessingError: If directory is invalid
+            ValueError: If where is not one of REDESCRIBE_CRITERIA
+        """
+        if where not in REDESCRIBE_CRITERIA:
+            raise ValueError(
+                f"Unknown redescribe criterion {where!r}; "
+                f"expected one of: {', '.join(REDESCRIBE_CRITERIA)}"
+            )
+
+        start_time = time.time()
+        self._check_directory(directory)
+
+        use_pipeline = self.pipeline_enabled if pipeline is None else pipeline
+        if limit is None:
+            limit = config.get("processing.redescribe_limit", 100)
+        criteria = {
+            "model": self.ollama_client.model if where != "prompt" else None,
+            "prompt_hash": self._prompt_hash(self.ollama_client)
+            if where != "model"
+            else None,
+        }
+
+        image_files = []
+        scan_stats = {
+            "renamed": 0,
+            "unchanged": 0,
+            "deleted": 0,
+            "described": 0,
+            "missing": 0,
+        }
+        # Missing files keep their rows, so page past them to fill the limit
+        offset = 0
+        while limit is None or len(image_files) < limit:
+            outdated = self.db_manager.get_outdated_paths(
+                str(directory),
+                limit=None if limit is None else limit - len(image_files),
+                offset=offset,
+                **criteria,
+            )
+            if not outdated:
+                break
+            offset += len(outdated)
+
+            for file_path in map(Path, outdated):
+                if file_path.is_file():
+                    image_files.append(file_path)
+                else:
+                    logger.warning(
+                        f"Outdated description for missing file: {file_path}"
+                    )
+                    scan_stats["missing"] += 1
+
+            if limit is None:
+                break
+
+        logger.info(
+            f"Redescribing {len(image_files)} images with model "
+            f"{self.ollama_client.model} in: {directory}"
+        )
+
+        tracker = self._create_tracker(len(image_files), show_progress)
+        with self._batched_writes():
+            try:
+                results = self._iter_results(
+                    tracker.track(image_files), use_pipeline, redescribe=True
+                )
+                for file_path, success in results:
+                    tracker.record(file_path, success)
+            finally:
+                tracker.close()
+
+        scan_stats["remaining"] = self.db_manager.count_outdated(
+            str(directory), **criteria
+        )
+        return self._summarize(
+            tracker.discovered,
+            tracker.processed,
+            tracker.failed,
+            scan_stats,
+            start_time,
+        )
+
+    def enqueue_directory(
+        self,
+        directory: Path,
+        work_queue: WorkQueue,
+        sanitize_names: bool = True,
+        incremental: bool | None = None,
+    ) -> dict:
+        """
+        Discover the images of a directory and add them to a work queue.
+
+        Images that are already described, or already queued, are not
+        added, so a directory can be enqueued again as it grows.
+
+        Args:
+            directory: Directory containing images
+            work_queue: Queue that workers claim images from
+            sanitize_names: Whether to sanitize filenames first
+            incremental: Whether to enqueue only images that are new or
+                changed since the last run (default from config)
+
+        Returns:
+            Dictionary with the number of images enqueued and scan statistics
+
+        Raises:
+            ImageProcessingError: If directory is invalid
+        """
+        use_incremental = self.incremental if incremental is None else incremental
+        image_files, scan_stats = self._prepare_directory(
+            directory, sanitize_names, use_incremental, stream=True
+        )
+        enqueued = work_queue.enqueue(image_files)
+        logger.info(f"Enqueued {enqueued} images from: {directory}")
+        return {"enqueued": enqueued, **scan_stats}
+
+    def _claim_images(
+        self, work_queue: WorkQueue, worker: str, claim_size: int
+    ) -> Iterator[Path]:
+        """
+        Yield images claimed from a work queue until no work is left.
+
+        When nothing can be claimed but other workers still hold leases,
+        polls until they finish or their leases expire and the items can be
+        taken over.
+        """
+        while True:
+            claimed = work_queue.claim(worker, claim_size)
+            if claimed:
+                yield from map(Path, claimed)
+                continue
+
+            counts = work_queue.counts(exclude_worker=worker)
+            if not counts["pending"] and not counts["leased"]:
+                return
+            time.sleep(self.queue_poll_interval)
+
+    def process_queue(
+        self,
+        work_queue: WorkQueue,
+        worker: str,
+        show_progress: bool = True,
+        pipeline: bool | None = None,
+    ) -> dict:
+        """
+        Process images claimed from a shared work queue until it is drained.
+
+        Leases are kept alive by heartbeats while the worker runs. Processed
+        images are marked done once their descriptions are stored; failed
+        ones go back to the queue for another attempt. If the worker stops
+        early, its unfinished leases are released at once.
+
+        Args:
+            work_queue: Queue to claim images from
+            worker: Id of this worker, unique across hosts
+            show_progress: Whether to show progress bar
+            pipeline: Whether to use the staged pipeline (default from config)
+
+        Returns:
+            Dictionary with processing statistics
+        """
+        start_time = time.time()
+
+        use_pipeline = self.pipeline_enabled if pipeline is None else pipeline
+        claim_size = self.queue_claim_size or max(self.concurrency, 1) * 2
+        logger.info(f"Worker {worker} claiming {claim_size} images at a time")
+
+        def on_completed(file_paths: list[Path]) -> None:
+            self._record_manifest(file_paths)
+            work_queue.complete(worker, file_paths)
+
+        def on_failed(file_paths: list[Path]) -> None:
+            for file_path in file_paths:
+                work_queue.fail(worker, file_path, "Processing failed; see worker log")
+
+        tracker = ProgressTracker(
+            self._create_progress_bar(None, show_progress),
+            on_completed,
+            batch_size=claim_size,
+            on_failed=on_failed,
+        )
+
+        self.ollama_client.warm_up()
+        with work_queue.keep_alive(worker), self._batched_writes():
+            try:
+                results = self._iter_results(
+                    tracker.track(self._claim_images(work_queue, worker, claim_size)),
+                    use_pipeline,
+                )
+                for file_path, success in results:
+                    tracker.record(file_path, success)
+            finally:
+                tracker.close()
+                released = work_queue.release(worker)
+                if released:
+                    logger.info(
+                        f"Worker {worker} released {released} unfinished images"
+                    )
+
+        scan_stats = {"renamed": 0, "unchanged": 0, "deleted": 0, "described": 0}
+        return self._summarize(
+            tracker.discovered,
+            tracker.processed,
+            tracker.failed,
+            scan_stats,
+            start_time,
+        )
+
+    async def _aprocess_single_image(
+        self,
+        client: AsyncOllamaClient,
+        file_path: Path,
+        limits: dict[str, asyncio.Semaphore],
+    ) -> bool:
+        """
+        Process a single image with async inference.
+
+        Blocking stages run in worker threads, bounded by the configured
+        stage worker counts.
+
+        Args:
+            client: Async Ollama client
+            file_path: Path to image file
+            limits: Semaphores bounding concurrent blocking stages
+
+        Returns:
+            True if processing successful, False otherwise
+        """
+        try:
+            async with limits["validate"]:
+                task = await asyncio.to_thread(
+                    self._validate_stage, ImageTask(file_path)
+                )
+            if task is None:
+                return True
+
+            usage = {}
+            start = time.perf_counter()
+            request = self._structured_request(task, client)
+            if request is None:
+                task.description = await client.agenerate_description(
+                    file_path, usage=usage
+                )
+            else:
+                schema, prompt = request
+                self._apply_fields(
+                    task,
+                    await client.agenerate_structured(file_path, schema, prompt, usage),
+                )
+            task.details = await asyncio.to_thread(
+                self._inference_details, file_path, client, start, usage
+            )
+
+            async with limits["persist"]:
+                await asyncio.to_thread(self._persist_stage, task)
+            async with limits["write_xmp"]:
+                await asyncio.to_thread(self._write_xmp_stage, task)
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to process {file_path.name}: {e}")
+            return False
+
+    async def aprocess_directory(
+        self,
+        directory: Path,
+        sanitize_names: bool = True,
+        show_progress: bool = True,
+        client: AsyncOllamaClient | None = None,
+        incremental: bool | None = None,
+        stream: bool | None = None,
+        job_store: JobStore | None = None,
+        job_id: str | None = None,
+    ) -> dict:
+        """
+        Process all images in a directory using asyncio.
+
+        Up to the client's max_in_flight requests are sent to Ollama at once
+        while validation, database and XMP work runs in threads.
+
+        Args:
+            directory: Directory containing images
+            sanitize_names: Whether to sanitize filenames first
+            show_progress: Whether to show progress bar
+            client: Async Ollama client (default: built from the sync client)
+            incremental: Whether to process only images that are new or
+                changed since the last run (default from config)
+            stream: Whether to start processing while discovery is still
+                running instead of listing all images first (default from config)
+            job_store: Store in which to record the progress of this run
+            job_id: Job to record the run in; a job that ran before is
+                resumed, retrying its unfinished and failed images
+
+        Returns:
+            Dictionary with processing statistics
+        """
+        with self._job_status(job_store, job_id):
+            return await self._aprocess_directory(
+                directory,
+                sanitize_names,
+                show_progress,
+                client,
+                self.incremental if incremental is None else incremental,
+                self.stream if stream is None else stream,
+                job_store,
+                job_id,
+            )
+
+    async def _aprocess_directory(
+        self,
+        directory: Path,
+        sanitize_names: bool,
+        show_progress: bool,
+        client: AsyncOllamaClient | None,
+        use_incremental: bool,
+        use_stream: bool,
+        job_store: JobStore | None,
+        job_id: str | None,
+    ) -> dict:
+        """Run aprocess_directory with resolved settings."""
+        start_time = time.time()
+
+        image_files, scan_stats = await asyncio.to_thread(
+            self._prepare_directory,
+            directory,
+            sanitize_names,
+            use_incremental,
+            use_stream,
+            job_store,
+            job_id,
+        )
+
+        if not use_stream and not image_files:
+            logger.warning("No image files found to process")
+            return self._summarize(0, 0, 0, scan_stats, time.time())
+
+        owns_client = client is None
+        if client is None:
+            client = AsyncOllamaClient(
+                endpoints=self.ollama_client.endpoints,
+                model=self.ollama_client.model,
+                timeout=self.ollama_client.timeout,
+            )
+
+        logger.info(
+            f"Using async inference with {client.max_in_flight} requests in flight"
+        )
+        await asyncio.to_thread(client.warm_up)
+
+        workers = {"validate": 1, "persist": 1, "write_xmp": 1, **self.stage_workers}
+        limits = {
+            name: asyncio.Semaphore(max(1, int(workers[name])))
+            for name in ("validate", "persist", "write_xmp")
+        }
+
+        tracker = self._create_tracker(
+            None if use_stream else len(image_files),
+            show_progress,
+            job_store,
+            job_id,
+        )
+
+        async def handle(file_path: Path) -> None:
+            success = await self._aprocess_single_image(client, file_path, limits)
+            tracker.record(file_path, success)
+
+        try:
+            with self._batched_writes():
+                try:
+                    # Twice as many workers as requests so disk work overlaps
+                    # inference
+                    await consume_concurrently(
+                        tracker.track(image_files),
+                        handle,
+                        workers=client.max_in_flight * 2,
+                        queue_size=self.queue_size,
+                    )
+                finally:
+                    tracker.close()
+        finally:
+            if owns_client:
+                await client.aclose()
+
+        if tracker.discovered == 0:
+            logger.warning("No image files found to process")
+
+        return self._summarize(
+            tracker.discovered,
+            tracker.processed,
+            tracker.failed,
+            scan_stats,
+            start_time,
+            client,
+        )
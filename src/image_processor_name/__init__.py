@@ -15,6 +15,7 @@ PACKAGE_ROOT = Path(__file__).parent
 PROJECT_ROOT = PACKAGE_ROOT.parent.parent
 CONFIG_DIR = PROJECT_ROOT / "config"
 LOGS_DIR = PROJECT_ROOT / "logs"
+DATA_DIR = PROJECT_ROOT / "data"
 
 # Ensure logs directory exists
 LOGS_DIR.mkdir(exist_ok=True)
@@ -0,0 +1,224 @@
+"""
+Asyncio Ollama API client for concurrent filename generation.
+"""
+
+import asyncio
+import contextlib
+import pathlib
+import time
+import typing
+
+import image_processor.encoding
+import image_processor.structured
+import image_processor_name.config_manager
+import image_processor_name.log_manager
+import image_processor_name.ollama_client
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+logger = image_processor_name.log_manager.get_logger(__name__)
+
+
+class AsyncOllamaClient(image_processor_name.ollama_client.OllamaClient):
+    """
+    Asyncio counterpart of OllamaClient for filename generation.
+
+    A semaphore bounds the number of requests in flight and retries back off
+    with asyncio.sleep, so other images keep flowing while one is waiting.
+    """
+
+    def __init__(
+        self,
+        endpoint: str | None = None,
+        model: str | None = None,
+        timeout: int | None = None,
+        max_in_flight: int | None = None,
+        endpoints: list[str] | None = None,
+    ) -> None:
+        """
+        Initialize async Ollama client.
+
+        Args:
+            endpoint: Ollama API endpoint URL
+            model: Model name to use
+            timeout: Request timeout in seconds
+            max_in_flight: Maximum number of concurrent requests to Ollama
+            endpoints: Endpoint URLs to balance requests over (default from
+                ollama.endpoints; ignored if endpoint is given)
+
+        Raises:
+            ImportError: If httpx is not installed
+        """
+        if httpx is None:
+            raise ImportError(
+                "Async mode requires httpx. Install it with: uv sync --extra async"
+            )
+
+        self.max_in_flight = max_in_flight or image_processor_name.config_manager.config.get("ollama.max_in_flight", 4)
+        super().__init__(endpoint, model, timeout, pool_size=self.max_in_flight, endpoints=endpoints)
+
+        self._client: typing.Any = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+    @property
+    def client(self) -> typing.Any:
+        """Lazily created httpx.AsyncClient sized to max_in_flight."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_in_flight,
+                    max_keepalive_connections=self.max_in_flight,
+                ),
+                headers={"Content-Type": "application/json"},
+            )
+        return self._client
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        """Semaphore bounding the number of requests in flight."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self._semaphore
+
+    def is_overloaded(self, error: Exception) -> bool:
+        """Whether a request error means Ollama is overloaded."""
+        return isinstance(error, httpx.TimeoutException) or super().is_overloaded(error)
+
+    @contextlib.asynccontextmanager
+    async def arequest_slot(self) -> typing.AsyncIterator[None]:
+        """Wait without blocking the loop until the limit admits a request."""
+        if self.limiter is None:
+            yield
+            return
+
+        async with self.limiter.aslot():
+            yield
+
+    async def agenerate_filename(self, image_path: pathlib.Path, prompt: str | None = None) -> str:
+        """
+        Generate filename description for image without blocking the loop.
+
+        Args:
+            image_path: Path to image file
+            prompt: Custom prompt for description (optional)
+
+        Returns:
+            Generated description text for filename
+
+        Raises:
+            OllamaConnectionError: If connection to Ollama fails
+            OllamaTimeoutError: If request times out
+            OllamaResponseError: If response is invalid
+            ImageCorrupted: If image cannot be processed
+        """
+        start_time = time.time()
+
+        # Use configured prompt if none provided
+        if prompt is None:
+            prompt = self.default_prompt()
+
+        # Callers bound how many images are open; the semaphore only bounds
+        # requests, so a source waiting out a retry does not hold a permit
+        source = await asyncio.to_thread(self.open_image, image_path)
+        try:
+            # Serialize the payload once; every attempt streams the same body
+            body = self.build_body(source, prompt, self.response_format)
+
+            async def attempt(index: int) -> str:
+                # Back off outside the semaphore so other requests can proceed
+                async with self.semaphore:
+                    logger.info(f"Generating filename for: {image_path.name} (attempt {index + 1})")
+                    return await self._apost_body(body)
+
+            for ask in range(self.schema_attempts if self.structured else 1):
+                content = await self.retry_policy.acall(
+                    attempt, self.is_transient, breaker=self.breaker, on_retry=self._log_retry
+                )
+                try:
+                    description = self.parse_filename(content)
+                    break
+                except image_processor.structured.SchemaError as e:
+                    self._log_schema_failure(image_path, ask, e)
+                    error = e
+            else:
+                raise image_processor_name.ollama_client.OllamaResponseError(
+                    f"No valid structured response after {self.schema_attempts} attempts: {error}"
+                ) from error
+        finally:
+            source.close()
+
+        elapsed_time = time.time() - start_time
+        logger.info(
+            f"Generated filename description for {image_path.name} "
+            f"({len(description)} chars, {elapsed_time:.1f}s)"
+        )
+
+        return description
+
+    async def _apost_body(self, body: image_processor.encoding.JsonBody) -> str:
+        """
+        Send one generate request without blocking the loop.
+
+        Args:
+            body: Request body built with build_body
+
+        Returns:
+            Generated description text
+
+        Raises:
+            OllamaConnectionError: If connection to Ollama fails
+            OllamaTimeoutError: If request times out
+            OllamaResponseError: If response is invalid
+        """
+        try:
+            async with self.arequest_slot():
+                with self.select_endpoint() as url:
+                    if not self.streaming:
+                        response = await self.client.post(url, content=aiter(body), headers=body.headers)
+                        return self.parse_response(response)
+
+                    # Leaving the block before the end closes the stream
+                    async with self.client.stream("POST", url, content=aiter(body), headers=body.headers) as response:
+                        return await self._aread_stream(response)
+
+        except httpx.TimeoutException as e:
+            raise image_processor_name.ollama_client.OllamaTimeoutError(
+                f"Request to Ollama timed out after {self.timeout}s"
+            ) from e
+        except httpx.ConnectError as e:
+            raise image_processor_name.ollama_client.OllamaConnectionError(
+                f"Failed to connect to Ollama at {self.endpoint}: {e}"
+            ) from e
+        except httpx.HTTPError as e:
+            raise image_processor_name.ollama_client.OllamaConnectionError(f"Request to Ollama failed: {e}") from e
+
+    async def _aread_stream(self, response: typing.Any) -> str:
+        """Read a streamed httpx response until the filename is complete."""
+        if response.status_code != 200:
+            await response.aread()
+        self.check_status(response)
+
+        stream = image_processor_name.ollama_client.FilenameStream(self.stream_max_words)
+        async for line in response.aiter_lines():
+            if stream.feed(line):
+                break
+        return stream.result()
+
+    async def aclose(self) -> None:
+        """Close async and pooled synchronous connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self.close()
+
+    async def __aenter__(self) -> "AsyncOllamaClient":
+        """Return client for use as an async context manager."""
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Close connections on context exit."""
+        await self.aclose()
@@ -6,9 +6,11 @@ import gc
 import pathlib
 import shutil
 import time
+import typing
 
 import PIL.Image
 
+import image_processor.walker
 import image_processor_name.config_manager
 import image_processor_name.log_manager
 
@@ -53,6 +55,9 @@ class FileOperations:
         self.move_delay = image_processor_name.config_manager.config.get("file_operations.move_delay_seconds", 0.5)
         self.backup_originals = image_processor_name.config_manager.config.get("file_operations.backup_originals", False)
         self.confirm_overwrites = image_processor_name.config_manager.config.get("file_operations.confirm_overwrites", True)
+        self.include_patterns = image_processor_name.config_manager.config.get("images.include", []) or []
+        self.exclude_patterns = image_processor_name.config_manager.config.get("images.exclude", []) or []
+        self.symlink_policy = image_processor_name.config_manager.config.get("images.symlinks", "files")
 
     def is_supported_image(self, file_path: pathlib.Path) -> bool:
         """
@@ -218,13 +223,7 @@ class FileOperations:
         if not directory.is_dir():
             raise FileOperationError(f"Path is not a directory: {directory}")
 
-        image_files = []
-
-        pattern_func = directory.rglob if recursive else directory.glob
-
-        for file_path in pattern_func("*"):
-            if file_path.is_file() and self.is_supported_image(file_path):
-                image_files.append(file_path)
+        image_files = list(self.iter_image_files(directory, recursive))
 
         logger.info(
             f"Found {len(image_files)} image files in: {directory} "
@@ -232,6 +231,28 @@ class FileOperations:
         )
         return image_files
 
+    def iter_image_files(self, directory: pathlib.Path, recursive: bool = False) -> typing.Iterator[pathlib.Path]:
+        """
+        Lazily yield supported image files in directory.
+
+        Args:
+            directory: Directory to search
+            recursive: Whether to search recursively
+
+        Yields:
+            Image file paths
+        """
+        for entry in image_processor.walker.walk_files(
+            directory,
+            extensions=self.supported_extensions,
+            include=self.include_patterns,
+            exclude=self.exclude_patterns,
+            recursive=recursive,
+            symlinks=self.symlink_policy,
+            onerror=lambda e: logger.warning(f"Cannot scan {e.filename}: {e}"),
+        ):
+            yield pathlib.Path(entry.path)
+
     def get_unique_filename(self, base_path: pathlib.Path, suffix: str = "") -> pathlib.Path:
         """
         Generate a unique filename by appending a counter if necessary.
@@ -3,9 +3,11 @@ Main entry point for image processor name tool CLI.
 """
 
 import argparse
+import asyncio
 import pathlib
 import sys
 
+import image_processor.jobs
 import image_processor_name.config_manager
 import image_processor_name.file_operations
 import image_processor_name.log_manager
@@ -40,6 +42,10 @@ Examples:
   %(prog)s rename image.jpg              # Rename single image file
   %(prog)s --check-connection            # Check Ollama connection
   %(prog)s --dry-run rename /path/images # Preview what would be renamed
+  %(prog)s rename --async /path/images   # Rename with concurrent requests
+  %(prog)s rename -r --stream /path/images # Start renaming while still scanning
+  %(prog)s rename --job /path/images     # Record the run so it can be resumed
+  %(prog)s rename --resume 3f2a9c1b7d4e    # Continue an interrupted run
 
 Modes:
   rename    Process images once and exit
@@ -87,7 +93,7 @@ Modes:
     rename_parser = subparsers.add_parser(
         "rename", help="Rename images using AI-generated descriptions"
     )
-    rename_parser.add_argument("path", help="Directory or file to process")
+    rename_parser.add_argument("path", nargs="?", help="Directory or file to process (not needed with --resume)")
     rename_parser.add_argument(
         "-r",
         "--recursive",
@@ -97,12 +103,48 @@ Modes:
     rename_parser.add_argument(
         "--prompt", help="Custom prompt for AI description generation"
     )
+    rename_parser.add_argument(
+        "--structured",
+        action="store_true",
+        help="Request JSON constrained to a schema and name files after its title",
+    )
+    rename_parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Use asyncio inference with ollama.max_in_flight concurrent requests",
+    )
+    rename_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Start renaming as soon as images are found instead of listing them first",
+    )
+    rename_parser.add_argument(
+        "--job",
+        action="store_true",
+        help="Record a directory run as a job that --resume can continue (default from jobs.enabled)",
+    )
+    rename_parser.add_argument(
+        "--resume",
+        metavar="JOB_ID",
+        help="Resume an interrupted directory run, retrying its unfinished and failed images",
+    )
 
     return parser
 
 
 
 
+def open_job_store() -> image_processor.jobs.JobStore:
+    """Open the job store configured by jobs.database, relative to the data directory."""
+    config = image_processor_name.config_manager.config
+    return image_processor.jobs.JobStore(
+        image_processor_name.DATA_DIR / config.get("jobs.database", "image_processor_name_jobs.db"),
+        journal_mode=config.get("jobs.journal_mode", "wal"),
+        busy_timeout=config.get("jobs.busy_timeout", 5.0),
+    )
+
+
 def handle_rename_command(args: argparse.Namespace) -> int:
     """
     Handle the rename command.
@@ -114,8 +156,28 @@ def handle_rename_command(args: argparse.Namespace) -> int:
         Exit code
     """
     logger = image_processor_name.log_manager.get_logger(__name__)
+    ollama_client = None
+    job_store = None
+    job_id = None
+    recursive = args.recursive
 
     try:
+        if args.resume and args.dry_run:
+            print("Error: --dry-run cannot be combined with --resume")
+            return 1
+        if args.resume:
+            job_store = open_job_store()
+            job = job_store.get_job(args.resume)
+            if job["kind"] != "rename":
+                print(f"Error: Job {args.resume} is not an image-processor-name job")
+                return 1
+            job_id = job["id"]
+            args.path = job["directory"]
+            recursive = job["options"].get("recursive", False)
+        elif not args.path:
+            print("Error: A path is required unless resuming a job with --resume")
+            return 1
+
         target_path = pathlib.Path(args.path).resolve()
 
         if not target_path.exists():
@@ -124,6 +186,8 @@ def handle_rename_command(args: argparse.Namespace) -> int:
 
         # Initialize components
         ollama_client = image_processor_name.ollama_client.OllamaClient()
+        if args.structured:
+            ollama_client.structured = True
         file_ops = image_processor_name.file_operations.FileOperations()
         renamer = image_processor_name.renamer.ImageRenamer(ollama_client, file_ops)
 
@@ -144,12 +208,36 @@ def handle_rename_command(args: argparse.Namespace) -> int:
             return 0 if success else 1
 
         if target_path.is_dir():
-            results = renamer.rename_directory(
-                target_path,
-                recursive=args.recursive,
-                dry_run=args.dry_run,
-                show_progress=not args.quiet,
-            )
+            # Record directory runs as jobs on request so they can be resumed
+            if job_id is None and not args.dry_run and (args.job or image_processor_name.config_manager.config.get("jobs.enabled", False)):
+                job_store = open_job_store()
+                job_store.prune(image_processor_name.config_manager.config.get("jobs.keep_completed", 20))
+                job_id = job_store.create_job("rename", str(target_path), {"recursive": recursive})
+            if job_id:
+                print(f"Job: {job_id}")
+
+            if args.use_async:
+                results = asyncio.run(
+                    renamer.arename_directory(
+                        target_path,
+                        recursive=recursive,
+                        dry_run=args.dry_run,
+                        show_progress=not args.quiet,
+                        stream=True if args.stream else None,
+                        job_store=job_store,
+                        job_id=job_id,
+                    )
+                )
+            else:
+                results = renamer.rename_directory(
+                    target_path,
+                    recursive=recursive,
+                    dry_run=args.dry_run,
+                    show_progress=not args.quiet,
+                    stream=True if args.stream else None,
+                    job_store=job_store,
+                    job_id=job_id,
+                )
 
             # Print summary
             action = "analyzed" if args.dry_run else "renamed"
@@ -159,11 +247,23 @@ def handle_rename_command(args: argparse.Namespace) -> int:
             print(f"  Failed: {results['failed']}")
             print(f"  Skipped: {results['skipped']}")
             print(f"  Processing time: {results['processing_time']:.1f} seconds")
+            if "concurrency" in results:
+                concurrency = results["concurrency"]
+                print(
+                    f"  Concurrency limit: {concurrency['limit']} "
+                    f"(range {concurrency['min_limit']}-{concurrency['max_limit']}, "
+                    f"{concurrency['drops']} overloads)"
+                )
+            for endpoint, latency in results.get("warmup", {}).items():
+                load_time = "failed" if latency is None else f"{latency:.1f}s"
+                print(f"  Model load at {endpoint}: {load_time}")
 
             if results["failed"] > 0:
                 print(
                     f"\nWarning: {results['failed']} files failed processing. Check logs for details."
                 )
+                if job_id:
+                    print(f"Retry them with: rename --resume {job_id}")
                 return 1
 
             success_msg = (
@@ -177,11 +277,22 @@ def handle_rename_command(args: argparse.Namespace) -> int:
         print(f"Error: Path is neither a file nor directory: {target_path}")
         return 1
 
+    except KeyboardInterrupt:
+        if job_id:
+            print(f"\nContinue with: rename --resume {job_id}")
+        raise
+
     except Exception as e:
         logger.error(f"Rename command failed: {e}")
         print(f"Error: {e}")
         return 1
 
+    finally:
+        if ollama_client:
+            ollama_client.close()
+        if job_store:
+            job_store.close()
+
 
 def main() -> int:
     """
@@ -207,9 +318,13 @@ def main() -> int:
         # Handle global options that don't need full setup
         if args.check_connection:
             ollama_client = image_processor_name.ollama_client.OllamaClient()
-            return 0 if ollama_client.check_connection_with_diagnostics() else 1
+            try:
+                return 0 if ollama_client.check_connection_with_diagnostics() else 1
+            finally:
+                ollama_client.close()
 
         if args.list_models:
+            ollama_client = None
             try:
                 ollama_client = image_processor_name.ollama_client.OllamaClient()
                 models = ollama_client.list_models()
@@ -221,6 +336,9 @@ def main() -> int:
                 logger.error(f"Failed to list models: {e}")
                 print(f"Error listing models: {e}")
                 return 1
+            finally:
+                if ollama_client:
+                    ollama_client.close()
 
         # Handle commands
         if args.command == "rename":
@@ -2,15 +2,21 @@
 Ollama API client for image filename generation.
 """
 
-import base64
+import contextlib
 import json
 import pathlib
 import time
 import typing
 
 import requests
+import requests.adapters
 import requests.exceptions
 
+import image_processor.balancer
+import image_processor.encoding
+import image_processor.limiter
+import image_processor.retry
+import image_processor.structured
 import image_processor_name.config_manager
 import image_processor_name.log_manager
 
@@ -23,6 +29,11 @@ class OllamaConnectionError(Exception):
     pass
 
 
+class OllamaNotFoundError(OllamaConnectionError):
+    """Raised when the Ollama API or model is not found at the endpoint."""
+    pass
+
+
 class OllamaTimeoutError(Exception):
     """Raised when Ollama request times out."""
     pass
@@ -38,6 +49,79 @@ class ImageCorrupted(Exception):
     pass
 
 
+class FilenameStream:
+    """
+    Collects streamed generate chunks until a filename is complete.
+
+    A filename needs only a few words, while chatty models go on for
+    hundreds of tokens. Reading stops at the first line of the answer, or
+    once more than max_words words have arrived; lines ending in a colon,
+    such as "Here is a description:", are skipped as preambles.
+    """
+
+    def __init__(self, max_words: int = 10) -> None:
+        """
+        Initialize stream.
+
+        Args:
+            max_words: Number of words after which reading stops
+        """
+        self.max_words = max_words
+        self.text = ""
+
+    @staticmethod
+    def _usable(line: str) -> bool:
+        """Whether a line holds an answer rather than nothing or a preamble."""
+        return bool(line.strip()) and not line.rstrip().endswith(":")
+
+    def feed(self, line: str | bytes) -> bool:
+        """
+        Add one NDJSON line of the response.
+
+        Args:
+            line: Line read from the streamed response
+
+        Returns:
+            True once enough text has arrived to stop reading
+
+        Raises:
+            OllamaResponseError: If the line is not a valid generate chunk
+        """
+        if not line.strip():
+            return False
+        try:
+            chunk = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise OllamaResponseError(f"Invalid JSON chunk in stream: {e}") from e
+        if "error" in chunk:
+            raise OllamaResponseError(f"Ollama error in stream: {chunk['error']}")
+        if "response" not in chunk:
+            raise OllamaResponseError(f"Missing 'response' field in Ollama stream chunk: {chunk}")
+
+        self.text += chunk["response"]
+        if chunk.get("done"):
+            return True
+
+        *complete, partial = self.text.split("\n")
+        return any(self._usable(line) for line in complete) or len(partial.split()) > self.max_words
+
+    def result(self) -> str:
+        """
+        Get the filename description collected so far.
+
+        Returns:
+            First usable line, cut to max_words words
+
+        Raises:
+            OllamaResponseError: If no usable line was received, e.g. the
+                stream ended after a preamble
+        """
+        line = next((line for line in self.text.split("\n") if self._usable(line)), None)
+        if line is None:
+            raise OllamaResponseError(f"No usable description received from Ollama: {self.text.strip()!r}")
+        return " ".join(line.split()[: self.max_words])
+
+
 class OllamaClient:
     """Client for interacting with Ollama API for filename generation."""
 
@@ -46,6 +130,9 @@ class OllamaClient:
         endpoint: str | None = None,
         model: str | None = None,
         timeout: int | None = None,
+        pool_size: int | None = None,
+        session: requests.Session | None = None,
+        endpoints: list[str] | None = None,
     ) -> None:
         """
         Initialize Ollama client.
@@ -54,41 +141,415 @@ class OllamaClient:
             endpoint: Ollama API endpoint URL
             model: Model name to use
             timeout: Request timeout in seconds
+            pool_size: Maximum number of keep-alive connections to Ollama
+            session: Existing HTTP session to share (owned by the caller)
+            endpoints: Endpoint URLs to balance requests over (default from
+                ollama.endpoints; ignored if endpoint is given)
         """
-        self.endpoint = endpoint or image_processor_name.config_manager.config.get(
-            "ollama.endpoint", "http://localhost:11434/api/generate"
+        if endpoint:
+            endpoints = [endpoint]
+        self.endpoints = (
+            endpoints
+            or image_processor_name.config_manager.config.get("ollama.endpoints", [])
+            or [image_processor_name.config_manager.config.get("ollama.endpoint", "http://localhost:11434/api/generate")]
         )
+        self.endpoint = self.endpoints[0]
         self.model = model or image_processor_name.config_manager.config.get("ollama.model", "llava-llama3:latest")
         self.timeout = timeout or image_processor_name.config_manager.config.get("ollama.timeout", 30)
         self.retry_attempts = image_processor_name.config_manager.config.get("ollama.retry_attempts", 3)
         self.retry_delay = image_processor_name.config_manager.config.get("ollama.retry_delay", 1.0)
+        self.retry_max_delay = image_processor_name.config_manager.config.get("ollama.retry_max_delay", 30.0)
+        self.pool_size = pool_size or image_processor_name.config_manager.config.get("ollama.pool_size", 10)
+
+        # Keep the model loaded between requests and load it before a batch
+        self.keep_alive = image_processor_name.config_manager.config.get("ollama.keep_alive", "30m")
+        self.warm_up_enabled = image_processor_name.config_manager.config.get("ollama.warm_up.enabled", True)
+        self.warm_up_timeout = image_processor_name.config_manager.config.get("ollama.warm_up.timeout", 300)
+        self.warmup_latency: dict[str, float | None] = {}
+
+        # Structured mode asks for JSON and names files after its title
+        self.structured = image_processor_name.config_manager.config.get("filename.structured.enabled", False)
+        self.structured_prompt = image_processor_name.config_manager.config.get(
+            "filename.structured.prompt",
+            "Describe this image. Respond in JSON with a title of 4-5 words, a description, "
+            "a list of tags, and any text visible in the image (empty if none).",
+        )
+        self.schema_attempts = image_processor_name.config_manager.config.get("filename.structured.max_attempts", 3)
+
+        # Stream tokens and hang up once the filename is complete
+        self.stream_responses = image_processor_name.config_manager.config.get("filename.streaming.enabled", True)
+        self.stream_max_words = image_processor_name.config_manager.config.get("filename.streaming.max_words", 10)
+        self.num_predict = image_processor_name.config_manager.config.get("filename.num_predict", 32)
+
+        # Downscale images before upload; the model resizes them anyway
+        self.preprocess = image_processor_name.config_manager.config.get("images.preprocess.enabled", True)
+        self.max_edge = image_processor_name.config_manager.config.get("images.preprocess.max_edge", 1024)
+        self.jpeg_quality = image_processor_name.config_manager.config.get("images.preprocess.jpeg_quality", 85)
+
+        self._owns_session = session is None
+        self.session = session or self.create_session(self.pool_size)
+
+        # Several endpoints are balanced by requests in flight
+        self.balancer = None
+        if len(self.endpoints) > 1:
+            self.balancer = image_processor.balancer.LoadBalancer(
+                self.endpoints,
+                probe=self.probe_endpoint,
+                max_failures=image_processor_name.config_manager.config.get("ollama.eject_after_failures", 3),
+                probe_interval=image_processor_name.config_manager.config.get("ollama.probe_interval", 10.0),
+                is_failure=lambda e: not isinstance(e, (OllamaResponseError, ImageCorrupted)),
+            )
 
-        logger.info(f"Initialized Ollama client: {self.endpoint} (model: {self.model})")
+        # Requests in flight adapt to the latency and timeouts observed
+        self.limiter = None
+        if image_processor_name.config_manager.config.get("ollama.adaptive_concurrency.enabled", True):
+            self.limiter = image_processor.limiter.AdaptiveLimiter(
+                max_limit=image_processor_name.config_manager.config.get("ollama.adaptive_concurrency.max_limit", None)
+                or self.pool_size,
+                min_limit=image_processor_name.config_manager.config.get("ollama.adaptive_concurrency.min_limit", 1),
+                initial_limit=image_processor_name.config_manager.config.get(
+                    "ollama.adaptive_concurrency.initial_limit", None
+                ),
+                backoff=image_processor_name.config_manager.config.get("ollama.adaptive_concurrency.backoff", 0.75),
+                latency_tolerance=image_processor_name.config_manager.config.get(
+                    "ollama.adaptive_concurrency.latency_tolerance", 3.0
+                ),
+                is_drop=self.is_overloaded,
+                baseline_window=image_processor_name.config_manager.config.get(
+                    "ollama.adaptive_concurrency.baseline_window", 20
+                ),
+            )
+
+        # A high failure rate pauses every request until a trial one succeeds
+        self.breaker = None
+        if image_processor_name.config_manager.config.get("ollama.circuit_breaker.enabled", True):
+            self.breaker = image_processor.retry.CircuitBreaker(
+                failure_rate=image_processor_name.config_manager.config.get("ollama.circuit_breaker.failure_rate", 0.5),
+                window=image_processor_name.config_manager.config.get("ollama.circuit_breaker.window", 20),
+                min_requests=image_processor_name.config_manager.config.get("ollama.circuit_breaker.min_requests", 10),
+                open_seconds=image_processor_name.config_manager.config.get("ollama.circuit_breaker.open_seconds", 30.0),
+                on_state_change=self._log_breaker_state,
+            )
+
+        logger.info(f"Initialized Ollama client: {', '.join(self.endpoints)} (model: {self.model})")
+
+    @staticmethod
+    def create_session(pool_size: int) -> requests.Session:
+        """
+        Create an HTTP session with a keep-alive connection pool.
+
+        Args:
+            pool_size: Maximum number of pooled connections per host
+
+        Returns:
+            Configured requests session
+        """
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({"Content-Type": "application/json"})
+        return session
+
+    def close(self) -> None:
+        """Close pooled connections if the session is owned by this client."""
+        if self.balancer is not None:
+            self.balancer.close()
+            for backend in self.balancer.stats():
+                logger.info(f"Ollama backend stats: {backend}")
+        if self.limiter is not None:
+            logger.info(f"Ollama concurrency stats: {self.limiter.stats()}")
+        if self.breaker is not None:
+            logger.info(f"Ollama circuit breaker stats: {self.breaker.stats()}")
+        if self._owns_session:
+            self.session.close()
+            logger.debug("Closed Ollama HTTP session")
+
+    def __enter__(self) -> "OllamaClient":
+        """Return client for use as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close pooled connections on context exit."""
+        self.close()
+
+    def is_overloaded(self, error: Exception) -> bool:
+        """Whether a request error means Ollama is overloaded."""
+        return isinstance(error, (requests.exceptions.Timeout, OllamaTimeoutError))
+
+    def is_transient(self, error: Exception) -> bool:
+        """Whether a request error is worth retrying and blames the server."""
+        # A wrong endpoint or model is a configuration error; fail fast
+        if isinstance(error, OllamaNotFoundError):
+            return False
+        return isinstance(error, (OllamaConnectionError, OllamaTimeoutError))
+
+    @property
+    def retry_policy(self) -> image_processor.retry.RetryPolicy:
+        """Backoff for transient failures, built from the current settings."""
+        return image_processor.retry.RetryPolicy(
+            attempts=self.retry_attempts, base_delay=self.retry_delay, max_delay=self.retry_max_delay
+        )
+
+    def _log_retry(self, attempt: int, error: Exception, delay: float) -> None:
+        """Log a failed attempt before it is retried."""
+        logger.warning(f"Attempt {attempt + 1} failed: {error}. Retrying in {delay:.1f}s...")
+
+    def _log_breaker_state(self, old_state: str, new_state: str) -> None:
+        """Log circuit breaker transitions."""
+        if new_state == "open":
+            logger.warning(
+                f"Ollama is failing; pausing requests for {self.breaker.open_seconds}s (circuit {old_state} -> open)"
+            )
+        else:
+            logger.info(f"Ollama circuit {old_state} -> {new_state}")
+
+    @contextlib.contextmanager
+    def request_slot(self) -> typing.Iterator[None]:
+        """
+        Wait until the adaptive concurrency limit admits another request.
+
+        The request's latency, or its timeout, adjusts the limit.
+        """
+        if self.limiter is None:
+            yield
+            return
+
+        with self.limiter.slot():
+            yield
+
+    @contextlib.contextmanager
+    def select_endpoint(self) -> typing.Iterator[str]:
+        """
+        Choose the endpoint for one request.
+
+        With several endpoints, the least busy healthy one is used and the
+        request's latency or failure is recorded against it, so a retry
+        usually goes to another server.
+
+        Yields:
+            Endpoint URL to send the request to
+        """
+        if self.balancer is None:
+            yield self.endpoint
+            return
+
+        with self.balancer.request() as backend:
+            yield backend.endpoint
 
     def encode_image(self, image_path: pathlib.Path) -> str:
         """
         Encode image file to base64 string.
 
+        When preprocessing is enabled the image is downscaled to the
+        configured max edge and re-encoded as JPEG first.
+
         Args:
             image_path: Path to image file
 
         Returns:
             Base64 encoded image string
 
+        Raises:
+            ImageCorrupted: If image file cannot be read
+        """
+        with self.open_image(image_path) as source:
+            encoded_string = b"".join(source.iter_base64()).decode("utf-8")
+            logger.debug(
+                f"Encoded image: {image_path} ({len(encoded_string)} chars)"
+            )
+            return encoded_string
+
+    def open_image(self, image_path: pathlib.Path) -> image_processor.encoding.ImageSource:
+        """
+        Open image for streaming upload.
+
+        Images that need preprocessing are downscaled now; others are
+        memory-mapped and encoded chunk by chunk as the request is sent.
+
+        Args:
+            image_path: Path to image file
+
+        Returns:
+            Image source to stream into a request body; close it when done
+
         Raises:
             ImageCorrupted: If image file cannot be read
         """
         try:
-            with image_path.open("rb") as image_file:
-                image_data = image_file.read()
-                encoded_string = base64.b64encode(image_data).decode("utf-8")
-                logger.debug(
-                    f"Encoded image: {image_path} ({len(encoded_string)} chars)"
-                )
-                return encoded_string
+            return image_processor.encoding.ImageSource(
+                image_path, self.preprocess, self.max_edge, self.jpeg_quality
+            )
         except Exception as e:
             raise ImageCorrupted(f"Failed to encode image {image_path}: {e}") from e
 
+    def build_body(
+        self,
+        source: image_processor.encoding.ImageSource,
+        prompt: str,
+        response_format: dict | None = None,
+    ) -> image_processor.encoding.JsonBody:
+        """
+        Build a streaming request body for an opened image.
+
+        Args:
+            source: Image opened with open_image
+            prompt: Prompt sent with the image
+            response_format: JSON schema to constrain the response to (optional)
+
+        Returns:
+            Request body streaming the base64 image into the payload
+        """
+        return image_processor.encoding.JsonBody(
+            self.build_payload(image_processor.encoding.IMAGE_PLACEHOLDER, prompt, response_format), source
+        )
+
+    def build_payload(self, encoded_image: str, prompt: str, response_format: dict | None = None) -> dict:
+        """
+        Build generate API request payload for an encoded image.
+
+        Args:
+            encoded_image: Base64 encoded image
+            prompt: Prompt sent with the image
+            response_format: JSON schema to constrain the response to (optional)
+
+        Returns:
+            Request payload dictionary
+        """
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": self.streaming and response_format is None,
+            "images": [encoded_image],
+        }
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        if response_format is not None:
+            payload["format"] = response_format
+        elif self.num_predict is not None:
+            # A JSON object needs its closing brace; cap only plain answers
+            payload["options"] = {"num_predict": self.num_predict}
+        return payload
+
+    @property
+    def streaming(self) -> bool:
+        """Whether filename requests stream tokens and stop early."""
+        return self.stream_responses and not self.structured
+
+    @property
+    def response_format(self) -> dict | None:
+        """JSON schema filename requests are constrained to, if structured."""
+        return image_processor.structured.DESCRIPTION_SCHEMA if self.structured else None
+
+    def parse_filename(self, content: str) -> str:
+        """
+        Extract the filename description from generated text.
+
+        Args:
+            content: Text returned by the model
+
+        Returns:
+            The text itself, or in structured mode the title of the JSON object
+
+        Raises:
+            SchemaError: If a structured response does not match the schema
+        """
+        if not self.structured:
+            return content
+        return image_processor.structured.parse(content, image_processor.structured.DESCRIPTION_SCHEMA)["title"]
+
+    def _log_schema_failure(self, image_path: pathlib.Path, ask: int, error: Exception) -> None:
+        """Log a structured response that failed validation."""
+        if ask < self.schema_attempts - 1:
+            logger.warning(f"Invalid structured response for {image_path.name}: {error}. Asking again...")
+
+    def parse_response(self, response: typing.Any) -> str:
+        """
+        Validate an HTTP response and extract the generated text.
+
+        Works with both requests and httpx response objects.
+
+        Args:
+            response: HTTP response from the generate API
+
+        Returns:
+            Generated description text
+
+        Raises:
+            OllamaConnectionError: If Ollama is unreachable or failing
+            OllamaResponseError: If response is invalid
+        """
+        self.check_status(response)
+
+        # Parse response
+        try:
+            response_data = response.json()
+        except json.JSONDecodeError as e:
+            raise OllamaResponseError(f"Invalid JSON response: {e}") from e
+
+        # Extract description from generate API response
+        if "response" not in response_data:
+            raise OllamaResponseError(
+                f"Missing 'response' field in Ollama response: {response_data}"
+            )
+
+        description = response_data["response"].strip()
+        if not description:
+            raise OllamaResponseError("Empty description received from Ollama")
+
+        return description
+
+    def check_status(self, response: typing.Any) -> None:
+        """
+        Raise for an HTTP error status.
+
+        Works with both requests and httpx response objects; a streamed httpx
+        response must be read before its text is available.
+
+        Args:
+            response: HTTP response from the generate API
+
+        Raises:
+            OllamaNotFoundError: If the API or model is not found
+            OllamaConnectionError: If Ollama is unreachable or failing
+            OllamaResponseError: If the status is otherwise not 200
+        """
+        if response.status_code == 404:
+            raise OllamaNotFoundError(
+                f"Ollama API or model not found at {self.endpoint}: {response.text}. "
+                "Ensure Ollama is running and the model is pulled."
+            )
+        if response.status_code >= 500:
+            raise OllamaConnectionError(
+                f"Ollama server error (HTTP {response.status_code}): {response.text}"
+            )
+        if response.status_code != 200:
+            raise OllamaResponseError(
+                f"Unexpected HTTP status {response.status_code}: {response.text}"
+            )
+
+    def read_stream(self, response: typing.Any) -> str:
+        """
+        Read a streamed generate response until the filename is complete.
+
+        Args:
+            response: Streamed requests response from the generate API
+
+        Returns:
+            Generated description text
+
+        Raises:
+            OllamaConnectionError: If Ollama is unreachable or failing
+            OllamaResponseError: If response is invalid
+        """
+        self.check_status(response)
+
+        stream = FilenameStream(self.stream_max_words)
+        for line in response.iter_lines():
+            if stream.feed(line):
+                break
+        return stream.result()
+
     def generate_filename(self, image_path: pathlib.Path, prompt: str | None = None) -> str:
         """
         Generate filename description for image using Ollama.
@@ -110,124 +571,179 @@ class OllamaClient:
 
         # Use configured prompt if none provided
         if prompt is None:
-            prompt = image_processor_name.config_manager.config.get("filename.prompt", "Describe this image in 4-5 words")
+            prompt = self.default_prompt()
+
+        with self.open_image(image_path) as source:
+            return self._generate_with_retries(image_path, source, prompt, start_time)
 
-        for attempt in range(self.retry_attempts):
+    def default_prompt(self) -> str:
+        """Configured filename prompt, or the structured one in structured mode."""
+        if self.structured:
+            return self.structured_prompt
+        return image_processor_name.config_manager.config.get("filename.prompt", "Describe this image in 4-5 words")
+
+    def _generate_with_retries(
+        self,
+        image_path: pathlib.Path,
+        source: image_processor.encoding.ImageSource,
+        prompt: str,
+        start_time: float,
+    ) -> str:
+        """Send the filename request, retrying transient failures and asking again on schema failures."""
+        # Serialize the payload once; every attempt streams the same body
+        body = self.build_body(source, prompt, self.response_format)
+
+        def attempt(index: int) -> str:
+            logger.info(f"Generating filename for: {image_path.name} (attempt {index + 1})")
+            return self._post_body(body)
+
+        for ask in range(self.schema_attempts if self.structured else 1):
+            content = self.retry_policy.call(
+                attempt, self.is_transient, breaker=self.breaker, on_retry=self._log_retry
+            )
             try:
-                # Encode image
-                encoded_image = self.encode_image(image_path)
-
-                # Prepare request payload for generate API
-                payload = {
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "images": [encoded_image],
-                }
-
-                logger.info(
-                    f"Generating filename for: {image_path.name} (attempt {attempt + 1})"
-                )
+                description = self.parse_filename(content)
+                break
+            except image_processor.structured.SchemaError as e:
+                self._log_schema_failure(image_path, ask, e)
+                error = e
+        else:
+            raise OllamaResponseError(
+                f"No valid structured response after {self.schema_attempts} attempts: {error}"
+            ) from error
+
+        elapsed_time = time.time() - start_time
+        logger.info(
+            f"Generated filename description for {image_path.name} "
+            f"({len(description)} chars, {elapsed_time:.1f}s)"
+        )
+
+        return description
 
-                # Make request to Ollama
-                response = requests.post(
-                    self.endpoint,
-                    json=payload,
+    def _post_body(self, body: image_processor.encoding.JsonBody) -> str:
+        """
+        Send one generate request.
+
+        Args:
+            body: Request body built with build_body
+
+        Returns:
+            Generated description text
+
+        Raises:
+            OllamaConnectionError: If connection to Ollama fails
+            OllamaTimeoutError: If request times out
+            OllamaResponseError: If response is invalid
+        """
+        try:
+            with self.request_slot(), self.select_endpoint() as url:
+                response = self.session.post(
+                    url,
+                    data=body,
+                    headers=body.headers,
                     timeout=self.timeout,
-                    headers={"Content-Type": "application/json"},
+                    stream=self.streaming,
                 )
+                if not self.streaming:
+                    return self.parse_response(response)
 
-                # Handle HTTP errors
-                if response.status_code == 404:
-                    raise OllamaConnectionError(
-                        f"Ollama API not found at {self.endpoint}. "
-                        "Ensure Ollama is running and accessible."
-                    )
-                if response.status_code >= 500:
-                    raise OllamaConnectionError(
-                        f"Ollama server error (HTTP {response.status_code}): {response.text}"
-                    )
-                if response.status_code != 200:
-                    raise OllamaResponseError(
-                        f"Unexpected HTTP status {response.status_code}: {response.text}"
-                    )
-
-                # Parse response
+                # Closing before the end drops the connection, which makes
+                # Ollama stop generating instead of finishing the ramble
                 try:
-                    response_data = response.json()
-                except json.JSONDecodeError as e:
-                    raise OllamaResponseError(f"Invalid JSON response: {e}") from e
-
-                # Extract description from generate API response
-                if "response" not in response_data:
-                    raise OllamaResponseError(
-                        f"Missing 'response' field in Ollama response: {response_data}"
-                    )
-
-                description = response_data["response"].strip()
-                if not description:
-                    raise OllamaResponseError("Empty description received from Ollama")
-
-                elapsed_time = time.time() - start_time
-                logger.info(
-                    f"Generated filename description for {image_path.name} "
-                    f"({len(description)} chars, {elapsed_time:.1f}s)"
-                )
+                    return self.read_stream(response)
+                finally:
+                    response.close()
+
+        except requests.exceptions.Timeout as e:
+            raise OllamaTimeoutError(f"Request to Ollama timed out after {self.timeout}s") from e
+        except requests.exceptions.ConnectionError as e:
+            raise OllamaConnectionError(f"Failed to connect to Ollama at {self.endpoint}: {e}") from e
+        except requests.exceptions.RequestException as e:
+            raise OllamaConnectionError(f"Request to Ollama failed: {e}") from e
 
-                return description
+    def warm_up(self) -> dict[str, float | None]:
+        """
+        Load the model on every endpoint before a batch.
 
-            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
-                if attempt == self.retry_attempts - 1:
-                    if isinstance(e, requests.exceptions.Timeout):
-                        raise OllamaTimeoutError(
-                            f"Request to Ollama timed out after {self.timeout}s"
-                        ) from e
-                    raise OllamaConnectionError(
-                        f"Failed to connect to Ollama at {self.endpoint}: {e}"
-                    ) from e
+        A generate request without a prompt makes Ollama load the model and
+        keep it for keep_alive, so the first images of a batch do not pay
+        the cold start. The load times are recorded in warmup_latency
+        rather than in the request statistics. Endpoints already warmed up
+        by this client are skipped; nothing is sent if warm-up is disabled.
 
-                logger.warning(
-                    f"Attempt {attempt + 1} failed: {e}. Retrying in {self.retry_delay}s..."
-                )
-                time.sleep(self.retry_delay)
+        Returns:
+            Seconds each endpoint took to load the model, None if it failed
+        """
+        if not self.warm_up_enabled:
+            return {}
+
+        payload = {"model": self.model}
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+
+        for endpoint in self.endpoints:
+            if self.warmup_latency.get(endpoint) is not None:
+                continue
 
+            logger.info(f"Loading model {self.model} at {endpoint}")
+            start_time = time.monotonic()
+            try:
+                response = self.session.post(endpoint, json=payload, timeout=self.warm_up_timeout)
+                response.raise_for_status()
             except requests.exceptions.RequestException as e:
-                if attempt == self.retry_attempts - 1:
-                    raise OllamaConnectionError(f"Request to Ollama failed: {e}") from e
+                # The batch still runs; the first request pays the load instead
+                logger.warning(f"Model warm-up failed at {endpoint}: {e}")
+                self.warmup_latency[endpoint] = None
+                continue
 
-                logger.warning(
-                    f"Attempt {attempt + 1} failed: {e}. Retrying in {self.retry_delay}s..."
-                )
-                time.sleep(self.retry_delay)
+            self.warmup_latency[endpoint] = time.monotonic() - start_time
+            logger.info(f"Model {self.model} ready at {endpoint} ({self.warmup_latency[endpoint]:.1f}s)")
 
-        # This should not be reached due to the retry logic above
-        raise OllamaConnectionError("All retry attempts exhausted")
+        return dict(self.warmup_latency)
 
     def test_connection(self) -> bool:
         """
         Test connection to Ollama API.
 
+        With several endpoints, each is probed and unreachable ones are
+        taken out of rotation.
+
         Returns:
-            True if connection successful, False otherwise
+            True if connection successful (to at least one endpoint),
+            False otherwise
+        """
+        if self.balancer is not None:
+            return self.balancer.check_health() > 0
+        return self.probe_endpoint(self.endpoint)
+
+    def probe_endpoint(self, endpoint: str) -> bool:
+        """
+        Check that an Ollama endpoint answers its tags API.
+
+        Args:
+            endpoint: Ollama API endpoint URL
+
+        Returns:
+            True if the endpoint is reachable, False otherwise
         """
         try:
             # Try to get model info using the tags endpoint
-            base_url = self.endpoint.replace("/api/generate", "")
-            response = requests.get(
+            base_url = endpoint.replace("/api/generate", "")
+            response = self.session.get(
                 f"{base_url}/api/tags",
                 timeout=5,
             )
 
             if response.status_code == 200:
-                logger.info("Ollama connection test successful")
+                logger.info(f"Ollama connection test successful: {endpoint}")
                 return True
             logger.warning(
-                f"Ollama connection test failed: HTTP {response.status_code}"
+                f"Ollama connection test failed for {endpoint}: HTTP {response.status_code}"
             )
             return False
 
         except Exception as e:
-            logger.warning(f"Ollama connection test failed: {e}")
+            logger.warning(f"Ollama connection test failed for {endpoint}: {e}")
             return False
 
     def list_models(self) -> dict[str, typing.Any]:
@@ -242,7 +758,7 @@ class OllamaClient:
         """
         try:
             base_url = self.endpoint.replace("/api/generate", "")
-            response = requests.get(f"{base_url}/api/tags", timeout=10)
+            response = self.session.get(f"{base_url}/api/tags", timeout=10)
             response.raise_for_status()
             return response.json()
 
@@ -259,11 +775,16 @@ class OllamaClient:
         print("Testing Ollama connection...")
 
         if self.test_connection():
-            print(f"✓ Successfully connected to Ollama at {self.endpoint}")
+            if self.balancer is None:
+                print(f"✓ Successfully connected to Ollama at {self.endpoint}")
+            else:
+                for backend in self.balancer.stats():
+                    mark = "✓ Connected to" if backend["healthy"] else "✗ Failed to connect to"
+                    print(f"{mark} Ollama at {backend['endpoint']}")
             print(f"✓ Using model: {self.model}")
             return True
 
-        print(f"✗ Failed to connect to Ollama at {self.endpoint}")
+        print(f"✗ Failed to connect to Ollama at {', '.join(self.endpoints)}")
         print("\nTroubleshooting:")
         print("1. Ensure Ollama is installed and running")
         print("2. Check that the LLaVA model is available: ollama pull llava-llama3:latest")
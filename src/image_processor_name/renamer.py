@@ -2,12 +2,18 @@
 Core image renaming functionality with AI-powered filename generation.
 """
 
+import asyncio
 import pathlib
 import re
 import time
+import typing
 
 import tqdm
 
+import image_processor.jobs
+import image_processor.streaming
+import image_processor.walker
+import image_processor_name.async_ollama_client
 import image_processor_name.config_manager
 import image_processor_name.file_operations
 import image_processor_name.log_manager
@@ -45,6 +51,12 @@ class ImageRenamer:
         self.replace_spaces_with = image_processor_name.config_manager.config.get("filename.replace_spaces_with", "-")
         self.case_conversion = image_processor_name.config_manager.config.get("filename.case_conversion", "lower")
 
+        # Load directory walking configuration
+        self.include_patterns = image_processor_name.config_manager.config.get("images.include", []) or []
+        self.exclude_patterns = image_processor_name.config_manager.config.get("images.exclude", []) or []
+        self.symlink_policy = image_processor_name.config_manager.config.get("images.symlinks", "files")
+        self.stream = image_processor_name.config_manager.config.get("processing.stream", False)
+
         logger.info("Image renamer initialized")
 
     def sanitize_filename(self, description: str, original_extension: str) -> str:
@@ -149,56 +161,207 @@ class ImageRenamer:
         Returns:
             True if renaming successful (or would be successful in dry run)
         """
-        try:
-            if not image_path.exists() or not image_path.is_file():
-                logger.error(f"Image file not found or invalid: {image_path}")
-                return False
+        return self._rename_image(image_path, dry_run) is not None
 
-            if not self.file_ops.is_supported_image(image_path):
-                logger.debug(f"Skipping unsupported file: {image_path}")
-                return False
+    def _rename_image(self, image_path: pathlib.Path, dry_run: bool) -> pathlib.Path | None:
+        """
+        Rename a single image file and report where it went.
+
+        Args:
+            image_path: Path to image file
+            dry_run: If True, only show what would be renamed without doing it
+
+        Returns:
+            New path of the image (or the path it would get in a dry run),
+            or None if renaming failed
+        """
+        try:
+            if not self._is_renameable(image_path):
+                return None
 
             # Generate new filename
             new_filename = self.generate_filename(image_path)
             if not new_filename:
-                return False
+                return None
 
-            new_path = image_path.parent / new_filename
+            return self._apply_rename(image_path, new_filename, dry_run)
 
-            # Check if new name is the same as current
-            if new_path == image_path:
-                logger.info(f"Filename already optimal: {image_path.name}")
-                return True
+        except Exception as e:
+            logger.error(f"Failed to rename {image_path.name}: {e}")
+            return None
 
-            # Handle name conflicts
-            if new_path.exists():
-                new_path = self.file_ops.get_unique_filename(new_path)
-                logger.info(f"Using unique filename: {new_path.name}")
+    def _is_renameable(self, image_path: pathlib.Path) -> bool:
+        """
+        Check that a path is an existing, supported image file.
 
-            if dry_run:
-                logger.info(
-                    f"DRY RUN: Would rename {image_path.name} -> {new_path.name}"
-                )
-                return True
+        Args:
+            image_path: Path to image file
 
-            # Perform the rename
-            success = self.file_ops.safe_file_move(image_path, new_path)
-            if success:
-                logger.info(
-                    f"Successfully renamed: {image_path.name} -> {new_path.name}"
-                )
-            return success
+        Returns:
+            True if the image can be renamed
+        """
+        if not image_path.exists() or not image_path.is_file():
+            logger.error(f"Image file not found or invalid: {image_path}")
+            return False
 
-        except Exception as e:
-            logger.error(f"Failed to rename {image_path.name}: {e}")
+        if not self.file_ops.is_supported_image(image_path):
+            logger.debug(f"Skipping unsupported file: {image_path}")
             return False
 
+        return True
+
+    def _apply_rename(self, image_path: pathlib.Path, new_filename: str, dry_run: bool) -> pathlib.Path | None:
+        """
+        Move an image to its generated filename, resolving name conflicts.
+
+        Args:
+            image_path: Path to image file
+            new_filename: Generated filename including extension
+            dry_run: If True, only show what would be renamed
+
+        Returns:
+            New path of the image (or the path it would get in a dry run),
+            or None if the move failed
+        """
+        new_path = image_path.parent / new_filename
+
+        # Check if new name is the same as current
+        if new_path == image_path:
+            logger.info(f"Filename already optimal: {image_path.name}")
+            return image_path
+
+        # Handle name conflicts
+        if new_path.exists():
+            new_path = self.file_ops.get_unique_filename(new_path)
+            logger.info(f"Using unique filename: {new_path.name}")
+
+        if dry_run:
+            logger.info(
+                f"DRY RUN: Would rename {image_path.name} -> {new_path.name}"
+            )
+            return new_path
+
+        # Perform the rename
+        if not self.file_ops.safe_file_move(image_path, new_path):
+            return None
+
+        logger.info(
+            f"Successfully renamed: {image_path.name} -> {new_path.name}"
+        )
+        return new_path
+
+    def iter_image_files(self, directory: pathlib.Path, recursive: bool = False) -> typing.Iterator[pathlib.Path]:
+        """
+        Lazily yield supported image files in directory.
+
+        Args:
+            directory: Directory to search
+            recursive: Whether to search recursively
+
+        Yields:
+            Image file paths
+        """
+        for entry in image_processor.walker.walk_files(
+            directory,
+            include=self.include_patterns,
+            exclude=self.exclude_patterns,
+            recursive=recursive,
+            symlinks=self.symlink_policy,
+            onerror=lambda e: logger.warning(f"Cannot scan {e.filename}: {e}"),
+        ):
+            image_path = pathlib.Path(entry.path)
+            if self.file_ops.is_supported_image(image_path):
+                yield image_path
+
+    def _job_image_files(
+        self,
+        directory: pathlib.Path,
+        recursive: bool,
+        job_store: image_processor.jobs.JobStore,
+        job_id: str,
+    ) -> typing.Iterator[pathlib.Path]:
+        """
+        Yield the images of a job, resuming it if it ran before.
+
+        A job whose discovery completed yields its pending items without
+        walking the directory again. Otherwise the directory is walked and
+        new images are recorded as pending; renamed images and the names
+        they were given are skipped, so nothing is renamed twice.
+
+        Args:
+            directory: Directory containing images
+            recursive: Whether to search recursively
+            job_store: Store holding the job
+            job_id: Id of the job to record or resume
+
+        Yields:
+            Image file paths still to rename
+        """
+        job = job_store.resume_job(job_id)
+        if job["discovered"]:
+            logger.info(f"Resuming job {job_id} without rescanning: {job['items']['pending']} images pending")
+            yield from map(pathlib.Path, job_store.iter_items(job_id))
+            return
+
+        renamed = job_store.get_results(job_id)
+        yield from job_store.discover(
+            job_id,
+            self.iter_image_files(directory, recursive),
+            skip={*renamed, *filter(None, renamed.values())},
+        )
+
+    def _record_result(
+        self,
+        job_store: image_processor.jobs.JobStore | None,
+        job_id: str | None,
+        image_path: pathlib.Path,
+        new_path: pathlib.Path | None,
+    ) -> None:
+        """Record the outcome of renaming an image in its job, if any."""
+        if job_store is None:
+            return
+        if new_path is None:
+            job_store.mark(job_id, [image_path], "failed")
+        else:
+            job_store.mark(job_id, [image_path], "done", str(new_path))
+
+    def _client_stats(self, client: typing.Any) -> dict[str, typing.Any]:
+        """Final state of the client's concurrency limiter and its model load times, if any."""
+        stats = {}
+        limiter = getattr(client, "limiter", None)
+        if limiter is not None:
+            stats["concurrency"] = limiter.stats()
+        warmup_latency = getattr(client, "warmup_latency", None)
+        if warmup_latency:
+            stats["warmup"] = warmup_latency
+        return stats
+
+    def _create_progress_bar(self, total: int | None, dry_run: bool, show_progress: bool) -> tqdm.tqdm | None:
+        """Create the renaming progress bar if enabled."""
+        if show_progress and image_processor_name.config_manager.config.get("processing.progress_bar", True):
+            action = "Analyzing" if dry_run else "Renaming"
+            return tqdm.tqdm(total=total, desc=f"{action} images", unit="img", colour="green")
+        return None
+
+    def _track_discovery(
+        self, image_files: typing.Iterable[pathlib.Path], progress_bar: tqdm.tqdm | None
+    ) -> typing.Iterator[pathlib.Path]:
+        """Yield image files, growing the progress bar total as each is found."""
+        for discovered, image_path in enumerate(image_files, start=1):
+            if progress_bar is not None and (progress_bar.total or 0) < discovered:
+                progress_bar.total = discovered
+                progress_bar.refresh()
+            yield image_path
+
     def rename_directory(
         self,
         directory: pathlib.Path,
         recursive: bool = False,
         dry_run: bool = False,
         show_progress: bool = True,
+        stream: bool | None = None,
+        job_store: image_processor.jobs.JobStore | None = None,
+        job_id: str | None = None,
     ) -> dict[str, int]:
         """
         Rename all images in a directory using the original working logic.
@@ -208,62 +371,68 @@ class ImageRenamer:
             recursive: Whether to process subdirectories
             dry_run: If True, only show what would be renamed
             show_progress: Whether to show progress bar
+            stream: Whether to start renaming while discovery is still running
+                instead of listing all images first (default from config)
+            job_store: Store in which to record each image and its new name
+                (ignored in a dry run)
+            job_id: Job to record the run in; a job that ran before is
+                resumed, retrying its unfinished and failed images
 
         Returns:
             Dictionary with processing statistics
         """
         start_time = time.time()
+        use_stream = self.stream if stream is None else stream
+        # A preview renames nothing, so it must not mark images done
+        if dry_run:
+            job_store = None
 
         try:
             processed_count = 0
             failed_count = 0
             skipped_count = 0
 
-            # Use original simple logic - process each file exactly once
-            pattern = "**/*" if recursive else "*"
-            all_files = list(directory.glob(pattern))
-
-            # Filter for image files
-            image_files = [
-                f
-                for f in all_files
-                if f.is_file() and self.file_ops.is_supported_image(f)
-            ]
-
-            if not image_files:
-                logger.warning("No image files found to process")
-                return {
-                    "total_files": 0,
-                    "processed": 0,
-                    "failed": 0,
-                    "skipped": 0,
-                    "processing_time": 0,
-                }
-
-            logger.info(f"Found {len(image_files)} images to process")
-
-            # Set up progress bar
-            progress_bar = None
-            if show_progress and image_processor_name.config_manager.config.get("processing.progress_bar", True):
-                action = "Analyzing" if dry_run else "Renaming"
-                progress_bar = tqdm.tqdm(
-                    image_files, desc=f"{action} images", unit="img", colour="green"
-                )
-                iterator = progress_bar
+            # Process each file exactly once; the walker lists each directory
+            # before yielding from it, so renamed files are never seen again
+            if job_store is None:
+                image_files = self.iter_image_files(directory, recursive)
             else:
-                iterator = image_files
+                image_files = self._job_image_files(directory, recursive, job_store, job_id)
+
+            if not use_stream:
+                image_files = list(image_files)
+
+                if not image_files:
+                    logger.warning("No image files found to process")
+                    if job_store is not None:
+                        job_store.set_status(job_id, "completed")
+                    return {
+                        "total_files": 0,
+                        "processed": 0,
+                        "failed": 0,
+                        "skipped": 0,
+                        "processing_time": 0,
+                    }
+
+                logger.info(f"Found {len(image_files)} images to process")
+
+            self.ollama_client.warm_up()
+            progress_bar = self._create_progress_bar(
+                None if use_stream else len(image_files), dry_run, show_progress
+            )
 
             try:
-                # Simple iteration like the original - no complex tracking
-                for image_path in iterator:
-                    result = self.rename_single_image(image_path, dry_run)
-                    if result:
+                for image_path in self._track_discovery(image_files, progress_bar):
+                    new_path = self._rename_image(image_path, dry_run)
+                    self._record_result(job_store, job_id, image_path, new_path)
+                    if new_path is not None:
                         processed_count += 1
                     else:
                         failed_count += 1
 
                     # Update progress bar description
                     if progress_bar:
+                        progress_bar.update(1)
                         progress_bar.set_postfix(
                             {
                                 "processed": processed_count,
@@ -271,10 +440,22 @@ class ImageRenamer:
                             }
                         )
 
+            except BaseException:
+                if job_store is not None:
+                    job_store.set_status(job_id, "interrupted")
+                raise
+
             finally:
                 if progress_bar:
                     progress_bar.close()
 
+            if job_store is not None:
+                job_store.set_status(job_id, "completed")
+
+            total_files = processed_count + failed_count
+            if total_files == 0:
+                logger.warning("No image files found to process")
+
             processing_time = time.time() - start_time
 
             # Log summary
@@ -284,11 +465,12 @@ class ImageRenamer:
             )
 
             return {
-                "total_files": len(image_files),
+                "total_files": total_files,
                 "processed": processed_count,
                 "failed": failed_count,
                 "skipped": skipped_count,
                 "processing_time": processing_time,
+                **self._client_stats(self.ollama_client),
             }
 
         except Exception as e:
@@ -297,6 +479,174 @@ class ImageRenamer:
                 f"Failed to process directory {directory}: {e}"
             ) from e
 
+    async def _arename_single_image(
+        self,
+        client: image_processor_name.async_ollama_client.AsyncOllamaClient,
+        image_path: pathlib.Path,
+        dry_run: bool,
+        rename_lock: asyncio.Lock,
+    ) -> pathlib.Path | None:
+        """
+        Rename a single image with async inference.
+
+        Args:
+            client: Async Ollama client
+            image_path: Path to image file
+            dry_run: If True, only show what would be renamed
+            rename_lock: Lock serializing conflict checks and moves
+
+        Returns:
+            New path of the image (or the path it would get in a dry run),
+            or None if renaming failed
+        """
+        try:
+            if not await asyncio.to_thread(self._is_renameable, image_path):
+                return None
+
+            if image_processor_name.config_manager.config.get("images.verify_before_processing", True):
+                await asyncio.to_thread(self.file_ops.verify_image, image_path)
+
+            description = await client.agenerate_filename(image_path)
+            new_filename = self.sanitize_filename(description, image_path.suffix)
+            logger.debug(f"Generated filename: {image_path.name} -> {new_filename}")
+
+            # Serialize moves so concurrent images never claim the same name
+            async with rename_lock:
+                return await asyncio.to_thread(self._apply_rename, image_path, new_filename, dry_run)
+
+        except Exception as e:
+            logger.error(f"Failed to rename {image_path.name}: {e}")
+            return None
+
+    async def arename_directory(
+        self,
+        directory: pathlib.Path,
+        recursive: bool = False,
+        dry_run: bool = False,
+        show_progress: bool = True,
+        client: image_processor_name.async_ollama_client.AsyncOllamaClient | None = None,
+        stream: bool | None = None,
+        job_store: image_processor.jobs.JobStore | None = None,
+        job_id: str | None = None,
+    ) -> dict[str, int]:
+        """
+        Rename all images in a directory using asyncio.
+
+        Up to the client's max_in_flight filename requests run concurrently.
+
+        Args:
+            directory: Directory containing images
+            recursive: Whether to process subdirectories
+            dry_run: If True, only show what would be renamed
+            show_progress: Whether to show progress bar
+            client: Async Ollama client (default: built from the sync client)
+            stream: Whether to start renaming while discovery is still running
+                instead of listing all images first (default from config)
+            job_store: Store in which to record each image and its new name
+                (ignored in a dry run)
+            job_id: Job to record the run in; a job that ran before is
+                resumed, retrying its unfinished and failed images
+
+        Returns:
+            Dictionary with processing statistics
+        """
+        start_time = time.time()
+        use_stream = self.stream if stream is None else stream
+        # A preview renames nothing, so it must not mark images done
+        if dry_run:
+            job_store = None
+
+        if job_store is None:
+            image_files = self.iter_image_files(directory, recursive)
+        else:
+            image_files = self._job_image_files(directory, recursive, job_store, job_id)
+
+        if not use_stream:
+            image_files = await asyncio.to_thread(list, image_files)
+
+            if not image_files:
+                logger.warning("No image files found to process")
+                if job_store is not None:
+                    job_store.set_status(job_id, "completed")
+                return {
+                    "total_files": 0,
+                    "processed": 0,
+                    "failed": 0,
+                    "skipped": 0,
+                    "processing_time": 0,
+                }
+
+            logger.info(f"Found {len(image_files)} images to process")
+
+        owns_client = client is None
+        if client is None:
+            client = image_processor_name.async_ollama_client.AsyncOllamaClient(
+                endpoints=self.ollama_client.endpoints,
+                model=self.ollama_client.model,
+                timeout=self.ollama_client.timeout,
+            )
+            client.structured = self.ollama_client.structured
+
+        await asyncio.to_thread(client.warm_up)
+
+        processed_count = 0
+        failed_count = 0
+        rename_lock = asyncio.Lock()
+
+        progress_bar = self._create_progress_bar(
+            None if use_stream else len(image_files), dry_run, show_progress
+        )
+
+        async def handle(image_path: pathlib.Path) -> None:
+            nonlocal processed_count, failed_count
+            new_path = await self._arename_single_image(client, image_path, dry_run, rename_lock)
+            self._record_result(job_store, job_id, image_path, new_path)
+            if new_path is not None:
+                processed_count += 1
+            else:
+                failed_count += 1
+
+            if progress_bar:
+                progress_bar.update(1)
+                progress_bar.set_postfix({"processed": processed_count, "failed": failed_count})
+
+        try:
+            await image_processor.streaming.consume_concurrently(
+                self._track_discovery(image_files, progress_bar), handle, workers=client.max_in_flight
+            )
+        except BaseException:
+            if job_store is not None:
+                job_store.set_status(job_id, "interrupted")
+            raise
+        finally:
+            if progress_bar:
+                progress_bar.close()
+            if owns_client:
+                await client.aclose()
+
+        if job_store is not None:
+            job_store.set_status(job_id, "completed")
+
+        total_files = processed_count + failed_count
+        if total_files == 0:
+            logger.warning("No image files found to process")
+
+        processing_time = time.time() - start_time
+
+        action = "analyzed" if dry_run else "processed"
+        logger.info(
+            f"Processing complete: {processed_count} {action}, {failed_count} failed in {processing_time:.1f}s"
+        )
+
+        return {
+            "total_files": total_files,
+            "processed": processed_count,
+            "failed": failed_count,
+            "skipped": 0,
+            "processing_time": processing_time,
+            **self._client_stats(client),
+        }
+
     def test_connection(self) -> bool:
         """
         Test connection to Ollama service.
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Benchmark peak memory per in-flight request for the image upload path.
+
+Compares the buffered upload (read the file, base64 encode it, build the
+JSON payload and let requests serialize it) with the streaming body from
+image_processor.encoding. Each mode runs in a fresh subprocess that sends
+several concurrent requests to a local server which drains and discards the
+body, and reports the growth in peak RSS divided by the number of requests.
+
+Usage:
+    uv run python tests/benchmark_encoding.py --size-mb 20 --requests 4
+"""
+
+import argparse
+import base64
+import http.server
+import os
+import pathlib
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+
+import requests
+
+import image_processor.encoding
+
+MODES = ("buffered", "streaming")
+
+
+class DrainHandler(http.server.BaseHTTPRequestHandler):
+    """Read and discard request bodies, replying like the Ollama chat API."""
+
+    def do_POST(self):
+        """Drain the body and send a minimal chat response."""
+        remaining = int(self.headers.get("Content-Length", 0))
+        while remaining > 0:
+            remaining -= len(self.rfile.read(min(remaining, 1 << 20)))
+
+        reply = b'{"message": {"content": "ok"}}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, format, *args):
+        """Silence per-request logging."""
+
+
+def peak_rss_mib() -> float:
+    """Peak resident set size of this process in MiB."""
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def send_buffered(
+    session: requests.Session,
+    url: str,
+    image_path: pathlib.Path,
+    ready: threading.Barrier,
+):
+    """Send one request the way the clients did before streaming."""
+    encoded = base64.b64encode(image_path.read_bytes()).decode("utf-8")
+    payload = {"model": "llava", "messages": [{"role": "user", "images": [encoded]}]}
+    ready.wait()
+    session.post(url, json=payload).raise_for_status()
+
+
+def send_streaming(
+    session: requests.Session,
+    url: str,
+    image_path: pathlib.Path,
+    ready: threading.Barrier,
+):
+    """Send one request with a memory-mapped, chunk-encoded body."""
+    placeholder = image_processor.encoding.IMAGE_PLACEHOLDER
+    payload = {
+        "model": "llava",
+        "messages": [{"role": "user", "images": [placeholder]}],
+    }
+    with image_processor.encoding.ImageSource(image_path, preprocess=False) as source:
+        body = image_processor.encoding.JsonBody(payload, source)
+        ready.wait()
+        session.post(url, data=body, headers=body.headers).raise_for_status()
+
+
+def run_worker(mode: str, url: str, image_path: pathlib.Path, count: int) -> None:
+    """Send count concurrent requests and print peak RSS growth per request."""
+    send = send_buffered if mode == "buffered" else send_streaming
+    session = requests.Session()
+    ready = threading.Barrier(count)
+    threads = [
+        threading.Thread(target=send, args=(session, url, image_path, ready))
+        for _ in range(count)
+    ]
+
+    baseline = peak_rss_mib()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    print(f"{(peak_rss_mib() - baseline) / count:.1f}")
+
+
+def main():
+    """Run every mode in its own process and print a comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--size-mb", type=float, default=20, help="Size of the synthetic image in MiB"
+    )
+    parser.add_argument(
+        "--requests", type=int, default=4, help="Concurrent requests per mode"
+    )
+    parser.add_argument("--worker", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    parser.add_argument("--image", type=pathlib.Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.url, args.image, args.requests)
+        return
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), DrainHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/api/chat"
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Random bytes stand in for an incompressible camera original
+        image_path = pathlib.Path(temp_dir) / "image.jpg"
+        image_path.write_bytes(
+            b"\xff\xd8" + os.urandom(int(args.size_mb * 1024 * 1024))
+        )
+
+        print(
+            f"Image: {args.size_mb:g} MiB, {args.requests} concurrent requests per mode"
+        )
+        print("Peak RSS growth per in-flight request:")
+        for mode in MODES:
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    __file__,
+                    "--worker",
+                    mode,
+                    "--url",
+                    url,
+                    "--image",
+                    str(image_path),
+                    "--requests",
+                    str(args.requests),
+                ],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            print(f"  {mode:<10} {float(output):8.1f} MiB")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
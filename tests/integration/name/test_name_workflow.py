@@ -299,7 +299,7 @@ def test_configuration_integration_workflow(temp_dir: pathlib.Path, sample_name_
     img.save(test_image, "JPEG")
 
     # Mock Ollama response
-    with unittest.mock.patch("src.image_processor_name.ollama_client.requests.post") as mock_post:
+    with unittest.mock.patch("src.image_processor_name.ollama_client.requests.Session.post") as mock_post:
         mock_response = unittest.mock.Mock()
         mock_response.raise_for_status.return_value = None
         mock_response.status_code = 200
@@ -316,6 +316,7 @@ def test_configuration_integration_workflow(temp_dir: pathlib.Path, sample_name_
                 "filename.max_length": 50,
                 "filename.pattern_cleanup": True,
                 "filename.remove_punctuation": True,
+                "filename.streaming.enabled": False,
                 "images.verify_before_processing": True,
                 "images.supported_extensions": [
                     ".png",
@@ -0,0 +1 @@
+"""Unit tests for image_processor_meta tool."""
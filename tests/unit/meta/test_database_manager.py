@@ -0,0 +1,334 @@
+"""
+Unit tests for image_processor_meta DatabaseManager.
+"""
+
+import pathlib
+import sqlite3
+import time
+
+import pytest
+import src.image_processor_meta.db.manager
+import src.image_processor_meta.db.writer
+import src.image_processor_meta.exceptions
+
+
+@pytest.fixture
+def meta_db(
+    tmp_path: pathlib.Path,
+) -> src.image_processor_meta.db.manager.DatabaseManager:
+    """Create a database manager backed by a temporary file."""
+    return src.image_processor_meta.db.manager.DatabaseManager(
+        str(tmp_path / "meta.db")
+    )
+
+
+def test_get_description_by_hash(
+    meta_db: src.image_processor_meta.db.manager.DatabaseManager,
+):
+    """Test that descriptions can be found by content hash."""
+    meta_db.save_description("/photos/a.jpg", "A description", "abc123")
+
+    assert meta_db.get_description_by_hash("abc123") == {
+        "file_path": "/photos/a.jpg",
+        "description": "A description",
+    }
+    assert meta_db.get_description_by_hash("missing") is None
+
+
+def test_manifest_round_trip(
+    meta_db: src.image_processor_meta.db.manager.DatabaseManager,
+):
+    """Test that manifest entries are stored, updated and deleted."""
+    meta_db.update_manifest(
+        [
+            ("/photos/a.jpg", 100, 1, 10),
+            ("/photos/sub/b.jpg", 200, 2, 20),
+        ]
+    )
+    meta_db.update_manifest([("/photos/a.jpg", 150, 3, 10)])
+
+    assert meta_db.get_manifest("/photos") == {
+        "/photos/a.jpg": (150, 3, 10),
+        "/photos/sub/b.jpg": (200, 2, 20),
+    }
+
+    assert meta_db.delete_manifest_entries(["/photos/sub/b.jpg"]) == 1
+    assert meta_db.get_manifest("/photos") == {"/photos/a.jpg": (150, 3, 10)}
+
+
+def test_manifest_is_scoped_to_directory(
+    meta_db: src.image_processor_meta.db.manager.DatabaseManager,
+):
+    """Test that sibling directories sharing a name prefix are excluded."""
+    meta_db.update_manifest(
+        [
+            ("/photos/a.jpg", 100, 1, 10),
+            ("/photos-old/b.jpg", 200, 2, 20),
+        ]
+    )
+
+    assert meta_db.get_manifest("/photos") == {"/photos/a.jpg": (100, 1, 10)}
+
+
+def test_persistent_connection_uses_wal(
+    meta_db: src.image_processor_meta.db.manager.DatabaseManager,
+):
+    """Test that one WAL connection is reused across calls."""
+    with meta_db.connection() as first, meta_db.connection() as second:
+        assert first is second
+        assert first.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    meta_db.close()
+    assert meta_db.count_records() == 0
+
+
+def test_save_descriptions_bulk_upserts(
+    meta_db: src.image_processor_meta.db.manager.DatabaseManager,
+):
+    """Test that bulk saves insert new rows and update existing ones."""
+    meta_db.save_description("/photos/a.jpg", "Old description")
+
+    written = meta_db.save_descriptions_bulk(
+        [
+            ("/photos/a.jpg", "New description", "hash-a"),
+            ("/photos/b.jpg", "Second description", None),
+        ]
+    )
+
+    assert written == 2
+    assert meta_db.count_records() == 2
+    assert meta_db.get_description("/photos/a.jpg") == "New description"
+    assert meta_db.get_description_by_hash("hash-a")["file_path"] == "/photos/a.jpg"
+
+
+def test_description_writer_batches(
+    meta_db: src.image_processor_meta.db.manager.DatabaseManager,
+):
+    """Test that the writer flushes on batch size, interval and close."""
+    writer = src.image_processor_meta.db.writer.DescriptionWriter(
+        meta_db, batch_size=2, interval_ms=200
+    )
+
+    writer.add("/photos/a.jpg", "First")
+    assert meta_db.count_records() == 0
+    writer.add("/photos/b.jpg", "Second")
+    assert meta_db.count_records() == 2
+
+    writer.add("/photos/c.jpg", "Third")
+    deadline = time.monotonic() + 5
+    while meta_db.count_records() < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert meta_db.count_records() == 3
+
+    writer.add("/photos/d.jpg", "Fourth")
+    writer.add("/photos/d.jpg", "Fourth, updated")
+    assert writer.close() == 1
+    assert meta_db.get_description("/photos/d.jpg") == "Fourth, updated"
+
+
+def test_get_described_paths(
+    meta_db: src.image_processor_meta.db.manager.DatabaseManager,
+):
+    """Test that described paths are scoped and exclude unhashed records."""
+    meta_db.save_descriptions_bulk(
+        [
+            ("/photos/a.jpg", "Hashed", "hash-a"),
+            ("/photos/sub/b.jpg", "Hashed", "hash-b"),
+            ("/photos/c.jpg", "Saved before hashing", None),
+            ("/photos-old/d.jpg", "Other directory", "hash-d"),
+        ]
+    )
+
+    assert meta_db.get_described_paths("/photos") == {
+        "/photos/a.jpg",
+        "/photos/sub/b.jpg",
+    }
+
+
+def test_search_ranks_and_tracks_updates(
+    meta_db: src.image_processor_meta.db.manager.DatabaseManager,
+):
+    """Test that search follows inserts, updates and deletes."""
+    meta_db.save_description("/photos/a.jpg", "A red car parked on a street")
+    meta_db.save_description("/photos/b.jpg", "A red red car next to a red barn")
+    meta_db.save_description("/photos/c.jpg", "A sunset-over the sea")
+
+    results = meta_db.search("red car")
+    assert [record["file_path"] for record in results] == [
+        "/photos/b.jpg",
+        "/photos/a.jpg",
+    ]
+
+    meta_db.save_description("/photos/a.jpg", "A blue bicycle")
+    meta_db.delete_description("/photos/b.jpg")
+
+    assert meta_db.search("red") == []
+    assert [record["file_path"] for record in meta_db.search("bicycle")] == [
+        "/photos/a.jpg"
+    ]
+    # Invalid FTS syntax falls back to plain word matching
+    assert [record["file_path"] for record in meta_db.search("sunset-over")] == [
+        "/photos/c.jpg"
+    ]
+
+
+def test_search_index_built_for_existing_database(tmp_path: pathlib.Path):
+    """Test that rows saved before the index existed are searched and counted."""
+    db_path = tmp_path / "legacy.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("""
+            CREATE TABLE images (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                file_path TEXT UNIQUE NOT NULL,
+                description TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute(
+            "INSERT INTO images (file_path, description) VALUES (?, ?)",
+            ("/photos/old.jpg", "An old lighthouse"),
+        )
+    conn.close()
+
+    db = src.image_processor_meta.db.manager.DatabaseManager(str(db_path))
+
+    assert db.search("lighthouse")[0]["file_path"] == "/photos/old.jpg"
+    assert db.get_stats()["by_extension"] == {".jpg": 1}
+
+
+def test_iter_descriptions_pages_through_all_rows(
+    meta_db: src.image_processor_meta.db.manager.DatabaseManager,
+):
+    """Test that keyset pagination returns every row once, in order."""
+    meta_db.save_descriptions_bulk(
+        [(f"/photos/{index}.jpg", f"Description {index}", None) for index in range(5)]
+    )
+    meta_db.delete_description("/photos/1.jpg")
+
+    paths = [record["file_path"] for record in meta_db.iter_descriptions(2)]
+
+    assert paths == ["/photos/0.jpg", "/photos/2.jpg", "/photos/3.jpg", "/photos/4.jpg"]
+    assert meta_db.get_recent_descriptions(2)[0]["description"].startswith(
+        "Description"
+    )
+    assert len(meta_db.get_recent_descriptions(2)) == 2
+
+
+def test_stats_follow_changes(
+    meta_db: src.image_processor_meta.db.manager.DatabaseManager,
+):
+    """Test that trigger-maintained statistics match a full rebuild."""
+    meta_db.save_description(
+        "/photos/a.JPG", "Red car", "hash-a", {"model": "llava", "inference_ms": 1000.0}
+    )
+    meta_db.save_description(
+        "/photos/b.png", "Blue sky", None, {"model": "llava", "inference_ms": 3000.0}
+    )
+    meta_db.save_description("/photos.old/readme", "No extension")
+    meta_db.save_description("/photos/a.JPG", "A red car", "hash-a2")
+    meta_db.delete_description("/photos/b.png")
+
+    stats = meta_db.get_stats()
+
+    assert stats["images"] == 2
+    assert stats["description_bytes"] == len("A red car") + len("No extension")
+    assert stats["inferences"] == 1
+    assert stats["average_inference_ms"] == 1000.0
+    assert stats["by_extension"] == {".jpg": 1, "": 1}
+    assert stats["by_model"] == {"llava": 1, "": 1}
+    assert sum(stats["by_day"].values()) == 2
+
+    meta_db.rebuild_stats()
+    assert meta_db.get_stats() == stats
+
+
+def test_schema_is_versioned(
+    meta_db: src.image_processor_meta.db.manager.DatabaseManager,
+):
+    """Test that new databases are created at the latest schema version."""
+    with meta_db.connection() as conn:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(images)")}
+
+    assert version == len(meta_db._migrations())
+    assert set(src.image_processor_meta.db.manager.DETAIL_COLUMNS) <= columns
+
+
+def test_newer_schema_is_rejected(tmp_path: pathlib.Path):
+    """Test that databases from a newer release are not modified."""
+    db_path = tmp_path / "future.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("PRAGMA user_version = 999")
+    conn.close()
+
+    with pytest.raises(
+        src.image_processor_meta.exceptions.DatabaseConnectionError, match="newer"
+    ):
+        src.image_processor_meta.db.manager.DatabaseManager(str(db_path))
+
+
+def test_details_survive_hash_update(
+    meta_db: src.image_processor_meta.db.manager.DatabaseManager,
+):
+    """Test that saves without details keep the recorded ones."""
+    details = {
+        "model": "llava",
+        "prompt_hash": "abc",
+        "inference_ms": 1500.0,
+        "prompt_tokens": 580,
+        "response_tokens": 42,
+        "image_width": 4000,
+        "image_height": 3000,
+    }
+    meta_db.save_description("/photos/a.jpg", "A description", "hash-1", details)
+    meta_db.save_descriptions_bulk([("/photos/a.jpg", "A description", "hash-2")])
+
+    with meta_db.connection() as conn:
+        row = conn.execute(
+            "SELECT * FROM images WHERE file_path = ?", ("/photos/a.jpg",)
+        ).fetchone()
+
+    assert row["content_hash"] == "hash-2"
+    assert {column: row[column] for column in details} == details
+
+    with pytest.raises(ValueError, match="colour"):
+        meta_db.save_description("/photos/b.jpg", "Other", details={"colour": "red"})
+
+
+def test_get_outdated_paths(
+    meta_db: src.image_processor_meta.db.manager.DatabaseManager,
+):
+    """Test that rows from another model or prompt are returned oldest first."""
+    current = {"model": "llava", "prompt_hash": "new"}
+    meta_db.save_descriptions_bulk(
+        [
+            ("/photos/current.jpg", "Current", None, current),
+            ("/photos/old-model.jpg", "Old", None, {**current, "model": "bakllava"}),
+            ("/photos/old-prompt.jpg", "Old", None, {**current, "prompt_hash": "old"}),
+            ("/photos/unrecorded.jpg", "Old", None),
+            ("/other/old-model.jpg", "Old", None, {"model": "bakllava"}),
+        ]
+    )
+    with meta_db.connection() as conn:
+        conn.execute(
+            "UPDATE images SET updated_at = '2020-01-01' WHERE file_path = ?",
+            ("/photos/old-prompt.jpg",),
+        )
+
+    assert meta_db.get_outdated_paths("/photos", **current) == [
+        "/photos/old-prompt.jpg",
+        "/photos/old-model.jpg",
+        "/photos/unrecorded.jpg",
+    ]
+    assert meta_db.get_outdated_paths("/photos", model="llava") == [
+        "/photos/old-model.jpg",
+        "/photos/unrecorded.jpg",
+    ]
+    assert meta_db.get_outdated_paths("/photos", limit=1, offset=1, **current) == [
+        "/photos/old-model.jpg"
+    ]
+    assert meta_db.count_outdated("/photos", prompt_hash="new") == 2
+
+    with pytest.raises(ValueError, match="model or prompt_hash"):
+        meta_db.get_outdated_paths("/photos")
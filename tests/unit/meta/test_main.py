@@ -0,0 +1,48 @@
+"""
+Unit tests for image_processor_meta main CLI module.
+"""
+
+import csv
+import json
+import pathlib
+
+import pytest
+import src.image_processor_meta.db.manager
+import src.image_processor_meta.main as main_module
+
+
+@pytest.fixture
+def meta_db(
+    tmp_path: pathlib.Path,
+) -> src.image_processor_meta.db.manager.DatabaseManager:
+    """Create a database manager holding three descriptions."""
+    db = src.image_processor_meta.db.manager.DatabaseManager(str(tmp_path / "meta.db"))
+    db.save_descriptions_bulk(
+        [(f"/photos/{index}.jpg", f"Description {index}", None) for index in range(3)]
+    )
+    return db
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".csv"])
+def test_export_descriptions(
+    meta_db: src.image_processor_meta.db.manager.DatabaseManager,
+    tmp_path: pathlib.Path,
+    suffix: str,
+):
+    """Test that exports write every record in the chosen format."""
+    output = tmp_path / f"export{suffix}"
+
+    assert main_module.export_descriptions(meta_db, str(output)) == 3
+
+    with output.open(encoding="utf-8", newline="") as handle:
+        if suffix == ".csv":
+            records = list(csv.DictReader(handle))
+        else:
+            records = [json.loads(line) for line in handle]
+
+    assert [record["file_path"] for record in records] == [
+        "/photos/0.jpg",
+        "/photos/1.jpg",
+        "/photos/2.jpg",
+    ]
+    assert set(records[0]) == set(main_module.EXPORT_FIELDS)
@@ -0,0 +1,226 @@
+"""
+Unit tests for image_processor_meta Ollama client.
+"""
+
+import pathlib
+import unittest.mock
+
+import pytest
+import src.image_processor_meta.api.ollama_client
+import src.image_processor_meta.exceptions
+
+
+def make_chat_response(content: str, status_code: int = 200) -> unittest.mock.Mock:
+    """Build a mocked chat API response."""
+    mock_response = unittest.mock.Mock()
+    mock_response.status_code = status_code
+    mock_response.text = content
+    mock_response.json.return_value = {"message": {"content": content}}
+    return mock_response
+
+
+def test_generate_description_success(sample_image_small: pathlib.Path):
+    """Test successful description generation through the pooled session."""
+    client = src.image_processor_meta.api.ollama_client.OllamaClient()
+
+    with unittest.mock.patch.object(
+        client.session, "post", return_value=make_chat_response(" A red square. ")
+    ) as mock_post:
+        result = client.generate_description(sample_image_small)
+
+    assert result == "A red square."
+    mock_post.assert_called_once()
+
+
+def test_generate_description_reports_usage(sample_image_small: pathlib.Path):
+    """Test that token counts are passed back through the usage dictionary."""
+    client = src.image_processor_meta.api.ollama_client.OllamaClient()
+    response = make_chat_response("A red square.")
+    response.json.return_value.update({"prompt_eval_count": 580, "eval_count": 42})
+    usage = {}
+
+    with unittest.mock.patch.object(client.session, "post", return_value=response):
+        client.generate_description(sample_image_small, usage=usage)
+
+    assert usage == {"prompt_tokens": 580, "response_tokens": 42}
+    assert client.prompt_hash() != client.prompt_hash("Another prompt")
+
+
+def test_generate_description_server_error(sample_image_small: pathlib.Path):
+    """Test that HTTP 5xx responses raise a connection error."""
+    client = src.image_processor_meta.api.ollama_client.OllamaClient()
+
+    with (
+        unittest.mock.patch("time.sleep"),
+        unittest.mock.patch.object(
+            client.session, "post", return_value=make_chat_response("boom", 500)
+        ) as mock_post,
+        pytest.raises(src.image_processor_meta.exceptions.OllamaConnectionError),
+    ):
+        client.generate_description(sample_image_small)
+
+    assert mock_post.call_count == client.retry_attempts
+
+
+def test_generate_description_not_found_fails_fast(sample_image_small: pathlib.Path):
+    """Test that HTTP 404 is not retried and does not trip the breaker."""
+    client = src.image_processor_meta.api.ollama_client.OllamaClient()
+
+    with (
+        unittest.mock.patch("time.sleep") as mock_sleep,
+        unittest.mock.patch.object(
+            client.session,
+            "post",
+            return_value=make_chat_response('{"error": "model not found"}', 404),
+        ) as mock_post,
+        pytest.raises(src.image_processor_meta.exceptions.OllamaNotFoundError),
+    ):
+        client.generate_description(sample_image_small)
+
+    assert mock_post.call_count == 1
+    mock_sleep.assert_not_called()
+    assert client.breaker.stats()["failure_rate"] == 0.0
+
+
+def test_session_pool_size_is_configurable():
+    """Test that the keep-alive pool honours the requested size."""
+    client = src.image_processor_meta.api.ollama_client.OllamaClient(pool_size=16)
+
+    adapter = client.session.get_adapter(client.endpoint)
+    assert adapter._pool_maxsize == 16
+
+
+def test_shared_session_is_not_closed():
+    """Test that clients leave injected sessions open."""
+    shared_session = unittest.mock.Mock()
+
+    with src.image_processor_meta.api.ollama_client.OllamaClient(
+        session=shared_session
+    ) as client:
+        assert client.session is shared_session
+
+    shared_session.close.assert_not_called()
+
+
+def test_encode_image_downscales_before_upload(tmp_path: pathlib.Path):
+    """Test that large images are preprocessed to the configured max edge."""
+    import base64
+    import io
+
+    import PIL.Image
+
+    image_path = tmp_path / "camera.jpg"
+    PIL.Image.new("RGB", (3000, 2000), color="red").save(image_path, "JPEG")
+
+    client = src.image_processor_meta.api.ollama_client.OllamaClient()
+    client.max_edge = 600
+
+    encoded = client.encode_image(image_path)
+
+    with PIL.Image.open(io.BytesIO(base64.b64decode(encoded))) as image:
+        assert image.size == (600, 400)
+
+    client.preprocess = False
+    assert base64.b64decode(client.encode_image(image_path)) == image_path.read_bytes()
+
+
+def test_generate_description_balances_endpoints(sample_image_small: pathlib.Path):
+    """Test that a retry after a server error goes to another endpoint."""
+    client = src.image_processor_meta.api.ollama_client.OllamaClient(
+        endpoints=["http://gpu1:11434/api/chat", "http://gpu2:11434/api/chat"]
+    )
+
+    with (
+        unittest.mock.patch("time.sleep") as mock_sleep,
+        unittest.mock.patch.object(
+            client.session,
+            "post",
+            side_effect=[make_chat_response("boom", 500), make_chat_response("A cat.")],
+        ) as mock_post,
+    ):
+        assert client.generate_description(sample_image_small) == "A cat."
+
+    assert [call.args[0] for call in mock_post.call_args_list] == [
+        "http://gpu1:11434/api/chat",
+        "http://gpu2:11434/api/chat",
+    ]
+    # Both attempts stream the same body
+    first, second = (call.kwargs["data"] for call in mock_post.call_args_list)
+    assert first is second
+    assert mock_sleep.call_args.args[0] <= client.retry_delay
+    assert [backend["failures"] for backend in client.balancer.stats()] == [1, 0]
+    client.close()
+
+
+def test_warm_up_records_load_time_separately():
+    """Test that warm-up loads the model without touching request statistics."""
+    client = src.image_processor_meta.api.ollama_client.OllamaClient()
+    client.keep_alive = -1
+
+    with unittest.mock.patch.object(
+        client.session, "post", return_value=make_chat_response("")
+    ) as mock_post:
+        latency = client.warm_up()
+
+    assert list(latency) == [client.endpoint]
+    assert mock_post.call_args.kwargs["json"] == {
+        "model": client.model,
+        "messages": [],
+        "keep_alive": -1,
+    }
+    assert client.limiter.stats()["best_latency"] is None
+    assert client.build_payload("abc")["keep_alive"] == -1
+
+
+def test_generate_description_and_filename_uses_json_schema(
+    sample_image_small: pathlib.Path,
+):
+    """Test that the combined request constrains and parses a JSON response."""
+    client = src.image_processor_meta.api.ollama_client.OllamaClient()
+    bodies = []
+
+    def post(url, data, **kwargs):
+        bodies.append(b"".join(data))
+        return make_chat_response(
+            '{"description": "A red square.", "filename": "red square"}'
+        )
+
+    with unittest.mock.patch.object(client.session, "post", side_effect=post):
+        assert client.generate_description_and_filename(sample_image_small) == (
+            "A red square.",
+            "red square",
+        )
+
+    assert b'"format": {"type": "object"' in bodies[0]
+
+
+def test_generate_structured_asks_again_only_on_schema_failures(
+    sample_image_small: pathlib.Path,
+):
+    """Test that invalid JSON is re-asked and persistent failures raise."""
+    client = src.image_processor_meta.api.ollama_client.OllamaClient()
+    client.schema_attempts = 2
+    replies = [
+        '{"title": "", "description": "A red square.", "tags": [], "text": ""}',
+        '{"title": "Red", "description": " A red square. ", "tags": ["red"],'
+        ' "text": ""}',
+    ]
+
+    with unittest.mock.patch.object(
+        client.session,
+        "post",
+        side_effect=[make_chat_response(reply) for reply in replies],
+    ) as mock_post:
+        fields = client.generate_structured(sample_image_small)
+    assert mock_post.call_count == 2
+    assert fields["description"] == "A red square."
+    assert fields["tags"] == ["red"]
+
+    with (
+        unittest.mock.patch.object(
+            client.session, "post", return_value=make_chat_response("not json")
+        ) as mock_post,
+        pytest.raises(src.image_processor_meta.exceptions.OllamaResponseError),
+    ):
+        client.generate_structured(sample_image_small)
+    assert mock_post.call_count == 2
@@ -0,0 +1,116 @@
+"""
+Unit tests for the staged processing pipeline.
+"""
+
+import threading
+import time
+
+import pytest
+import src.image_processor_meta.pipeline
+
+
+def test_pipeline_passes_items_through_all_stages():
+    """Test that every item is transformed by each stage in order."""
+    pipeline = src.image_processor_meta.pipeline.StagedPipeline(
+        [
+            src.image_processor_meta.pipeline.Stage(
+                "double", lambda x: x * 2, workers=2
+            ),
+            src.image_processor_meta.pipeline.Stage(
+                "increment", lambda x: x + 1, workers=3
+            ),
+        ]
+    )
+
+    results = list(pipeline.run(range(20)))
+
+    assert sorted(item for item, _ in results) == [x * 2 + 1 for x in range(20)]
+    assert all(error is None for _, error in results)
+
+
+def test_pipeline_reports_failures_without_stopping():
+    """Test that a failing item is reported and other items still complete."""
+
+    def fail_on_three(x):
+        if x == 3:
+            raise ValueError("bad item")
+        return x
+
+    pipeline = src.image_processor_meta.pipeline.StagedPipeline(
+        [src.image_processor_meta.pipeline.Stage("check", fail_on_three)]
+    )
+
+    results = list(pipeline.run(range(5)))
+
+    failures = [(item, error) for item, error in results if error is not None]
+    assert len(results) == 5
+    assert len(failures) == 1
+    assert failures[0][0] == 3
+    assert isinstance(failures[0][1], ValueError)
+
+
+def test_pipeline_finishes_items_early_on_none():
+    """Test that returning None skips the remaining stages."""
+    seen = []
+
+    pipeline = src.image_processor_meta.pipeline.StagedPipeline(
+        [
+            src.image_processor_meta.pipeline.Stage(
+                "filter", lambda x: x if x % 2 else None
+            ),
+            src.image_processor_meta.pipeline.Stage(
+                "record", lambda x: seen.append(x) or x
+            ),
+        ]
+    )
+
+    results = list(pipeline.run(range(6)))
+
+    assert len(results) == 6
+    assert sorted(seen) == [1, 3, 5]
+
+
+def test_pipeline_runs_stage_workers_concurrently():
+    """Test that a stage with several workers handles items in parallel."""
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def slow(x):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return x
+
+    pipeline = src.image_processor_meta.pipeline.StagedPipeline(
+        [src.image_processor_meta.pipeline.Stage("slow", slow, workers=4, queue_size=4)]
+    )
+
+    list(pipeline.run(range(8)))
+
+    assert peak > 1
+
+
+def test_pipeline_reraises_source_errors():
+    """Test that errors raised while discovering items propagate."""
+
+    def broken_source():
+        yield 1
+        raise OSError("directory vanished")
+
+    pipeline = src.image_processor_meta.pipeline.StagedPipeline(
+        [src.image_processor_meta.pipeline.Stage("noop", lambda x: x)]
+    )
+
+    with pytest.raises(OSError, match="directory vanished"):
+        list(pipeline.run(broken_source()))
+
+
+def test_pipeline_requires_stages():
+    """Test that an empty stage list is rejected."""
+    with pytest.raises(ValueError):
+        src.image_processor_meta.pipeline.StagedPipeline([])
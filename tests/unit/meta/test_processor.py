@@ -0,0 +1,715 @@
+"""
+Unit tests for image_processor_meta ImageProcessor.
+"""
+
+import pathlib
+import unittest.mock
+
+import pytest
+import src.image_processor.jobs
+import src.image_processor.workqueue
+import src.image_processor_meta.api.ollama_client
+import src.image_processor_meta.db.manager
+import src.image_processor_meta.processor
+
+
+@pytest.fixture
+def mock_meta_ollama() -> unittest.mock.Mock:
+    """Mock meta tool Ollama client returning a fixed description."""
+    mock_client = unittest.mock.Mock(
+        spec=src.image_processor_meta.api.ollama_client.OllamaClient
+    )
+    mock_client.generate_description.return_value = "A detailed test description"
+    mock_client.model = "llava"
+    mock_client.prompt_hash.return_value = "0123456789abcdef"
+    return mock_client
+
+
+@pytest.fixture
+def mock_meta_db() -> unittest.mock.Mock:
+    """Mock meta tool database manager with no stored descriptions."""
+    mock_db = unittest.mock.Mock(
+        spec=src.image_processor_meta.db.manager.DatabaseManager
+    )
+    mock_db.get_description.return_value = None
+    mock_db.get_record.return_value = None
+    mock_db.get_description_by_hash.return_value = None
+    mock_db.get_described_paths.return_value = set()
+    return mock_db
+
+
+def _saved_paths(mock_db: unittest.mock.Mock) -> list[str]:
+    """Collect image paths written through batched description saves."""
+    return [
+        record[0]
+        for call in mock_db.save_descriptions_bulk.call_args_list
+        for record in call.args[0]
+    ]
+
+
+@pytest.fixture
+def meta_processor(
+    mock_meta_ollama: unittest.mock.Mock, mock_meta_db: unittest.mock.Mock
+) -> src.image_processor_meta.processor.ImageProcessor:
+    """Create an ImageProcessor with mocked dependencies and no XMP writes."""
+    processor = src.image_processor_meta.processor.ImageProcessor(
+        mock_meta_ollama, mock_meta_db
+    )
+    processor.write_metadata_to_image = unittest.mock.Mock()
+    return processor
+
+
+def test_process_single_image_success(
+    meta_processor: src.image_processor_meta.processor.ImageProcessor,
+    mock_meta_db: unittest.mock.Mock,
+    sample_image_small: pathlib.Path,
+):
+    """Test that a single image is described, saved and tagged."""
+    assert meta_processor.process_single_image(sample_image_small) is True
+
+    content_hash = meta_processor.compute_content_hash(sample_image_small)
+    mock_meta_db.save_description.assert_called_once_with(
+        str(sample_image_small),
+        "A detailed test description",
+        content_hash,
+        {
+            "model": "llava",
+            "prompt_hash": "0123456789abcdef",
+            "inference_ms": unittest.mock.ANY,
+            "image_width": 10,
+            "image_height": 10,
+        },
+    )
+    meta_processor.write_metadata_to_image.assert_called_once_with(
+        sample_image_small, "A detailed test description", None
+    )
+
+
+def test_combined_mode_describes_and_renames_in_one_request(
+    meta_processor: src.image_processor_meta.processor.ImageProcessor,
+    mock_meta_ollama: unittest.mock.Mock,
+    mock_meta_db: unittest.mock.Mock,
+    sample_image_small: pathlib.Path,
+):
+    """Test that combined mode renames the image before saving and tagging it."""
+    mock_meta_ollama.combined_prompt = "Describe and name this image."
+    mock_meta_ollama.generate_structured.return_value = {
+        "description": "A red square.",
+        "filename": "Red Square!.JPG",
+    }
+    taken = sample_image_small.with_name("red-square.jpg")
+    taken.write_bytes(b"another image")
+    meta_processor.rename_files = True
+
+    assert meta_processor.process_single_image(sample_image_small) is True
+
+    renamed = sample_image_small.with_name("red-square-2.jpg")
+    assert renamed.exists() and not sample_image_small.exists()
+    mock_meta_ollama.generate_description.assert_not_called()
+    mock_meta_ollama.prompt_hash.assert_called_once_with()
+    assert mock_meta_db.save_description.call_args.args[:2] == (
+        str(renamed),
+        "A red square.",
+    )
+    meta_processor.write_metadata_to_image.assert_called_once_with(
+        renamed, "A red square.", mock_meta_ollama.generate_structured.return_value
+    )
+
+
+def test_renamed_images_are_unchanged_on_later_runs(
+    meta_processor: src.image_processor_meta.processor.ImageProcessor,
+    mock_meta_ollama: unittest.mock.Mock,
+    temp_image_dir: pathlib.Path,
+    tmp_path: pathlib.Path,
+):
+    """Test that renamed images enter the manifest and match the prompt."""
+    meta_processor.db_manager = src.image_processor_meta.db.manager.DatabaseManager(
+        str(tmp_path / "meta.db")
+    )
+    mock_meta_ollama.combined_prompt = "Describe and name this image."
+    mock_meta_ollama.generate_structured.return_value = {
+        "description": "A test image.",
+        "filename": "test image",
+    }
+    meta_processor.rename_files = True
+
+    first = meta_processor.process_directory(
+        temp_image_dir, sanitize_names=False, show_progress=False, incremental=True
+    )
+    rerun = meta_processor.process_directory(
+        temp_image_dir, sanitize_names=False, show_progress=False, incremental=True
+    )
+    redescribe = meta_processor.redescribe_directory(
+        temp_image_dir, where="prompt", show_progress=False
+    )
+
+    assert first["processed"] == 3
+    assert (rerun["total_files"], rerun["unchanged"]) == (0, 3)
+    assert (redescribe["total_files"], redescribe["remaining"]) == (0, 0)
+    assert mock_meta_ollama.generate_structured.call_count == 3
+
+
+def test_structured_mode_embeds_title_and_tags(
+    meta_processor: src.image_processor_meta.processor.ImageProcessor,
+    mock_meta_ollama: unittest.mock.Mock,
+    mock_meta_db: unittest.mock.Mock,
+    sample_image_small: pathlib.Path,
+):
+    """Test that structured mode stores the description and passes on the fields."""
+    fields = {
+        "title": "Red square",
+        "description": "A red square.",
+        "tags": ["red", "square"],
+        "text": "",
+    }
+    mock_meta_ollama.structured_request.return_value = ({}, "Describe as JSON.")
+    mock_meta_ollama.generate_structured.return_value = fields
+    meta_processor.structured = True
+
+    assert meta_processor.process_single_image(sample_image_small) is True
+
+    mock_meta_ollama.structured_request.assert_any_call(filename=False)
+    mock_meta_ollama.generate_description.assert_not_called()
+    mock_meta_ollama.prompt_hash.assert_called_once_with("Describe as JSON.")
+    assert mock_meta_db.save_description.call_args.args[1] == "A red square."
+    meta_processor.write_metadata_to_image.assert_called_once_with(
+        sample_image_small, "A red square.", fields
+    )
+
+
+def test_structured_rows_match_the_prompt_on_redescribe(
+    meta_processor: src.image_processor_meta.processor.ImageProcessor,
+    mock_meta_ollama: unittest.mock.Mock,
+    temp_image_dir: pathlib.Path,
+    tmp_path: pathlib.Path,
+):
+    """Test that structured descriptions are not outdated under the same prompt."""
+    client = src.image_processor_meta.api.ollama_client.OllamaClient()
+    mock_meta_ollama.prompt_hash.side_effect = client.prompt_hash
+    mock_meta_ollama.structured_request.side_effect = client.structured_request
+    mock_meta_ollama.generate_structured.return_value = {
+        "title": "Test",
+        "description": "A test image.",
+        "tags": [],
+        "text": "",
+    }
+    meta_processor.db_manager = src.image_processor_meta.db.manager.DatabaseManager(
+        str(tmp_path / "meta.db")
+    )
+    meta_processor.structured = True
+
+    first = meta_processor.process_directory(
+        temp_image_dir, sanitize_names=False, show_progress=False
+    )
+    redescribe = meta_processor.redescribe_directory(
+        temp_image_dir, where="any", show_progress=False
+    )
+
+    assert first["processed"] == 3
+    assert (redescribe["total_files"], redescribe["remaining"]) == (0, 0)
+    assert mock_meta_ollama.generate_structured.call_count == 3
+
+
+def test_process_single_image_skips_existing(
+    meta_processor: src.image_processor_meta.processor.ImageProcessor,
+    mock_meta_ollama: unittest.mock.Mock,
+    mock_meta_db: unittest.mock.Mock,
+    sample_image_small: pathlib.Path,
+):
+    """Test that images with stored descriptions are not sent to the model."""
+    mock_meta_db.get_record.return_value = {
+        "description": "Already described",
+        "content_hash": None,
+        "tagged_hash": None,
+    }
+
+    assert meta_processor.process_single_image(sample_image_small) is True
+    mock_meta_ollama.generate_description.assert_not_called()
+
+
+def test_process_single_image_reuses_description_of_copy(
+    meta_processor: src.image_processor_meta.processor.ImageProcessor,
+    mock_meta_ollama: unittest.mock.Mock,
+    mock_meta_db: unittest.mock.Mock,
+    sample_image_small: pathlib.Path,
+):
+    """Test that a moved or copied image reuses the description by content hash."""
+    mock_meta_db.get_description_by_hash.return_value = {
+        "file_path": "/elsewhere/original.jpg",
+        "description": "Stored description",
+    }
+
+    assert meta_processor.process_single_image(sample_image_small) is True
+
+    mock_meta_ollama.generate_description.assert_not_called()
+    mock_meta_db.save_description.assert_called_once_with(
+        str(sample_image_small),
+        "Stored description",
+        meta_processor.compute_content_hash(sample_image_small),
+        None,
+    )
+
+
+def test_identical_untagged_copy_is_served_from_cache(
+    meta_processor: src.image_processor_meta.processor.ImageProcessor,
+    mock_meta_ollama: unittest.mock.Mock,
+    sample_image_small: pathlib.Path,
+    tmp_path: pathlib.Path,
+):
+    """Test that a copy of an image matches after the original was tagged."""
+    db = src.image_processor_meta.db.manager.DatabaseManager(str(tmp_path / "meta.db"))
+    meta_processor.db_manager = db
+    copy = sample_image_small.with_name("copy.jpg")
+    copy.write_bytes(sample_image_small.read_bytes())
+    source_hash = meta_processor.compute_content_hash(sample_image_small)
+
+    def write_xmp(file_path, description, fields=None):
+        with file_path.open("ab") as image_file:
+            image_file.write(b"<xmp/>")
+
+    meta_processor.write_metadata_to_image.side_effect = write_xmp
+
+    assert meta_processor.process_single_image(sample_image_small) is True
+    assert meta_processor.process_single_image(copy) is True
+
+    mock_meta_ollama.generate_description.assert_called_once()
+    assert db.get_description(str(copy)) == "A detailed test description"
+    tagged_hash = meta_processor.compute_content_hash(sample_image_small)
+    assert tagged_hash != source_hash
+    assert db.get_description_by_hash(source_hash) is not None
+    assert db.get_description_by_hash(tagged_hash)["file_path"] == str(
+        sample_image_small
+    )
+
+
+def test_content_hash_recognises_renamed_image(
+    meta_processor: src.image_processor_meta.processor.ImageProcessor,
+    mock_meta_ollama: unittest.mock.Mock,
+    sample_image_small: pathlib.Path,
+    tmp_path: pathlib.Path,
+):
+    """Test that a renamed image is matched through a real database."""
+    db = src.image_processor_meta.db.manager.DatabaseManager(str(tmp_path / "meta.db"))
+    meta_processor.db_manager = db
+
+    assert meta_processor.process_single_image(sample_image_small) is True
+
+    renamed = sample_image_small.with_name("renamed.jpg")
+    sample_image_small.rename(renamed)
+
+    assert meta_processor.process_single_image(renamed) is True
+    mock_meta_ollama.generate_description.assert_called_once()
+    assert db.get_description(str(renamed)) == "A detailed test description"
+
+
+def test_process_directory_skips_described_images(
+    meta_processor: src.image_processor_meta.processor.ImageProcessor,
+    mock_meta_ollama: unittest.mock.Mock,
+    temp_image_dir: pathlib.Path,
+    tmp_path: pathlib.Path,
+):
+    """Test that a rerun skips described images before they are validated."""
+    meta_processor.db_manager = src.image_processor_meta.db.manager.DatabaseManager(
+        str(tmp_path / "meta.db")
+    )
+    meta_processor.process_directory(
+        temp_image_dir, sanitize_names=False, show_progress=False
+    )
+
+    with unittest.mock.patch.object(meta_processor, "validate_image_file") as validate:
+        rerun = meta_processor.process_directory(
+            temp_image_dir, sanitize_names=False, show_progress=False
+        )
+
+    assert rerun["total_files"] == 0
+    assert rerun["described"] == 3
+    validate.assert_not_called()
+    assert mock_meta_ollama.generate_description.call_count == 3
+
+
+def test_process_directory_redescribes_images_changed_on_disk(
+    meta_processor: src.image_processor_meta.processor.ImageProcessor,
+    mock_meta_ollama: unittest.mock.Mock,
+    temp_image_dir: pathlib.Path,
+    tmp_path: pathlib.Path,
+):
+    """Test that a plain rerun checks described images against the manifest."""
+    db = src.image_processor_meta.db.manager.DatabaseManager(str(tmp_path / "meta.db"))
+    meta_processor.db_manager = db
+    meta_processor.process_directory(
+        temp_image_dir, sanitize_names=False, show_progress=False
+    )
+    # Described before the manifest existed, e.g. by an older release
+    legacy = str(temp_image_dir / "sample_1.png")
+    db.delete_manifest_entries([legacy])
+
+    edited = temp_image_dir / "sample_0.jpg"
+    edited.write_bytes(edited.read_bytes() + b"\0")
+    mock_meta_ollama.generate_description.return_value = "An edited image"
+    rerun = meta_processor.process_directory(
+        temp_image_dir, sanitize_names=False, show_progress=False
+    )
+
+    assert (rerun["processed"], rerun["described"]) == (1, 2)
+    assert db.get_description(str(edited)) == "An edited image"
+    assert legacy in db.get_manifest(str(temp_image_dir))
+    assert mock_meta_ollama.generate_description.call_count == 4
+
+
+@pytest.mark.parametrize("pipeline", [False, True])
+def test_redescribe_directory_replaces_outdated_descriptions(
+    meta_processor: src.image_processor_meta.processor.ImageProcessor,
+    mock_meta_ollama: unittest.mock.Mock,
+    temp_image_dir: pathlib.Path,
+    tmp_path: pathlib.Path,
+    pipeline: bool,
+):
+    """Test that capped runs redescribe rows from an older model, oldest first."""
+    db = src.image_processor_meta.db.manager.DatabaseManager(str(tmp_path / "meta.db"))
+    meta_processor.db_manager = db
+    meta_processor.process_directory(
+        temp_image_dir, sanitize_names=False, show_progress=False
+    )
+    missing = str(temp_image_dir / "deleted.jpg")
+    db.save_description(missing, "Gone", details={"model": "llava"})
+    with db.connection() as conn:
+        conn.execute(
+            "UPDATE images SET updated_at = '2020-01-01' WHERE file_path = ?",
+            (missing,),
+        )
+
+    mock_meta_ollama.model = "llava:13b"
+    mock_meta_ollama.generate_description.return_value = "A sharper description"
+    first = meta_processor.redescribe_directory(
+        temp_image_dir, where="model", limit=2, show_progress=False, pipeline=pipeline
+    )
+    rest = meta_processor.redescribe_directory(
+        temp_image_dir, where="model", limit=None, show_progress=False
+    )
+
+    assert (first["processed"], first["missing"], first["remaining"]) == (2, 1, 2)
+    assert (rest["processed"], rest["remaining"]) == (1, 1)
+    assert mock_meta_ollama.generate_description.call_count == 6
+    with db.connection() as conn:
+        rows = conn.execute(
+            "SELECT model, description FROM images WHERE file_path != ?", (missing,)
+        ).fetchall()
+    assert {tuple(row) for row in rows} == {("llava:13b", "A sharper description")}
+
+
+@pytest.mark.parametrize("pipeline", [False, True])
+def test_process_directory_modes_agree(
+    meta_processor: src.image_processor_meta.processor.ImageProcessor,
+    mock_meta_ollama: unittest.mock.Mock,
+    temp_image_dir: pathlib.Path,
+    pipeline: bool,
+):
+    """Test that serial and pipeline modes process the same images."""
+    meta_processor.concurrency = 2
+
+    results = meta_processor.process_directory(
+        temp_image_dir, sanitize_names=False, show_progress=False, pipeline=pipeline
+    )
+
+    assert results["total_files"] == 3
+    assert results["processed"] == 3
+    assert results["failed"] == 0
+    assert mock_meta_ollama.generate_description.call_count == 3
+
+
+def test_process_directory_pipeline_counts_failures(
+    meta_processor: src.image_processor_meta.processor.ImageProcessor,
+    mock_meta_ollama: unittest.mock.Mock,
+    temp_image_dir: pathlib.Path,
+):
+    """Test that inference failures are counted in pipeline mode."""
+    mock_meta_ollama.generate_description.side_effect = [
+        "First description",
+        RuntimeError("model crashed"),
+        "Third description",
+    ]
+
+    results = meta_processor.process_directory(
+        temp_image_dir, sanitize_names=False, show_progress=False, pipeline=True
+    )
+
+    assert results["processed"] == 2
+    assert results["failed"] == 1
+    assert meta_processor.write_metadata_to_image.call_count == 2
+
+
+def test_aprocess_directory(
+    meta_processor: src.image_processor_meta.processor.ImageProcessor,
+    mock_meta_db: unittest.mock.Mock,
+    temp_image_dir: pathlib.Path,
+):
+    """Test async directory processing with an injected async client."""
+    import asyncio
+
+    async_client = unittest.mock.Mock()
+    async_client.max_in_flight = 2
+    async_client.agenerate_description = unittest.mock.AsyncMock(
+        return_value="An async description"
+    )
+
+    results = asyncio.run(
+        meta_processor.aprocess_directory(
+            temp_image_dir,
+            sanitize_names=False,
+            show_progress=False,
+            client=async_client,
+        )
+    )
+
+    assert results["processed"] == 3
+    assert results["failed"] == 0
+    assert async_client.agenerate_description.await_count == 3
+    assert len(set(_saved_paths(mock_meta_db))) == 3
+    mock_meta_db.save_description.assert_not_called()
+
+
+def test_process_directory_incremental(
+    meta_processor: src.image_processor_meta.processor.ImageProcessor,
+    mock_meta_ollama: unittest.mock.Mock,
+    temp_image_dir: pathlib.Path,
+    tmp_path: pathlib.Path,
+):
+    """Test that incremental runs only process new or changed images."""
+    meta_processor.db_manager = src.image_processor_meta.db.manager.DatabaseManager(
+        str(tmp_path / "meta.db")
+    )
+
+    first = meta_processor.process_directory(
+        temp_image_dir, sanitize_names=False, show_progress=False, incremental=True
+    )
+    assert first["processed"] == 3
+
+    unchanged = meta_processor.process_directory(
+        temp_image_dir, sanitize_names=False, show_progress=False, incremental=True
+    )
+    assert unchanged["total_files"] == 0
+    assert unchanged["unchanged"] == 3
+
+    (temp_image_dir / "sample_1.png").unlink()
+    new_image = temp_image_dir / "nested" / "new.jpg"
+    new_image.parent.mkdir()
+    new_image.write_bytes((temp_image_dir / "sample_0.jpg").read_bytes() + b"\0")
+
+    rescan = meta_processor.process_directory(
+        temp_image_dir, sanitize_names=False, show_progress=False, incremental=True
+    )
+
+    assert rescan["total_files"] == 1
+    assert rescan["processed"] == 1
+    assert rescan["unchanged"] == 2
+    assert rescan["deleted"] == 1
+    assert mock_meta_ollama.generate_description.call_count == 4
+
+
+def test_incremental_run_records_described_and_redescribes_changed(
+    meta_processor: src.image_processor_meta.processor.ImageProcessor,
+    mock_meta_ollama: unittest.mock.Mock,
+    temp_image_dir: pathlib.Path,
+    tmp_path: pathlib.Path,
+):
+    """Test that described images enter the manifest and edited ones are redone."""
+    meta_processor.db_manager = src.image_processor_meta.db.manager.DatabaseManager(
+        str(tmp_path / "meta.db")
+    )
+    full = meta_processor.process_directory(
+        temp_image_dir, sanitize_names=False, show_progress=False
+    )
+    assert full["processed"] == 3
+    # Described before the manifest existed, e.g. by an older release
+    manifest = meta_processor.db_manager.get_manifest(str(temp_image_dir))
+    meta_processor.db_manager.delete_manifest_entries(list(manifest))
+
+    first = meta_processor.process_directory(
+        temp_image_dir, sanitize_names=False, show_progress=False, incremental=True
+    )
+    assert first["described"] == 3
+    second = meta_processor.process_directory(
+        temp_image_dir, sanitize_names=False, show_progress=False, incremental=True
+    )
+    assert second["unchanged"] == 3
+    assert mock_meta_ollama.generate_description.call_count == 3
+
+    edited = temp_image_dir / "sample_0.jpg"
+    edited.write_bytes(edited.read_bytes() + b"\0")
+    mock_meta_ollama.generate_description.return_value = "An edited image"
+
+    rescan = meta_processor.process_directory(
+        temp_image_dir, sanitize_names=False, show_progress=False, incremental=True
+    )
+
+    assert rescan["processed"] == 1
+    assert mock_meta_ollama.generate_description.call_count == 4
+    assert meta_processor.db_manager.get_description(str(edited)) == "An edited image"
+
+
+@pytest.mark.parametrize("pipeline", [False, True])
+def test_process_directory_streaming(
+    meta_processor: src.image_processor_meta.processor.ImageProcessor,
+    mock_meta_ollama: unittest.mock.Mock,
+    temp_image_dir: pathlib.Path,
+    pipeline: bool,
+):
+    """Test that streaming discovery processes and counts every image."""
+    results = meta_processor.process_directory(
+        temp_image_dir,
+        sanitize_names=False,
+        show_progress=False,
+        pipeline=pipeline,
+        stream=True,
+    )
+
+    assert results["total_files"] == 3
+    assert results["processed"] == 3
+    assert mock_meta_ollama.generate_description.call_count == 3
+
+
+def test_process_directory_streaming_sanitizes_during_walk(
+    meta_processor: src.image_processor_meta.processor.ImageProcessor,
+    mock_meta_db: unittest.mock.Mock,
+    temp_image_dir: pathlib.Path,
+):
+    """Test that streaming sanitizes filenames in the discovery walk."""
+    (temp_image_dir / "sample_0.jpg").rename(temp_image_dir / "My Photo (1).jpg")
+
+    results = meta_processor.process_directory(
+        temp_image_dir, show_progress=False, stream=True
+    )
+
+    assert results["renamed"] == 3
+    assert results["processed"] == 3
+    assert str(temp_image_dir / "My-Photo-1.jpg") in _saved_paths(mock_meta_db)
+
+
+def test_aprocess_directory_streaming(
+    meta_processor: src.image_processor_meta.processor.ImageProcessor,
+    temp_image_dir: pathlib.Path,
+):
+    """Test async processing fed by streaming discovery."""
+    import asyncio
+
+    async_client = unittest.mock.Mock()
+    async_client.max_in_flight = 2
+    async_client.agenerate_description = unittest.mock.AsyncMock(
+        return_value="An async description"
+    )
+
+    results = asyncio.run(
+        meta_processor.aprocess_directory(
+            temp_image_dir,
+            sanitize_names=False,
+            show_progress=False,
+            client=async_client,
+            stream=True,
+        )
+    )
+
+    assert results["total_files"] == 3
+    assert results["processed"] == 3
+
+
+def test_process_directory_resumes_interrupted_job(
+    meta_processor: src.image_processor_meta.processor.ImageProcessor,
+    mock_meta_ollama: unittest.mock.Mock,
+    temp_image_dir: pathlib.Path,
+    tmp_path: pathlib.Path,
+):
+    """Test that a resumed job skips discovery and finishes the remaining images."""
+    mock_meta_ollama.generate_description.side_effect = [
+        "First description",
+        KeyboardInterrupt,
+        "Second description",
+        "Third description",
+    ]
+
+    with src.image_processor.jobs.JobStore(tmp_path / "jobs.db") as job_store:
+        job_id = job_store.create_job("meta", str(temp_image_dir))
+        with pytest.raises(KeyboardInterrupt):
+            meta_processor.process_directory(
+                temp_image_dir,
+                sanitize_names=False,
+                show_progress=False,
+                job_store=job_store,
+                job_id=job_id,
+            )
+        interrupted = job_store.get_job(job_id)
+
+        with unittest.mock.patch.object(meta_processor, "_discover_images") as discover:
+            results = meta_processor.process_directory(
+                temp_image_dir,
+                sanitize_names=False,
+                show_progress=False,
+                job_store=job_store,
+                job_id=job_id,
+            )
+        job = job_store.get_job(job_id)
+
+    assert interrupted["status"] == "interrupted"
+    assert interrupted["items"] == {"pending": 2, "done": 1, "failed": 0}
+    discover.assert_not_called()
+    assert (results["processed"], results["failed"]) == (2, 0)
+    assert job["status"] == "completed"
+    assert job["items"]["done"] == 3
+
+
+def test_process_directory_records_job_states_in_batches(
+    meta_processor: src.image_processor_meta.processor.ImageProcessor,
+    mock_meta_ollama: unittest.mock.Mock,
+    temp_image_dir: pathlib.Path,
+    tmp_path: pathlib.Path,
+):
+    """Test that a job run marks its items in one write per batch and state."""
+    mock_meta_ollama.generate_description.side_effect = [
+        "First description",
+        RuntimeError("model crashed"),
+        "Third description",
+    ]
+
+    with src.image_processor.jobs.JobStore(tmp_path / "jobs.db") as job_store:
+        job_id = job_store.create_job("meta", str(temp_image_dir))
+        with unittest.mock.patch.object(
+            job_store, "mark", wraps=job_store.mark
+        ) as mark:
+            meta_processor.process_directory(
+                temp_image_dir,
+                sanitize_names=False,
+                show_progress=False,
+                job_store=job_store,
+                job_id=job_id,
+            )
+        job = job_store.get_job(job_id)
+
+    assert sorted(call.args[2] for call in mark.call_args_list) == ["done", "failed"]
+    assert job["items"] == {"pending": 0, "done": 2, "failed": 1}
+
+
+def test_process_queue_drains_and_retries_failures(
+    meta_processor: src.image_processor_meta.processor.ImageProcessor,
+    mock_meta_ollama: unittest.mock.Mock,
+    mock_meta_db: unittest.mock.Mock,
+    temp_image_dir: pathlib.Path,
+    tmp_path: pathlib.Path,
+):
+    """Test that a worker processes every queued image and retries a failure."""
+    mock_meta_ollama.generate_description.side_effect = [
+        "First description",
+        RuntimeError("model crashed"),
+        "Second description",
+        "Third description",
+    ]
+
+    with src.image_processor.workqueue.WorkQueue(tmp_path / "queue.db") as queue:
+        enqueued = meta_processor.enqueue_directory(
+            temp_image_dir, queue, sanitize_names=False
+        )
+        results = meta_processor.process_queue(queue, "host-1", show_progress=False)
+        counts = queue.counts()
+
+    assert enqueued["enqueued"] == 3
+    assert (results["processed"], results["failed"]) == (3, 1)
+    assert counts == {"pending": 0, "leased": 0, "done": 3, "failed": 0}
+    assert len(_saved_paths(mock_meta_db)) == 3
@@ -0,0 +1,116 @@
+"""
+Unit tests for image_processor_name async Ollama client.
+"""
+
+import asyncio
+import json
+import pathlib
+import unittest.mock
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+import src.image_processor_name.async_ollama_client  # noqa: E402
+
+
+def make_client(handler, max_in_flight: int = 2) -> src.image_processor_name.async_ollama_client.AsyncOllamaClient:
+    """Create an async client whose HTTP traffic is served by handler."""
+    client = src.image_processor_name.async_ollama_client.AsyncOllamaClient(max_in_flight=max_in_flight)
+    client.retry_delay = 0
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_agenerate_filename_success(sample_image_small: pathlib.Path):
+    """Test successful async filename generation."""
+
+    def handler(request):
+        return httpx.Response(200, json={"response": " sunny beach day "})
+
+    async def run():
+        async with make_client(handler) as client:
+            return await client.agenerate_filename(sample_image_small)
+
+    assert asyncio.run(run()) == "sunny beach day"
+
+
+def test_agenerate_filename_retries_connection_errors(sample_image_small: pathlib.Path):
+    """Test that transient connection errors are retried without blocking."""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            raise httpx.ConnectError("connection refused")
+        return httpx.Response(200, json={"response": "second time lucky"})
+
+    async def run():
+        async with make_client(handler) as client:
+            return await client.agenerate_filename(sample_image_small)
+
+    with unittest.mock.patch("asyncio.sleep", new=unittest.mock.AsyncMock()) as mock_sleep:
+        assert asyncio.run(run()) == "second time lucky"
+
+    assert len(calls) == 2
+    mock_sleep.assert_awaited_once()
+
+
+def test_agenerate_filename_timeout_raises(sample_image_small: pathlib.Path):
+    """Test that repeated timeouts surface as OllamaTimeoutError."""
+
+    def handler(request):
+        raise httpx.ReadTimeout("too slow")
+
+    async def run():
+        async with make_client(handler) as client:
+            await client.agenerate_filename(sample_image_small)
+
+    with pytest.raises(Exception, match="timed out") as excinfo:
+        asyncio.run(run())
+
+    # Compare by name: the client module resolves exceptions via the installed package
+    assert excinfo.type.__name__ == "OllamaTimeoutError"
+
+
+def test_in_flight_requests_are_bounded(sample_image_small: pathlib.Path):
+    """Test that no more than max_in_flight requests run at once."""
+    active = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return httpx.Response(200, json={"response": "bounded"})
+
+    async def run():
+        async with make_client(handler, max_in_flight=2) as client:
+            await asyncio.gather(*(client.agenerate_filename(sample_image_small) for _ in range(6)))
+
+    asyncio.run(run())
+
+    assert peak == 2
+
+
+def test_agenerate_filename_stops_reading_stream_early(sample_image_small: pathlib.Path):
+    """Test that the streamed response is abandoned once the answer line ends."""
+    sent = []
+
+    async def chunks():
+        for text in ["foggy", " harbor\n", "The image shows"]:
+            sent.append(text)
+            yield json.dumps({"response": text, "done": False}).encode() + b"\n"
+
+    def handler(request):
+        assert b'"stream": true' in request.read()
+        return httpx.Response(200, content=chunks())
+
+    async def run():
+        async with make_client(handler) as client:
+            return await client.agenerate_filename(sample_image_small)
+
+    assert asyncio.run(run()) == "foggy harbor"
+    assert sent == ["foggy", " harbor\n"]
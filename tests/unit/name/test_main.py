@@ -112,6 +112,7 @@ def test_test_ollama_connection_failure(capsys):
 def test_handle_rename_command_file_success(sample_image_small: pathlib.Path):
     """Test successful rename of single file."""
     args = unittest.mock.MagicMock()
+    args.resume = None
     args.path = str(sample_image_small)
     args.dry_run = False
     args.recursive = False
@@ -140,6 +141,7 @@ def test_handle_rename_command_file_success(sample_image_small: pathlib.Path):
 def test_handle_rename_command_file_not_found():
     """Test rename command with non-existent file."""
     args = unittest.mock.MagicMock()
+    args.resume = None
     args.path = "/does/not/exist.jpg"
     args.dry_run = False
 
@@ -154,6 +156,7 @@ def test_handle_rename_command_unsupported_format(temp_dir: pathlib.Path):
     unsupported_file.write_text("Not an image")
 
     args = unittest.mock.MagicMock()
+    args.resume = None
     args.path = str(unsupported_file)
     args.dry_run = False
 
@@ -168,16 +171,20 @@ def test_handle_rename_command_unsupported_format(temp_dir: pathlib.Path):
 
 
 def test_handle_rename_command_directory_success(temp_image_dir: pathlib.Path):
-    """Test successful directory rename operation."""
+    """Test successful directory rename operation recorded as a job."""
     args = unittest.mock.MagicMock()
+    args.resume = None
+    args.job = True
     args.path = str(temp_image_dir)
     args.dry_run = False
     args.recursive = True
     args.quiet = False
+    args.use_async = False
 
     with (
         unittest.mock.patch("image_processor_name.ollama_client.OllamaClient"),
         unittest.mock.patch("image_processor_name.file_operations.FileOperations"),
+        unittest.mock.patch("image_processor.jobs.JobStore") as mock_job_store_class,
         unittest.mock.patch("image_processor_name.renamer.ImageRenamer") as mock_renamer_class,
     ):
         mock_renamer = unittest.mock.Mock()
@@ -195,19 +202,25 @@ def test_handle_rename_command_directory_success(temp_image_dir: pathlib.Path):
 
         assert result == 0
         mock_renamer.rename_directory.assert_called_once()
+        job_store = mock_job_store_class.return_value
+        job_store.create_job.assert_called_once_with("rename", str(temp_image_dir.resolve()), {"recursive": True})
+        assert mock_renamer.rename_directory.call_args.kwargs["job_id"] == job_store.create_job.return_value
 
 
 def test_handle_rename_command_directory_with_failures(temp_image_dir: pathlib.Path):
     """Test directory rename with some failures."""
     args = unittest.mock.MagicMock()
+    args.resume = None
     args.path = str(temp_image_dir)
     args.dry_run = False
     args.recursive = False
     args.quiet = False
+    args.use_async = False
 
     with (
         unittest.mock.patch("image_processor_name.ollama_client.OllamaClient"),
         unittest.mock.patch("image_processor_name.file_operations.FileOperations"),
+        unittest.mock.patch("image_processor.jobs.JobStore"),
         unittest.mock.patch("image_processor_name.renamer.ImageRenamer") as mock_renamer_class,
     ):
         mock_renamer = unittest.mock.Mock()
@@ -226,9 +239,46 @@ def test_handle_rename_command_directory_with_failures(temp_image_dir: pathlib.P
         assert result == 1  # Should return error code when there are failures
 
 
+def test_handle_rename_command_directory_async(temp_image_dir: pathlib.Path):
+    """Test directory rename through the asyncio entry point."""
+    args = unittest.mock.MagicMock()
+    args.resume = None
+    args.path = str(temp_image_dir)
+    args.dry_run = False
+    args.recursive = False
+    args.quiet = True
+    args.use_async = True
+
+    with (
+        unittest.mock.patch("image_processor_name.ollama_client.OllamaClient"),
+        unittest.mock.patch("image_processor_name.file_operations.FileOperations"),
+        unittest.mock.patch("image_processor.jobs.JobStore"),
+        unittest.mock.patch("image_processor_name.renamer.ImageRenamer") as mock_renamer_class,
+    ):
+        mock_renamer = unittest.mock.Mock()
+        mock_renamer.test_connection.return_value = True
+        mock_renamer.arename_directory = unittest.mock.AsyncMock(
+            return_value={
+                "total_files": 3,
+                "processed": 3,
+                "failed": 0,
+                "skipped": 0,
+                "processing_time": 0.5,
+            }
+        )
+        mock_renamer_class.return_value = mock_renamer
+
+        result = main_module.handle_rename_command(args)
+
+        assert result == 0
+        mock_renamer.arename_directory.assert_awaited_once()
+        mock_renamer.rename_directory.assert_not_called()
+
+
 def test_handle_rename_command_connection_failure(sample_image_small: pathlib.Path):
     """Test rename command when Ollama connection fails."""
     args = unittest.mock.MagicMock()
+    args.resume = None
     args.path = str(sample_image_small)
     args.dry_run = False
 
@@ -249,6 +299,7 @@ def test_handle_rename_command_connection_failure(sample_image_small: pathlib.Pa
 def test_handle_rename_command_dry_run(sample_image_small: pathlib.Path):
     """Test rename command in dry run mode."""
     args = unittest.mock.MagicMock()
+    args.resume = None
     args.path = str(sample_image_small)
     args.dry_run = True
     args.recursive = False
@@ -440,3 +491,64 @@ def test_main_unexpected_error(mock_setup_logging):
         result = main_module.main()
 
         assert result == 1
+
+
+def test_handle_rename_command_rejects_dry_run_resume():
+    """Test that a dry run cannot resume, and so cannot mark a job's images done."""
+    args = unittest.mock.MagicMock()
+    args.resume = "3f2a9c1b7d4e"
+    args.dry_run = True
+
+    with unittest.mock.patch("image_processor.jobs.JobStore") as mock_job_store_class:
+        assert main_module.handle_rename_command(args) == 1
+
+    mock_job_store_class.assert_not_called()
+
+
+def test_handle_rename_command_records_jobs_only_on_request(temp_image_dir: pathlib.Path):
+    """Test that directory runs are not recorded as jobs without --job."""
+    args = unittest.mock.MagicMock()
+    args.resume = None
+    args.job = False
+    args.path = str(temp_image_dir)
+    args.dry_run = False
+    args.use_async = False
+
+    with (
+        unittest.mock.patch("image_processor_name.ollama_client.OllamaClient"),
+        unittest.mock.patch("image_processor_name.file_operations.FileOperations"),
+        unittest.mock.patch("image_processor.jobs.JobStore") as mock_job_store_class,
+        unittest.mock.patch("image_processor_name.renamer.ImageRenamer") as mock_renamer_class,
+    ):
+        mock_renamer = mock_renamer_class.return_value
+        mock_renamer.test_connection.return_value = True
+        mock_renamer.rename_directory.return_value = {
+            "total_files": 3,
+            "processed": 3,
+            "failed": 0,
+            "skipped": 0,
+            "processing_time": 1.5,
+        }
+
+        assert main_module.handle_rename_command(args) == 0
+
+    mock_job_store_class.assert_not_called()
+    assert mock_renamer.rename_directory.call_args.kwargs["job_id"] is None
+
+
+def test_open_job_store_uses_configured_settings(temp_dir: pathlib.Path):
+    """Test that the job store opens under the data directory with the configured pragmas."""
+    settings = {"jobs.database": "jobs.db", "jobs.journal_mode": "delete", "jobs.busy_timeout": 2.0}
+
+    with (
+        unittest.mock.patch("image_processor_name.DATA_DIR", temp_dir),
+        unittest.mock.patch(
+            "image_processor_name.config_manager.config.get",
+            side_effect=lambda key, default=None: settings.get(key, default),
+        ),
+        main_module.open_job_store() as job_store,
+    ):
+        journal_mode = job_store._conn.execute("PRAGMA journal_mode").fetchone()[0]
+
+    assert job_store.db_path == temp_dir / "jobs.db"
+    assert journal_mode == "delete"
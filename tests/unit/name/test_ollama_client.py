@@ -3,6 +3,7 @@ Unit tests for image_processor_name Ollama client.
 """
 
 import base64
+import json
 import pathlib
 import unittest.mock
 
@@ -53,14 +54,17 @@ def test_encode_image_success(sample_image_small: pathlib.Path):
             pytest.fail("Encoded string is not valid base64")
 
 
-@unittest.mock.patch("image_processor_name.ollama_client.requests.post")
+@unittest.mock.patch("image_processor_name.ollama_client.requests.Session.post")
 def test_generate_filename_success(mock_post: unittest.mock.Mock, sample_image_small: pathlib.Path):
     """Test successful filename generation."""
     # Mock successful API response
     mock_response = unittest.mock.Mock()
     mock_response.raise_for_status.return_value = None
     mock_response.status_code = 200
-    mock_response.json.return_value = {"response": "beautiful sunset beach scene"}
+    mock_response.iter_lines.return_value = [
+        b'{"response": "beautiful sunset", "done": false}',
+        b'{"response": " beach scene", "done": true}',
+    ]
     mock_post.return_value = mock_response
 
     with unittest.mock.patch("image_processor_name.config_manager.config") as mock_config:
@@ -77,15 +81,18 @@ def test_generate_filename_success(mock_post: unittest.mock.Mock, sample_image_s
 
         assert result == "beautiful sunset beach scene"
         mock_post.assert_called_once()
+        assert mock_post.call_args.kwargs["stream"] is True
+        mock_response.close.assert_called_once()
 
 
-@unittest.mock.patch("image_processor_name.ollama_client.requests.post")
-def test_test_connection_success(mock_post: unittest.mock.Mock):
+@unittest.mock.patch("image_processor_name.ollama_client.requests.Session.get")
+def test_test_connection_success(mock_get: unittest.mock.Mock):
     """Test successful connection test."""
     mock_response = unittest.mock.Mock()
     mock_response.raise_for_status.return_value = None
-    mock_response.json.return_value = {"response": "test response"}
-    mock_post.return_value = mock_response
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"models": []}
+    mock_get.return_value = mock_response
 
     with unittest.mock.patch("image_processor_name.config_manager.config") as mock_config:
         mock_config.get.side_effect = lambda key, default: {
@@ -100,3 +107,197 @@ def test_test_connection_success(mock_post: unittest.mock.Mock):
         result = client.test_connection()
 
         assert result is True
+
+
+def test_session_is_reused_across_requests(sample_image_small: pathlib.Path):
+    """Test that one pooled session serves every request from the client."""
+    mock_response = unittest.mock.Mock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"response": "pooled connection test"}
+
+    client = src.image_processor_name.ollama_client.OllamaClient(pool_size=4)
+    client.stream_responses = False
+
+    with unittest.mock.patch.object(client.session, "post", return_value=mock_response) as mock_post:
+        client.generate_filename(sample_image_small)
+        client.generate_filename(sample_image_small)
+
+    assert mock_post.call_count == 2
+    adapter = client.session.get_adapter(client.endpoint)
+    assert adapter._pool_maxsize == 4
+
+
+def test_close_only_closes_owned_session():
+    """Test that a shared session is left open for its owner."""
+    shared_session = unittest.mock.Mock()
+    client = src.image_processor_name.ollama_client.OllamaClient(session=shared_session)
+    client.close()
+    shared_session.close.assert_not_called()
+
+    owned_client = src.image_processor_name.ollama_client.OllamaClient()
+    with unittest.mock.patch.object(owned_client.session, "close") as mock_close, owned_client:
+        pass
+    mock_close.assert_called_once()
+
+
+def test_warm_up_loads_model_once_per_endpoint():
+    """Test that warm-up preloads the model with keep_alive on every endpoint."""
+    import requests.exceptions
+
+    client = src.image_processor_name.ollama_client.OllamaClient(
+        endpoints=["http://gpu1:11434/api/generate", "http://gpu2:11434/api/generate"]
+    )
+    client.keep_alive = "1h"
+
+    with unittest.mock.patch.object(
+        client.session,
+        "post",
+        side_effect=[unittest.mock.Mock(), requests.exceptions.ConnectionError("down"), unittest.mock.Mock()],
+    ) as mock_post:
+        assert client.warm_up()["http://gpu2:11434/api/generate"] is None
+        latency = client.warm_up()
+
+    assert all(seconds is not None for seconds in latency.values())
+    # The endpoint that loaded the model is not asked again
+    assert [call.args[0] for call in mock_post.call_args_list] == [
+        "http://gpu1:11434/api/generate",
+        "http://gpu2:11434/api/generate",
+        "http://gpu2:11434/api/generate",
+    ]
+    assert mock_post.call_args.kwargs["json"] == {"model": client.model, "keep_alive": "1h"}
+    assert client.build_payload("abc", "Describe")["keep_alive"] == "1h"
+    client.close()
+
+
+def test_structured_mode_names_after_title_and_asks_again(sample_image_small: pathlib.Path):
+    """Test that structured responses are schema-constrained and re-asked when invalid."""
+    client = src.image_processor_name.ollama_client.OllamaClient()
+    client.structured = True
+    replies = [
+        '{"title": "Sunset", "description": "A beach."}',
+        '{"title": " Sunset over beach ", "description": "A beach.", "tags": ["sunset"], "text": ""}',
+    ]
+    responses = []
+    for reply in replies:
+        mock_response = unittest.mock.Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"response": reply}
+        responses.append(mock_response)
+    bodies = []
+
+    def post(url, data, **kwargs):
+        bodies.append(b"".join(data))
+        return responses.pop(0)
+
+    with unittest.mock.patch.object(client.session, "post", side_effect=post):
+        assert client.generate_filename(sample_image_small) == "Sunset over beach"
+
+    assert len(bodies) == 2
+    assert b'"format": {"type": "object"' in bodies[0]
+
+
+def test_streaming_stops_at_first_line_of_answer(sample_image_small: pathlib.Path):
+    """Test that reading stops once the answer is complete and asks for few tokens."""
+    chunks = [
+        "Here is a description:",
+        "\n\n",
+        "Sunset over",
+        " a beach",
+        "\n",
+        "This image shows",
+    ]
+    lines = [f'{{"response": {json.dumps(chunk)}, "done": false}}'.encode() for chunk in chunks]
+    read = []
+
+    def iter_lines():
+        for line in lines:
+            read.append(line)
+            yield line
+
+    mock_response = unittest.mock.Mock()
+    mock_response.status_code = 200
+    mock_response.iter_lines.side_effect = iter_lines
+    client = src.image_processor_name.ollama_client.OllamaClient()
+    client.stream_responses = True
+    client.num_predict = 16
+
+    with unittest.mock.patch.object(client.session, "post", return_value=mock_response):
+        assert client.generate_filename(sample_image_small) == "Sunset over a beach"
+
+    assert len(read) == 5
+    mock_response.close.assert_called_once()
+    payload = client.build_payload("abc", "Describe")
+    assert payload["stream"] is True
+    assert payload["options"] == {"num_predict": 16}
+
+
+def test_filename_stream_stops_after_max_words():
+    """Test that a single rambling line is cut once enough words arrived."""
+    stream = src.image_processor_name.ollama_client.FilenameStream(max_words=3)
+
+    assert stream.feed('{"response": "red barn in"}') is False
+    assert stream.feed("") is False
+    assert stream.feed('{"response": " snowy field"}') is True
+    assert stream.result() == "red barn in"
+    with pytest.raises(src.image_processor_name.ollama_client.OllamaResponseError):
+        stream.feed('{"error": "model not found"}')
+
+
+def test_filename_stream_rejects_preamble_only_answer():
+    """Test that a stream ending after a preamble is not used as a filename."""
+    stream = src.image_processor_name.ollama_client.FilenameStream()
+
+    assert stream.feed('{"response": "Here is a description:", "done": true}') is True
+    with pytest.raises(src.image_processor_name.ollama_client.OllamaResponseError, match="No usable"):
+        stream.result()
+
+
+def test_post_body_closes_stream_after_early_stop(sample_image_small: pathlib.Path):
+    """Test that a multi-chunk stream is abandoned and closed once the answer is complete."""
+    lines = [
+        b'{"response": "misty", "done": false}',
+        b'{"response": " forest path\\n", "done": false}',
+        b'{"response": "The photo", "done": false}',
+        b'{"response": " shows", "done": true}',
+    ]
+    read = []
+
+    def iter_lines():
+        for line in lines:
+            read.append(line)
+            yield line
+
+    mock_response = unittest.mock.Mock()
+    mock_response.status_code = 200
+    mock_response.iter_lines.side_effect = iter_lines
+    client = src.image_processor_name.ollama_client.OllamaClient()
+    client.stream_responses = True
+
+    with (
+        client.open_image(sample_image_small) as source,
+        unittest.mock.patch.object(client.session, "post", return_value=mock_response) as mock_post,
+    ):
+        assert client._post_body(client.build_body(source, "Describe")) == "misty forest path"
+
+    assert mock_post.call_args.kwargs["stream"] is True
+    assert len(read) == 2
+    mock_response.close.assert_called_once()
+
+
+def test_generate_filename_not_found_fails_fast(sample_image_small: pathlib.Path):
+    """Test that a wrong endpoint or model is not retried."""
+    mock_response = unittest.mock.Mock()
+    mock_response.status_code = 404
+    mock_response.text = '{"error": "model not found"}'
+    client = src.image_processor_name.ollama_client.OllamaClient()
+
+    with (
+        unittest.mock.patch("time.sleep") as mock_sleep,
+        unittest.mock.patch.object(client.session, "post", return_value=mock_response) as mock_post,
+        pytest.raises(src.image_processor_name.ollama_client.OllamaNotFoundError),
+    ):
+        client.generate_filename(sample_image_small)
+
+    assert mock_post.call_count == 1
+    mock_sleep.assert_not_called()
+    assert client.breaker.stats()["failure_rate"] == 0.0
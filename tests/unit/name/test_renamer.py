@@ -6,6 +6,7 @@ import pathlib
 import unittest.mock
 
 import pytest
+import src.image_processor.jobs
 import src.image_processor_name.renamer
 
 
@@ -409,3 +410,113 @@ def test_test_connection_failure(mock_ollama_error: unittest.mock.Mock, mock_fil
     result = renamer.test_connection()
 
     assert result is False
+
+
+def test_arename_directory_renames_concurrently(
+    mock_ollama_success: unittest.mock.Mock,
+    temp_image_dir: pathlib.Path,
+):
+    """Test async directory renaming with colliding generated names."""
+    import asyncio
+
+    import src.image_processor_name.file_operations
+
+    async_client = unittest.mock.Mock()
+    async_client.max_in_flight = 3
+    async_client.agenerate_filename = unittest.mock.AsyncMock(return_value="same description")
+
+    file_ops = src.image_processor_name.file_operations.FileOperations()
+    file_ops.move_delay = 0
+    renamer = src.image_processor_name.renamer.ImageRenamer(mock_ollama_success, file_ops)
+
+    results = asyncio.run(
+        renamer.arename_directory(temp_image_dir, show_progress=False, client=async_client)
+    )
+
+    assert results["total_files"] == 3
+    assert results["processed"] == 3
+    assert results["failed"] == 0
+    assert async_client.agenerate_filename.await_count == 3
+    renamed = sorted(p.name for p in temp_image_dir.iterdir())
+    assert all(name.startswith("same-description") for name in renamed)
+
+
+def test_rename_directory_streaming_renames_each_file_once(
+    mock_ollama_success: unittest.mock.Mock,
+    temp_image_dir: pathlib.Path,
+):
+    """Test that streaming never picks up files it has already renamed."""
+    import src.image_processor_name.file_operations
+
+    mock_ollama_success.generate_filename.side_effect = ["first photo", "second photo", "third photo"]
+
+    file_ops = src.image_processor_name.file_operations.FileOperations()
+    file_ops.move_delay = 0
+    renamer = src.image_processor_name.renamer.ImageRenamer(mock_ollama_success, file_ops)
+
+    results = renamer.rename_directory(temp_image_dir, recursive=True, show_progress=False, stream=True)
+
+    assert results["total_files"] == 3
+    assert results["processed"] == 3
+    assert mock_ollama_success.generate_filename.call_count == 3
+    assert sorted(p.stem for p in temp_image_dir.iterdir()) == ["first-photo", "second-photo", "third-photo"]
+
+
+def test_rename_directory_resumes_failed_images(
+    mock_ollama_success: unittest.mock.Mock,
+    mock_file_operations: unittest.mock.Mock,
+    temp_image_dir: pathlib.Path,
+    temp_dir: pathlib.Path,
+):
+    """Test that resuming a job retries only failed images, without rescanning."""
+    mock_ollama_success.generate_filename.return_value = "renamed image"
+    mock_file_operations.is_supported_image.return_value = True
+    mock_file_operations.safe_file_move.side_effect = [True, False, True]
+
+    renamer = src.image_processor_name.renamer.ImageRenamer(mock_ollama_success, mock_file_operations)
+    with src.image_processor.jobs.JobStore(temp_dir / "jobs.db") as job_store:
+        job_id = job_store.create_job("rename", str(temp_image_dir))
+        first = renamer.rename_directory(temp_image_dir, show_progress=False, job_store=job_store, job_id=job_id)
+        failed_path = mock_file_operations.safe_file_move.call_args_list[1].args[0]
+
+        mock_file_operations.safe_file_move.side_effect = None
+        mock_file_operations.safe_file_move.return_value = True
+        with unittest.mock.patch.object(renamer, "iter_image_files") as iter_image_files:
+            resumed = renamer.rename_directory(temp_image_dir, show_progress=False, job_store=job_store, job_id=job_id)
+
+        job = job_store.get_job(job_id)
+
+    assert (first["processed"], first["failed"]) == (2, 1)
+    assert (resumed["processed"], resumed["failed"]) == (1, 0)
+    iter_image_files.assert_not_called()
+    assert mock_file_operations.safe_file_move.call_args_list[3].args[0] == failed_path
+    assert job["status"] == "completed"
+    assert job["items"] == {"pending": 0, "done": 3, "failed": 0}
+
+
+def test_dry_run_does_not_mark_job_images_done(
+    mock_ollama_success: unittest.mock.Mock,
+    mock_file_operations: unittest.mock.Mock,
+    temp_image_dir: pathlib.Path,
+    temp_dir: pathlib.Path,
+):
+    """Test that resuming a job after a dry run still renames every image."""
+    mock_ollama_success.generate_filename.return_value = "renamed image"
+    mock_file_operations.is_supported_image.return_value = True
+    mock_file_operations.safe_file_move.return_value = True
+
+    renamer = src.image_processor_name.renamer.ImageRenamer(mock_ollama_success, mock_file_operations)
+    with src.image_processor.jobs.JobStore(temp_dir / "jobs.db") as job_store:
+        job_id = job_store.create_job("rename", str(temp_image_dir))
+        preview = renamer.rename_directory(
+            temp_image_dir, dry_run=True, show_progress=False, job_store=job_store, job_id=job_id
+        )
+        mock_file_operations.safe_file_move.assert_not_called()
+
+        resumed = renamer.rename_directory(temp_image_dir, show_progress=False, job_store=job_store, job_id=job_id)
+        job = job_store.get_job(job_id)
+
+    assert preview["processed"] == 3
+    assert resumed["processed"] == 3
+    assert mock_file_operations.safe_file_move.call_count == 3
+    assert job["items"] == {"pending": 0, "done": 3, "failed": 0}
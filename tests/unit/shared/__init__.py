@@ -0,0 +1 @@
+"""Unit tests for code shared by both tools."""
@@ -0,0 +1,72 @@
+"""
+Unit tests for the Ollama endpoint load balancer.
+"""
+
+import pytest
+import src.image_processor.balancer
+
+
+def make_balancer(
+    probe_results: dict[str, bool] | None = None, max_failures: int = 2
+) -> src.image_processor.balancer.LoadBalancer:
+    """Create a balancer over three endpoints with a scripted probe."""
+    probe_results = probe_results or {}
+    return src.image_processor.balancer.LoadBalancer(
+        ["http://a", "http://b", "http://c"],
+        probe=lambda endpoint: probe_results.get(endpoint, True),
+        max_failures=max_failures,
+        probe_interval=3600,
+        is_failure=lambda e: not isinstance(e, ValueError),
+    )
+
+
+def test_least_outstanding_backend_is_chosen():
+    """Test that requests spread over idle backends before doubling up."""
+    balancer = make_balancer()
+
+    first = balancer.acquire()
+    second = balancer.acquire()
+    third = balancer.acquire()
+    balancer.release(second, 0.5)
+    fourth = balancer.acquire()
+
+    assert [first.endpoint, second.endpoint, third.endpoint] == [
+        "http://a",
+        "http://b",
+        "http://c",
+    ]
+    assert fourth.endpoint == "http://b"
+    assert balancer.stats()[1]["average_latency"] == 0.5
+
+
+def test_failing_backend_is_ejected_and_readmitted():
+    """Test ejection after consecutive failures and re-admission by probe."""
+    balancer = make_balancer({"http://a": False}, max_failures=1)
+
+    # Errors that are not the backend's fault do not count
+    with pytest.raises(ValueError), balancer.request():
+        raise ValueError("bad image")
+    assert balancer.stats()[0]["healthy"] is True
+
+    with pytest.raises(ConnectionError), balancer.request():
+        raise ConnectionError("refused")
+
+    ejected = balancer.stats()[0]
+    assert ejected["healthy"] is False
+    assert ejected["failures"] == 1
+    assert balancer.acquire().endpoint != "http://a"
+
+    assert balancer.check_health() == 2
+    balancer.probe = lambda endpoint: True
+    assert balancer.check_health() == 3
+    assert balancer.stats()[0]["ejections"] == 1
+    balancer.close()
+
+
+def test_all_ejected_falls_back_to_oldest():
+    """Test that a request is still attempted when every backend is down."""
+    balancer = make_balancer(dict.fromkeys(("http://a", "http://b", "http://c"), False))
+
+    assert balancer.check_health() == 0
+    assert balancer.acquire().endpoint == "http://a"
+    balancer.close()
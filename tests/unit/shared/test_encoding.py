@@ -0,0 +1,72 @@
+"""
+Unit tests for streaming JSON request bodies.
+"""
+
+import base64
+import json
+import pathlib
+
+import PIL.Image
+import pytest
+import src.image_processor.encoding
+
+
+@pytest.fixture
+def image_path(tmp_path: pathlib.Path) -> pathlib.Path:
+    """Create a small JPEG that is sent without preprocessing."""
+    path = tmp_path / "image.jpg"
+    PIL.Image.new("RGB", (64, 48), color="green").save(path, "JPEG")
+    return path
+
+
+def test_body_matches_serialized_payload(image_path: pathlib.Path):
+    """Test that the streamed body equals the payload serialized in one go."""
+    placeholder = src.image_processor.encoding.IMAGE_PLACEHOLDER
+    payload = {"model": "llava", "messages": [{"images": [placeholder]}]}
+
+    with src.image_processor.encoding.ImageSource(image_path) as source:
+        body = src.image_processor.encoding.JsonBody(payload, source)
+        streamed = b"".join(body)
+        length = len(body)
+        headers = body.headers
+
+    encoded = base64.b64encode(image_path.read_bytes()).decode("utf-8")
+    expected = json.dumps({"model": "llava", "messages": [{"images": [encoded]}]})
+
+    assert streamed == expected.encode("utf-8")
+    assert length == len(streamed)
+    assert headers["Content-Length"] == str(length)
+
+
+def test_image_source_encodes_in_chunks(image_path: pathlib.Path):
+    """Test that chunked encoding of a memory-mapped file is lossless."""
+    with src.image_processor.encoding.ImageSource(
+        image_path, preprocess=False
+    ) as source:
+        chunks = list(source.iter_base64(chunk_size=30))
+        encoded_length = source.encoded_length
+
+    assert len(chunks) > 1
+    assert b"".join(chunks) == base64.b64encode(image_path.read_bytes())
+    assert encoded_length == len(b"".join(chunks))
+
+
+def test_image_source_downscales_large_images(tmp_path: pathlib.Path):
+    """Test that preprocessing replaces the file with a smaller JPEG."""
+    path = tmp_path / "large.png"
+    PIL.Image.new("RGB", (2000, 1000), color="red").save(path, "PNG")
+
+    with src.image_processor.encoding.ImageSource(path, max_edge=200) as source:
+        data = base64.b64decode(b"".join(source.iter_base64()))
+
+    assert data[:2] == b"\xff\xd8"
+    assert len(data) < path.stat().st_size
+
+
+def test_body_requires_single_placeholder(image_path: pathlib.Path):
+    """Test that payloads without exactly one placeholder are rejected."""
+    with (
+        src.image_processor.encoding.ImageSource(image_path) as source,
+        pytest.raises(ValueError, match="placeholder"),
+    ):
+        src.image_processor.encoding.JsonBody({"images": []}, source)
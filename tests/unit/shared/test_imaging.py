@@ -0,0 +1,60 @@
+"""
+Unit tests for image preprocessing before upload.
+"""
+
+import io
+import pathlib
+
+import PIL.Image
+import src.image_processor.imaging
+
+
+def _decode(data: bytes) -> PIL.Image.Image:
+    """Open preprocessed image bytes."""
+    return PIL.Image.open(io.BytesIO(data))
+
+
+def test_prepare_image_downscales_large_jpeg(tmp_path: pathlib.Path):
+    """Test that large images are resized to the max edge as JPEG."""
+    image_path = tmp_path / "large.jpg"
+    PIL.Image.new("RGB", (4000, 3000), color="red").save(image_path, "JPEG")
+
+    result = _decode(src.image_processor.imaging.prepare_image(image_path, 1000))
+
+    assert result.format == "JPEG"
+    assert max(result.size) == 1000
+    assert result.size == (1000, 750)
+
+
+def test_prepare_image_passes_small_images_through(tmp_path: pathlib.Path):
+    """Test that small upright JPEG files are sent unchanged."""
+    image_path = tmp_path / "small.jpg"
+    PIL.Image.new("RGB", (100, 50), color="blue").save(image_path, "JPEG")
+
+    data = src.image_processor.imaging.prepare_image(image_path, 1000)
+
+    assert data == image_path.read_bytes()
+
+
+def test_prepare_image_applies_exif_orientation(tmp_path: pathlib.Path):
+    """Test that EXIF rotation is applied before upload."""
+    image_path = tmp_path / "rotated.jpg"
+    exif = PIL.Image.Exif()
+    exif[0x0112] = 6  # Rotate 90 degrees clockwise
+    PIL.Image.new("RGB", (200, 100), color="green").save(image_path, "JPEG", exif=exif)
+
+    result = _decode(src.image_processor.imaging.prepare_image(image_path, 1000))
+
+    assert result.size == (100, 200)
+
+
+def test_prepare_image_flattens_transparency(tmp_path: pathlib.Path):
+    """Test that transparent images are flattened onto white JPEG."""
+    image_path = tmp_path / "transparent.png"
+    PIL.Image.new("RGBA", (2000, 1000), color=(0, 0, 0, 0)).save(image_path, "PNG")
+
+    result = _decode(src.image_processor.imaging.prepare_image(image_path, 500))
+
+    assert result.format == "JPEG"
+    assert result.size == (500, 250)
+    assert result.getpixel((10, 10)) == (255, 255, 255)
@@ -0,0 +1,110 @@
+"""
+Unit tests for the persistent job store.
+"""
+
+import collections.abc
+import pathlib
+
+import pytest
+import src.image_processor.jobs
+
+
+@pytest.fixture
+def job_store(
+    tmp_path: pathlib.Path,
+) -> collections.abc.Generator[src.image_processor.jobs.JobStore]:
+    """Create a job store in a temporary database."""
+    with src.image_processor.jobs.JobStore(tmp_path / "jobs.db") as store:
+        yield store
+
+
+def test_discover_records_pending_items(
+    job_store: src.image_processor.jobs.JobStore,
+):
+    """Test that discovery records new paths in order and marks the job."""
+    job_id = job_store.create_job("meta", "/photos", {"incremental": True})
+    paths = [pathlib.Path(f"/photos/{name}.jpg") for name in "cab"]
+
+    yielded = list(
+        job_store.discover(job_id, paths, skip={"/photos/a.jpg"}, batch_size=1)
+    )
+    job = job_store.get_job(job_id)
+
+    assert yielded == [paths[0], paths[2]]
+    assert list(job_store.iter_items(job_id, batch_size=1)) == [
+        "/photos/c.jpg",
+        "/photos/b.jpg",
+    ]
+    assert job["discovered"] is True
+    assert job["options"] == {"incremental": True}
+    assert job["items"]["pending"] == 2
+
+
+def test_interrupted_discovery_is_not_marked(
+    job_store: src.image_processor.jobs.JobStore,
+):
+    """Test that a discovery stopped early leaves the job to be walked again."""
+    job_id = job_store.create_job("rename", "/photos")
+    discovery = job_store.discover(job_id, [pathlib.Path("/photos/a.jpg")] * 2)
+    next(discovery)
+    discovery.close()
+
+    assert job_store.get_job(job_id)["discovered"] is False
+
+
+def test_resume_returns_unfinished_items_to_pending(
+    job_store: src.image_processor.jobs.JobStore,
+):
+    """Test that unfinished and failed items are retried and done ones kept."""
+    job_id = job_store.create_job("rename", "/photos")
+    list(job_store.discover(job_id, [pathlib.Path("/photos/c.jpg")]))
+    job_store.mark(job_id, ["/photos/a.jpg"], "done", "/photos/cat.jpg")
+    job_store.mark(job_id, ["/photos/b.jpg"], "failed")
+    job_store.set_status(job_id, "interrupted")
+
+    job = job_store.resume_job(job_id)
+
+    assert job["status"] == "running"
+    assert job["items"] == {"pending": 2, "done": 1, "failed": 0}
+    assert job_store.get_results(job_id) == {"/photos/a.jpg": "/photos/cat.jpg"}
+
+
+def test_prune_keeps_recent_and_unfinished_jobs(
+    job_store: src.image_processor.jobs.JobStore,
+):
+    """Test that only older completed jobs are deleted, with their items."""
+    completed = []
+    for _ in range(3):
+        job_id = job_store.create_job("meta", "/photos")
+        job_store.mark(job_id, ["/photos/a.jpg"], "done")
+        job_store.set_status(job_id, "completed")
+        completed.append(job_id)
+    interrupted = job_store.create_job("meta", "/photos")
+    job_store.set_status(interrupted, "interrupted")
+
+    assert job_store.prune(keep=1) == 2
+
+    for job_id in completed[:2]:
+        with pytest.raises(src.image_processor.jobs.JobNotFoundError):
+            job_store.get_job(job_id)
+        assert job_store.get_results(job_id) == {}
+    assert job_store.get_job(completed[2])["items"]["done"] == 1
+    assert job_store.get_job(interrupted)["status"] == "interrupted"
+
+
+def test_unknown_job_and_state_are_rejected(
+    job_store: src.image_processor.jobs.JobStore,
+):
+    """Test that unknown job ids and item states raise errors."""
+    with pytest.raises(src.image_processor.jobs.JobNotFoundError):
+        job_store.resume_job("missing")
+
+    job_id = job_store.create_job("meta", "/photos")
+    with pytest.raises(ValueError, match="state"):
+        job_store.mark(job_id, ["/photos/a.jpg"], "paused")
+
+
+def test_invalid_journal_mode_is_rejected(tmp_path: pathlib.Path):
+    """Test that the journal mode is checked before it reaches a pragma."""
+    with pytest.raises(ValueError, match="journal mode"):
+        src.image_processor.jobs.JobStore(tmp_path / "jobs.db", journal_mode="wal; --")
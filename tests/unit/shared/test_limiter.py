@@ -0,0 +1,150 @@
+"""
+Unit tests for the adaptive concurrency limiter.
+"""
+
+import asyncio
+import threading
+
+import pytest
+import src.image_processor.limiter
+
+
+def test_good_latency_grows_limit_by_one_per_round():
+    """Test additive increase of about one per round up to the maximum."""
+    limiter = src.image_processor.limiter.AdaptiveLimiter(max_limit=4, initial_limit=2)
+
+    for _ in range(3):
+        limiter.acquire()
+        limiter.release(1.0)
+    assert limiter.limit == 3
+
+    for _ in range(20):
+        limiter.acquire()
+        limiter.release(1.0)
+    assert limiter.stats()["limit"] == 4
+
+
+def test_timeouts_and_slow_requests_cut_limit_once_per_round():
+    """Test multiplicative decrease that ignores requests already in flight."""
+    limiter = src.image_processor.limiter.AdaptiveLimiter(
+        max_limit=8,
+        initial_limit=8,
+        backoff=0.5,
+        latency_tolerance=2.0,
+        is_drop=lambda e: isinstance(e, TimeoutError),
+    )
+    limiter.acquire()
+    limiter.release(1.0)
+
+    for _ in range(3):
+        with pytest.raises(TimeoutError), limiter.slot():
+            raise TimeoutError
+    assert limiter.limit == 4
+
+    for _ in range(4):
+        limiter.acquire()
+        limiter.release(1.0)
+    limiter.acquire()
+    limiter.release(5.0)
+
+    stats = limiter.stats()
+    assert stats["limit"] == 2
+    assert stats["drops"] == 4
+    assert stats["best_latency"] == 1.0
+
+
+def test_limit_starts_below_maximum_and_ramps_up():
+    """Test that the default starting limit is half the maximum."""
+    limiter = src.image_processor.limiter.AdaptiveLimiter(max_limit=8, min_limit=2)
+    assert limiter.limit == 4
+    assert (
+        src.image_processor.limiter.AdaptiveLimiter(max_limit=3, min_limit=2).limit == 2
+    )
+
+    for _ in range(30):
+        limiter.acquire()
+        limiter.release(1.0)
+    assert limiter.limit == 8
+
+
+def test_jittered_latency_after_fast_outlier_does_not_collapse_limit():
+    """Test that one unusually fast request stops being the baseline."""
+    limiter = src.image_processor.limiter.AdaptiveLimiter(
+        max_limit=8, initial_limit=8, latency_tolerance=2.0, baseline_window=10
+    )
+    limiter.acquire()
+    limiter.release(0.2)
+
+    jitter = [0.8, 1.1, 0.9, 1.3, 1.0, 1.2, 0.85, 1.15]
+    for index in range(200):
+        limiter.acquire()
+        limiter.release(jitter[index % len(jitter)])
+
+    stats = limiter.stats()
+    assert stats["limit"] == 8
+    assert stats["best_latency"] == 0.8
+
+
+def test_other_errors_do_not_change_limit():
+    """Test that errors which are not drops leave the limit alone."""
+    limiter = src.image_processor.limiter.AdaptiveLimiter(
+        max_limit=2, initial_limit=2, is_drop=lambda e: isinstance(e, TimeoutError)
+    )
+
+    with pytest.raises(ValueError), limiter.slot():
+        raise ValueError
+
+    assert limiter.stats() == {
+        "limit": 2,
+        "min_limit": 1,
+        "max_limit": 2,
+        "in_flight": 0,
+        "successes": 0,
+        "drops": 0,
+        "best_latency": None,
+    }
+
+
+def test_slots_block_at_limit():
+    """Test that threads wait for a slot once the limit is reached."""
+    limiter = src.image_processor.limiter.AdaptiveLimiter(max_limit=1)
+    limiter.acquire()
+    acquired = threading.Event()
+
+    def take_slot() -> None:
+        with limiter.slot():
+            acquired.set()
+
+    thread = threading.Thread(target=take_slot)
+    thread.start()
+    assert not acquired.wait(0.05)
+
+    limiter.release(1.0)
+    thread.join(timeout=5)
+    assert acquired.is_set()
+
+
+def test_async_slots_respect_limit():
+    """Test that coroutines never exceed the limit."""
+    limiter = src.image_processor.limiter.AdaptiveLimiter(max_limit=2)
+    peak = 0
+
+    async def request() -> None:
+        nonlocal peak
+        async with limiter.aslot():
+            peak = max(peak, limiter.stats()["in_flight"])
+            await asyncio.sleep(0.01)
+
+    async def run() -> None:
+        await asyncio.gather(*(request() for _ in range(6)))
+
+    asyncio.run(run())
+
+    assert peak == 2
+    assert limiter.stats()["successes"] == 6
+
+
+def test_invalid_limits_are_rejected():
+    """Test that the minimum must not exceed the maximum."""
+    with pytest.raises(ValueError, match="limits"):
+        src.image_processor.limiter.AdaptiveLimiter(max_limit=1, min_limit=2)
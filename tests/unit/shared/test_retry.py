@@ -0,0 +1,152 @@
+"""
+Unit tests for the shared retry policy and circuit breaker.
+"""
+
+import asyncio
+import random
+import unittest.mock
+
+import pytest
+import src.image_processor.retry
+
+
+class FakeClock:
+    """Clock that only moves when told to."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_breaker(
+    clock: FakeClock, **kwargs
+) -> src.image_processor.retry.CircuitBreaker:
+    """Create a breaker that opens after half of four requests fail."""
+    settings = {"failure_rate": 0.5, "window": 4, "min_requests": 4, "open_seconds": 30}
+    settings.update(kwargs)
+    return src.image_processor.retry.CircuitBreaker(clock=clock, **settings)
+
+
+def test_backoff_is_jittered_exponential_and_capped():
+    """Test that waits are drawn below a doubling, capped bound."""
+    policy = src.image_processor.retry.RetryPolicy(
+        attempts=10, base_delay=1.0, max_delay=5.0, rng=random.Random(7)
+    )
+
+    for attempt, bound in enumerate([1.0, 2.0, 4.0, 5.0, 5.0]):
+        delays = [policy.delay(attempt) for _ in range(200)]
+        assert all(0 <= delay <= bound for delay in delays)
+        assert max(delays) > bound * 0.9
+    assert len({policy.delay(0) for _ in range(10)}) == 10
+
+
+def test_call_retries_transient_errors_only():
+    """Test that transient errors are retried and others raised at once."""
+    policy = src.image_processor.retry.RetryPolicy(attempts=3, base_delay=0.5)
+    attempts = []
+    retries = []
+
+    def flaky(attempt: int) -> str:
+        attempts.append(attempt)
+        if attempt < 2:
+            raise ConnectionError("refused")
+        return "ok"
+
+    with unittest.mock.patch("time.sleep") as mock_sleep:
+        result = policy.call(
+            flaky,
+            lambda e: isinstance(e, ConnectionError),
+            on_retry=lambda attempt, error, delay: retries.append(attempt),
+        )
+    assert result == "ok"
+    assert attempts == [0, 1, 2]
+    assert retries == [0, 1]
+    assert mock_sleep.call_count == 2
+
+    def broken(attempt: int) -> str:
+        attempts.append(attempt)
+        raise ValueError("bad response")
+
+    attempts.clear()
+    with pytest.raises(ValueError):
+        policy.call(broken, lambda e: isinstance(e, ConnectionError))
+    assert attempts == [0]
+
+
+def test_call_raises_last_error_when_attempts_run_out():
+    """Test that the final transient error is surfaced."""
+    policy = src.image_processor.retry.RetryPolicy(attempts=2, base_delay=0)
+
+    def down(attempt: int) -> str:
+        raise TimeoutError(f"attempt {attempt}")
+
+    with pytest.raises(TimeoutError, match="attempt 1"):
+        policy.call(down, lambda e: True)
+
+
+def test_breaker_opens_on_failure_rate_and_closes_after_trial():
+    """Test the closed, open, half open cycle."""
+    clock = FakeClock()
+    transitions = []
+    breaker = make_breaker(
+        clock, on_state_change=lambda old, new: transitions.append(new)
+    )
+
+    for failed in (False, True, False):
+        assert breaker.before_request() == 0
+        breaker.record(failed)
+    assert breaker.state == "closed"
+    breaker.record(True)
+    assert breaker.state == "open"
+    assert breaker.before_request() == 30
+
+    clock.now += 30
+    assert breaker.before_request() == 0
+    assert breaker.state == "half_open"
+    # Only the trial goes through; others poll until it finishes
+    assert breaker.before_request() > 0
+    breaker.record(True)
+    assert breaker.state == "open"
+
+    clock.now += 30
+    assert breaker.before_request() == 0
+    breaker.record(False)
+    assert transitions == ["open", "half_open", "open", "half_open", "closed"]
+    assert breaker.stats() == {"state": "closed", "openings": 2, "failure_rate": 0.0}
+
+
+def test_cancelled_trial_lets_another_through():
+    """Test that an interrupted trial request does not wedge the breaker."""
+    clock = FakeClock()
+    breaker = make_breaker(clock, min_requests=1)
+    breaker.record(True)
+    clock.now += 30
+
+    assert breaker.before_request() == 0
+    breaker.cancel()
+    assert breaker.before_request() == 0
+    assert breaker.state == "half_open"
+
+
+def test_acall_pauses_while_breaker_is_open():
+    """Test that async calls wait out an open circuit before sending."""
+    clock = FakeClock()
+    breaker = make_breaker(clock, min_requests=1)
+    breaker.record(True)
+    policy = src.image_processor.retry.RetryPolicy(attempts=1)
+    waits = []
+
+    async def fake_sleep(seconds: float) -> None:
+        waits.append(seconds)
+        clock.now += seconds
+
+    async def attempt(index: int) -> str:
+        return "ok"
+
+    with unittest.mock.patch("asyncio.sleep", new=fake_sleep):
+        assert asyncio.run(policy.acall(attempt, lambda e: True, breaker)) == "ok"
+
+    assert waits == [30]
+    assert breaker.state == "closed"
@@ -0,0 +1,80 @@
+"""
+Unit tests for feeding blocking iterators to asyncio workers.
+"""
+
+import asyncio
+import threading
+
+import pytest
+import src.image_processor.streaming
+
+
+def test_consume_concurrently_handles_every_item():
+    """Test that every item is handled with bounded concurrency."""
+    handled = []
+    in_flight = 0
+    peak = 0
+
+    async def handler(item: int) -> None:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        handled.append(item)
+        in_flight -= 1
+
+    asyncio.run(
+        src.image_processor.streaming.consume_concurrently(range(20), handler, 3)
+    )
+
+    assert sorted(handled) == list(range(20))
+    assert peak <= 3
+
+
+def test_consume_concurrently_starts_before_source_ends():
+    """Test that items are handled while the source is still producing."""
+    first_handled = threading.Event()
+
+    def source():
+        yield "first"
+        # Blocks discovery until the first item has been handled
+        assert first_handled.wait(timeout=5)
+        yield "second"
+
+    async def handler(item: str) -> None:
+        first_handled.set()
+
+    asyncio.run(
+        src.image_processor.streaming.consume_concurrently(source(), handler, 2)
+    )
+
+
+def test_consume_concurrently_raises_source_errors():
+    """Test that errors raised while iterating the source propagate."""
+
+    def source():
+        yield 1
+        raise OSError("disk went away")
+
+    async def handler(item: int) -> None:
+        return None
+
+    with pytest.raises(OSError, match="disk went away"):
+        asyncio.run(
+            src.image_processor.streaming.consume_concurrently(source(), handler, 2)
+        )
+
+
+def test_consume_concurrently_stops_on_handler_error():
+    """Test that a failing handler stops the run without hanging discovery."""
+
+    async def handler(item: int) -> None:
+        if item == 3:
+            raise ValueError("bad item")
+
+    with pytest.raises(ValueError, match="bad item"):
+        asyncio.run(
+            src.image_processor.streaming.consume_concurrently(
+                range(10_000), handler, 2, queue_size=1
+            )
+        )
@@ -0,0 +1,60 @@
+"""
+Unit tests for structured output schemas and validation.
+"""
+
+import pytest
+import src.image_processor.structured
+
+VALID = '{"title": " Red square ", "description": "A red square.", "tags": ["red"], "text": ""}'
+
+
+def test_parse_strips_strings_of_valid_response():
+    """Test that a matching response is decoded with whitespace stripped."""
+    assert src.image_processor.structured.parse(
+        VALID, src.image_processor.structured.DESCRIPTION_SCHEMA
+    ) == {
+        "title": "Red square",
+        "description": "A red square.",
+        "tags": ["red"],
+        "text": "",
+    }
+
+
+@pytest.mark.parametrize(
+    ("content", "message"),
+    [
+        ("A red square.", "Invalid JSON"),
+        ('["not", "an", "object"]', "expected object"),
+        (
+            '{"title": "Red", "description": "A red square.", "tags": []}',
+            "missing required property 'text'",
+        ),
+        (
+            '{"title": "  ", "description": "A red square.", "tags": [], "text": ""}',
+            r"\$\.title: empty",
+        ),
+        (
+            '{"title": "Red", "description": "A red square.", "tags": [1], "text": ""}',
+            r"\$\.tags\[0\]: expected string",
+        ),
+        (
+            '{"title": "'
+            + "x" * 81
+            + '", "description": "A.", "tags": [], "text": ""}',
+            "longer than 80",
+        ),
+    ],
+)
+def test_parse_rejects_responses_outside_schema(content: str, message: str):
+    """Test that invalid JSON and schema mismatches raise SchemaError."""
+    with pytest.raises(src.image_processor.structured.SchemaError, match=message):
+        src.image_processor.structured.parse(
+            content, src.image_processor.structured.DESCRIPTION_SCHEMA
+        )
+
+
+def test_validate_rejects_bool_as_number():
+    """Test that booleans are not accepted where numbers are expected."""
+    with pytest.raises(src.image_processor.structured.SchemaError):
+        src.image_processor.structured.validate(True, {"type": "number"})
+    src.image_processor.structured.validate(1.5, {"type": "number"})
@@ -0,0 +1,86 @@
+"""
+Unit tests for the shared directory walker.
+"""
+
+import os
+import pathlib
+
+import pytest
+import src.image_processor.walker
+
+
+@pytest.fixture
+def walk_tree(tmp_path: pathlib.Path) -> pathlib.Path:
+    """Create a small tree with images, other files and a nested directory."""
+    (tmp_path / "a.jpg").write_bytes(b"a")
+    (tmp_path / "b.PNG").write_bytes(b"b")
+    (tmp_path / "notes.txt").write_text("not an image")
+    (tmp_path / "nested").mkdir()
+    (tmp_path / "nested" / "c.jpg").write_bytes(b"c")
+    (tmp_path / "thumbs").mkdir()
+    (tmp_path / "thumbs" / "d.jpg").write_bytes(b"d")
+    return tmp_path
+
+
+def _walk(directory: pathlib.Path, **kwargs) -> set[str]:
+    """Return walked files as root-relative posix paths."""
+    return {
+        pathlib.Path(entry.path).relative_to(directory).as_posix()
+        for entry in src.image_processor.walker.walk_files(directory, **kwargs)
+    }
+
+
+def test_walk_filters_extensions(walk_tree: pathlib.Path):
+    """Test that extension filtering is case-insensitive and recursive."""
+    assert _walk(walk_tree, extensions=[".jpg", ".png"]) == {
+        "a.jpg",
+        "b.PNG",
+        "nested/c.jpg",
+        "thumbs/d.jpg",
+    }
+
+
+def test_walk_non_recursive(walk_tree: pathlib.Path):
+    """Test that subdirectories are skipped when not recursive."""
+    assert _walk(walk_tree, recursive=False) == {"a.jpg", "b.PNG", "notes.txt"}
+
+
+def test_walk_include_and_exclude(walk_tree: pathlib.Path):
+    """Test include patterns on names and exclude patterns on directories."""
+    assert _walk(walk_tree, include=["*.jpg"], exclude=["thumbs"]) == {
+        "a.jpg",
+        "nested/c.jpg",
+    }
+    assert _walk(walk_tree, exclude=["nested/*"]) == {
+        "a.jpg",
+        "b.PNG",
+        "notes.txt",
+        "thumbs/d.jpg",
+    }
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="symlinks not supported")
+def test_walk_symlink_policies(walk_tree: pathlib.Path, tmp_path_factory):
+    """Test skip, files and follow symlink policies, including cycles."""
+    outside = tmp_path_factory.mktemp("outside")
+    (outside / "e.jpg").write_bytes(b"e")
+    (walk_tree / "linked_dir").symlink_to(outside, target_is_directory=True)
+    (walk_tree / "linked.jpg").symlink_to(walk_tree / "a.jpg")
+    (walk_tree / "nested" / "loop").symlink_to(walk_tree, target_is_directory=True)
+
+    skipped = _walk(walk_tree, extensions=[".jpg"], symlinks="skip")
+    files = _walk(walk_tree, extensions=[".jpg"], symlinks="files")
+    followed = _walk(walk_tree, extensions=[".jpg"], symlinks="follow")
+
+    assert "linked.jpg" not in skipped
+    assert "linked.jpg" in files
+    assert "linked_dir/e.jpg" not in files
+    assert "linked_dir/e.jpg" in followed
+    # The loop back to the root is only walked once
+    assert not any(path.startswith("nested/loop/") for path in followed)
+
+
+def test_walk_rejects_unknown_symlink_policy(walk_tree: pathlib.Path):
+    """Test that invalid symlink policies raise ValueError."""
+    with pytest.raises(ValueError, match="Unknown symlink policy"):
+        list(src.image_processor.walker.walk_files(walk_tree, symlinks="sometimes"))
@@ -0,0 +1,97 @@
+"""
+Unit tests for the shared work queue.
+"""
+
+import collections.abc
+import pathlib
+
+import pytest
+import src.image_processor.workqueue
+
+
+class FakeClock:
+    """Clock that only moves when told to."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Create a controllable clock."""
+    return FakeClock()
+
+
+@pytest.fixture
+def work_queue(
+    tmp_path: pathlib.Path, clock: FakeClock
+) -> collections.abc.Generator[src.image_processor.workqueue.WorkQueue]:
+    """Create a work queue in a temporary database."""
+    with src.image_processor.workqueue.WorkQueue(
+        tmp_path / "queue.db", lease_seconds=60, max_attempts=2, clock=clock
+    ) as queue:
+        yield queue
+
+
+def test_claims_are_exclusive_and_ordered(
+    work_queue: src.image_processor.workqueue.WorkQueue,
+):
+    """Test that workers claim disjoint items in enqueue order."""
+    assert work_queue.enqueue(["/img/c.jpg", "/img/a.jpg", "/img/b.jpg"]) == 3
+    assert work_queue.enqueue(["/img/a.jpg"], batch_size=1) == 0
+
+    assert work_queue.claim("host1-1", limit=2) == ["/img/c.jpg", "/img/a.jpg"]
+    assert work_queue.claim("host2-1", limit=2) == ["/img/b.jpg"]
+    assert work_queue.claim("host3-1") == []
+    assert work_queue.counts() == {"pending": 0, "leased": 3, "done": 0, "failed": 0}
+
+
+def test_expired_lease_is_claimed_again(
+    work_queue: src.image_processor.workqueue.WorkQueue, clock: FakeClock
+):
+    """Test that a crashed worker's items go back to other workers."""
+    work_queue.enqueue(["/img/a.jpg", "/img/b.jpg"])
+    work_queue.claim("crashed", limit=1)
+    work_queue.claim("alive", limit=1)
+
+    clock.now += 45
+    assert work_queue.heartbeat("alive") == 1
+    clock.now += 30
+
+    assert work_queue.claim("other", limit=2) == ["/img/a.jpg"]
+    assert work_queue.complete("crashed", ["/img/a.jpg"]) == 0
+    assert work_queue.complete("other", ["/img/a.jpg"]) == 1
+    assert work_queue.counts(exclude_worker="alive")["leased"] == 0
+
+
+def test_failures_retry_until_max_attempts(
+    work_queue: src.image_processor.workqueue.WorkQueue,
+):
+    """Test that a failing item is retried and then parked as failed."""
+    work_queue.enqueue(["/img/a.jpg"])
+
+    work_queue.claim("w")
+    assert work_queue.fail("w", "/img/a.jpg", "timeout") is True
+    work_queue.claim("w")
+    assert work_queue.fail("w", "/img/a.jpg", "timeout") is False
+    assert work_queue.claim("w") == []
+    assert work_queue.counts()["failed"] == 1
+
+    assert work_queue.retry_failed() == 1
+    assert work_queue.claim("w") == ["/img/a.jpg"]
+
+
+def test_release_returns_leases_without_counting_attempts(
+    work_queue: src.image_processor.workqueue.WorkQueue,
+):
+    """Test that a stopping worker hands its items back at once."""
+    work_queue.enqueue(["/img/a.jpg"])
+    work_queue.claim("w")
+    work_queue.claim("w")
+
+    assert work_queue.release("w") == 1
+    work_queue.claim("w")
+    assert work_queue.fail("w", "/img/a.jpg", "timeout") is True